@@ -0,0 +1,378 @@
+"""Benchmarks of the SDK overhead per API call.
+
+Every case runs a `CSMClient` operation end to end, i.e. `send_request`,
+request signing, the connection pool and TypeAdapter validation, against
+`MockCSMServer`, so the numbers measure the SDK rather than the network.
+For each case it reports requests per second, p50/p99 latency and the
+memory allocated per call (tracemalloc peak), plus the package import
+time.
+
+Results are compared with `benchmarks/baselines.json` recorded with the
+same server latency; metrics worse than the tolerance are flagged.
+Baselines depend on the machine, so refresh them with `--save` on the
+machine that runs the comparison.
+
+Run with `python -m benchmarks.bench_client [--check] [--save]`.
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from im_csm_sdk_python import CSMClient, ResultMode
+from im_csm_sdk_python.schemas.contacts import ListContactsParams
+from im_csm_sdk_python.schemas.messages import (
+    ListMessagesParams,
+    SendToContactData,
+    SendToTagsData,
+)
+
+from .mock_server import BASE_URL, MockCSMServer
+
+BASELINES = os.path.join(os.path.dirname(__file__), 'baselines.json')
+DEFAULT_NUMBER = 500
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.25
+ALLOCATION_SAMPLES = 200
+IMPORT_RUNS = 5
+
+# Metrics where a higher value is better; the others regress upwards
+HIGHER_IS_BETTER = {'rps'}
+
+IMPORT_SNIPPET = (
+    'import time; start = time.perf_counter(); import im_csm_sdk_python; '
+    'print(time.perf_counter() - start)'
+)
+
+Case = Callable[[CSMClient], Any]
+
+CASES: Dict[str, Case] = {
+    'get_status': lambda client: client.get_status(),
+    'get_contact': lambda client: client.get_contact('50231240000'),
+    'list_contacts': lambda client: client.list_contacts(
+        ListContactsParams(start=0, limit=50)
+    ),
+    'list_contacts_record': lambda client: client.list_contacts(
+        ListContactsParams(start=0, limit=50), mode=ResultMode.RECORD
+    ),
+    'list_messages': lambda client: client.list_messages(
+        ListMessagesParams(
+            start_date=datetime(2025, 1, 1),
+            end_date=datetime(2025, 1, 31),
+            start=0,
+            limit=50,
+        )
+    ),
+    'list_messages_record': lambda client: client.list_messages(
+        ListMessagesParams(
+            start_date=datetime(2025, 1, 1),
+            end_date=datetime(2025, 1, 31),
+            start=0,
+            limit=50,
+        ),
+        mode=ResultMode.RECORD,
+    ),
+    'send_to_contact': lambda client: client.send_to_contact(
+        SendToContactData(
+            msisdn='50231240000',
+            message='Hola! Tu código es 123 456 — válido por 5 min',
+            id='0f8fad5b-d9cb-469f-a165-70867728950e',
+        )
+    ),
+    'send_to_tags': lambda client: client.send_to_tags(
+        SendToTagsData(tags=['python', 'vip'], message='Hello from Python!')
+    ),
+}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted samples.
+
+    Args:
+        samples (List[float]): Samples in ascending order.
+        q (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The percentile
+    """
+    index = max(0, min(len(samples) - 1, round(q / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+def measure_latency(client: CSMClient, case: Case, number: int) -> Dict:
+    """Time one round of sequential calls of a case.
+
+    Like `timeit`, the garbage collector is paused while timing so a
+    collection triggered by earlier cases does not land on this one.
+
+    Args:
+        client (CSMClient): The client.
+        case (Case): The operation.
+        number (int): Calls to time.
+
+    Returns:
+        Dict: `rps`, `p50_us` and `p99_us`
+    """
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(number):
+            start = time.perf_counter()
+            case(client)
+            samples.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    samples.sort()
+    return {
+        'rps': number / sum(samples),
+        'p50_us': percentile(samples, 50) * 1e6,
+        'p99_us': percentile(samples, 99) * 1e6,
+    }
+
+
+def best(rounds: List[Dict]) -> Dict:
+    """Keep the best value of every metric over several rounds.
+
+    Args:
+        rounds (List[Dict]): Metrics of each round.
+
+    Returns:
+        Dict: Best metrics
+    """
+    return {
+        metric: (max if metric in HIGHER_IS_BETTER else min)(
+            r[metric] for r in rounds
+        )
+        for metric in rounds[0]
+    }
+
+
+def measure_allocations(
+    client: CSMClient, case: Case, number: int = ALLOCATION_SAMPLES
+) -> float:
+    """Average peak memory allocated by one call.
+
+    Args:
+        client (CSMClient): The client.
+        case (Case): The operation.
+        number (int): Calls to sample.
+
+    Returns:
+        float: KiB allocated per call
+    """
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(number):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            case(client)
+            total += tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return total / number / 1024
+
+
+def measure_import(runs: int = IMPORT_RUNS) -> float:
+    """Best time to import the package in a fresh interpreter.
+
+    Args:
+        runs (int): Interpreters to start.
+
+    Returns:
+        float: Milliseconds
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_SNIPPET],
+            capture_output=True,
+            check=True,
+            cwd=root,
+            text=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings) * 1e3
+
+
+def run(
+    number: int = DEFAULT_NUMBER,
+    latency: float = 0.0,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict:
+    """Run every case against a fresh mock server.
+
+    Rounds of all cases are interleaved and the best round of each case is
+    kept, so a burst of noise on the machine does not land on one case.
+
+    Args:
+        number (int): Timed calls per case and round.
+        latency (float): Seconds added by the server to every response.
+        repeat (int): Rounds.
+
+    Returns:
+        Dict: Metrics by case, plus `import` with `import_ms`
+    """
+    server = MockCSMServer(latency=latency)
+    rounds: Dict[str, List[Dict]] = {name: [] for name in CASES}
+    results: Dict[str, Dict[str, float]] = {}
+    with CSMClient(
+        'bench_api_key',
+        'bench_api_secret',
+        BASE_URL,
+        transport=server.transport(),
+    ) as client:
+        for case in CASES.values():
+            for _ in range(min(100, number)):
+                case(client)
+        for _ in range(repeat):
+            for name, case in CASES.items():
+                rounds[name].append(measure_latency(client, case, number))
+        for name, case in CASES.items():
+            results[name] = best(rounds[name])
+            results[name]['alloc_kib'] = measure_allocations(client, case)
+    results['import'] = {'import_ms': measure_import()}
+    return results
+
+
+def compare(
+    results: Dict, baselines: Dict
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """Relative change of every metric against its baseline.
+
+    Args:
+        results (Dict): Current metrics by case.
+        baselines (Dict): Stored metrics by case.
+
+    Returns:
+        Dict[str, Dict[str, Optional[float]]]: Relative change by case and
+        metric, `None` without a baseline
+    """
+    changes: Dict[str, Dict[str, Optional[float]]] = {}
+    for name, metrics in results.items():
+        stored = baselines.get(name, {})
+        changes[name] = {}
+        for metric, value in metrics.items():
+            base = stored.get(metric)
+            changes[name][metric] = value / base - 1 if base else None
+    return changes
+
+
+def report(results: Dict, changes: Dict, tolerance: float) -> List[str]:
+    """Print the results and list the regressions.
+
+    Args:
+        results (Dict): Current metrics by case.
+        changes (Dict): Output of `compare`.
+        tolerance (float): Allowed relative worsening.
+
+    Returns:
+        List[str]: `case.metric` of every regression
+    """
+    regressions = []
+
+    def cell(name: str, metric: str, width: int) -> str:
+        value = results[name].get(metric)
+        if value is None:
+            return ' ' * width
+        change = changes[name].get(metric)
+        mark = ''
+        if change is not None:
+            mark = f' {change:+.0%}'
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > tolerance:
+                mark += '!'
+                regressions.append(f'{name}.{metric}')
+        return f'{value:.1f}{mark}'.rjust(width)
+
+    metrics = ['rps', 'p50_us', 'p99_us', 'alloc_kib']
+    print(f'{"case":<22}' + ''.join(f'{m:>18}' for m in metrics))
+    for name in CASES:
+        print(f'{name:<22}' + ''.join(cell(name, m, 18) for m in metrics))
+    print(f'{"import_ms":<22}{cell("import", "import_ms", 18)}')
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks from the command line.
+
+    Args:
+        argv (List[str], optional): Arguments. Defaults to `sys.argv`.
+
+    Returns:
+        int: Exit status, 1 on regressions with `--check`
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--number',
+        type=int,
+        default=DEFAULT_NUMBER,
+        help='calls per case and round',
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=DEFAULT_REPEAT, help='rounds per case'
+    )
+    parser.add_argument(
+        '--latency', type=float, default=0.0, help='server latency in ms'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help='allowed relative worsening before flagging a regression',
+    )
+    parser.add_argument(
+        '--save', action='store_true', help='store results as baselines'
+    )
+    parser.add_argument(
+        '--check', action='store_true', help='exit with 1 on regressions'
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.number, args.latency / 1e3, args.repeat)
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+    if baselines.get('settings', {}).get('latency_ms') != args.latency:
+        # Timings recorded with another server latency are not comparable
+        baselines = {}
+    regressions = report(results, compare(results, baselines), args.tolerance)
+
+    if args.save:
+        with open(BASELINES, 'w') as f:
+            json.dump(
+                {
+                    'settings': {'latency_ms': args.latency},
+                    **{
+                        name: {k: round(v, 2) for k, v in metrics.items()}
+                        for name, metrics in results.items()
+                    },
+                },
+                f,
+                indent=2,
+            )
+            f.write('\n')
+        print(f'Baselines saved to {BASELINES}')
+    if regressions:
+        print(
+            f'Regressions over {args.tolerance:.0%}: {", ".join(regressions)}'
+        )
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == '__main__':
+    logger.remove()
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Micro-benchmarks for prepared endpoints.
+
+Checks that a `PreparedRequest` sends the same method, URL, headers and
+body as an `ApiRequest` built by `build_request`, then compares the cost
+of preparing a call, with and without sending it through a `CSMClient`
+over the mock server.
+
+Run with `python -m benchmarks.bench_prepared`.
+"""
+
+import timeit
+
+import httpx
+from loguru import logger
+
+from im_csm_sdk_python.core.client import CSMClient
+from im_csm_sdk_python.core.endpoints import Endpoints
+from im_csm_sdk_python.helpers.api_request import build_request
+from im_csm_sdk_python.helpers.authentication import Signer
+from im_csm_sdk_python.schemas.request import ApiRequest, ApiRequestType
+
+from .mock_server import BASE_URL, MockCSMServer
+
+API_KEY = 'bench_api_key'
+API_SECRET = 'bench_api_secret'
+CONFIG = {'apiKey': API_KEY, 'apiSecret': API_SECRET, 'url': BASE_URL}
+
+# name, prepared endpoint, path, legacy endpoint, params, data
+CASES = [
+    ('status', 'status', None, 'status', None, None),
+    (
+        'get_contact',
+        'contact',
+        '50231241024',
+        'contacts/50231241024',
+        {'msisdn': '50231241024'},
+        None,
+    ),
+    (
+        'list_messages',
+        'messages',
+        None,
+        'messages',
+        {'start': 0, 'limit': 50, 'direction': 'MT'},
+        None,
+    ),
+    (
+        'send_to_contact',
+        'send_to_contact',
+        None,
+        'messages/send_to_contact',
+        None,
+        {
+            'msisdn': '50231241024',
+            'message': 'Hola! Tu código es 123 456 — válido por 5 min',
+            'id': '0f8fad5b-d9cb-469f-a165-70867728950e',
+        },
+    ),
+    (
+        'send_to_tags',
+        'send_to_tags',
+        None,
+        'messages/send',
+        None,
+        {'tags': ['python', 'vip'], 'message': 'Hello from Python SDK!'},
+    ),
+]
+
+
+def _legacy(endpoint, params, data) -> ApiRequest:
+    return ApiRequest(
+        type=ApiRequestType.POST if data else ApiRequestType.GET,
+        endpoint=endpoint,
+        params=params,
+        data=data,
+    )
+
+
+def check_identical() -> None:
+    """Assert prepared requests match `build_request` for every case.
+
+    Raises:
+        AssertionError: If the method, URL, body or any header differs
+    """
+    signer = Signer(API_KEY, API_SECRET)
+    endpoints = Endpoints(BASE_URL)
+    for name, attr, path, endpoint, params, data in CASES:
+        prepared = getattr(endpoints, attr).request(params, data, path)
+        kwargs = prepared.build(signer)
+        legacy = _legacy(endpoint, params, data)
+        expected = httpx.Request(**build_request(legacy, CONFIG, signer))
+        actual = httpx.Request(**kwargs)
+
+        assert actual.method == expected.method, name
+        assert actual.url == expected.url, f'{name}: {actual.url}'
+        assert actual.content == expected.content, f'{name}: body'
+
+        # Both sign with the current time, so compare under the same date
+        date = kwargs['headers']['Date']
+        auth = signer.sign(params, data, formatted_date=date)
+        assert kwargs['headers']['Authorization'] == auth['Authorization'], (
+            f'{name}: signature'
+        )
+        for header in ('Content-Type', 'Content-Length'):
+            assert actual.headers.get(header) == expected.headers.get(
+                header
+            ), f'{name}: {header}'
+
+
+def run(number: int = 20000, calls: int = 2000) -> None:
+    """Print per-call cost of legacy and prepared requests.
+
+    Args:
+        number (int): Calls per measurement when only building.
+        calls (int): Calls per measurement when sending.
+    """
+    signer = Signer(API_KEY, API_SECRET)
+    endpoints = Endpoints(BASE_URL)
+    client = CSMClient(
+        API_KEY, API_SECRET, BASE_URL, transport=MockCSMServer().transport()
+    )
+
+    print(f'{"case":<24}{"ApiRequest":>14}{"prepared":>14}{"speedup":>10}')
+    for name, attr, path, endpoint, params, data in CASES:
+        prepared = getattr(endpoints, attr)
+        compiled = getattr(client.endpoints, attr)
+
+        def legacy_build(e=endpoint, p=params, d=data):
+            build_request(_legacy(e, p, d), CONFIG, signer)
+
+        def fast_build(e=prepared, p=params, d=data, path=path):
+            e.request(p, d, path).build(signer)
+
+        def legacy_send(e=endpoint, p=params, d=data):
+            client.send_request(_legacy(e, p, d))
+
+        def fast_send(e=compiled, p=params, d=data, path=path):
+            client.send_request(e.request(p, d, path))
+
+        for label, legacy, fast, n in (
+            ('build', legacy_build, fast_build, number),
+            ('send', legacy_send, fast_send, calls),
+        ):
+            slow = min(timeit.repeat(legacy, number=n, repeat=3))
+            quick = min(timeit.repeat(fast, number=n, repeat=3))
+            print(
+                f'{f"{name} {label}":<24}'
+                f'{slow / n * 1e6:>11.2f} us'
+                f'{quick / n * 1e6:>11.2f} us'
+                f'{slow / quick:>9.1f}x'
+            )
+    client.close()
+
+
+if __name__ == '__main__':
+    logger.remove()
+    check_identical()
+    print('Prepared requests match build_request()')
+    run()
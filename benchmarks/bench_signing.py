@@ -0,0 +1,123 @@
+"""Micro-benchmarks for request signing.
+
+Checks that `Signer.sign` produces byte-identical headers to
+`authorization` and compares the cost of both per call.
+
+Run with `python -m benchmarks.bench_signing`.
+"""
+
+import timeit
+from datetime import datetime
+
+from loguru import logger
+
+from im_csm_sdk_python.helpers.authentication import Signer, authorization
+
+API_KEY = 'bench_api_key'
+API_SECRET = 'bench_api_secret'
+
+CASES = [
+    ('status', None, None),
+    ('get_contact', {'msisdn': '50231241024'}, None),
+    (
+        'list_contacts',
+        {'status': ['ACTIVE', 'BLOCKED'], 'query': 'Julio Rodríguez'},
+        None,
+    ),
+    (
+        'list_messages',
+        {
+            'start_date': datetime(2025, 1, 1, 8, 30),
+            'end_date': datetime(2025, 1, 31, 23, 59, 59),
+            'start': 0,
+            'limit': 50,
+            'msisdn': '50231241024',
+            'direction': 'MT',
+            'delivery_status_enable': True,
+        },
+        None,
+    ),
+    (
+        'send_to_contact',
+        None,
+        {
+            'msisdn': '50231241024',
+            'message': 'Hola! Tu código es 123 456 — válido por 5 min',
+            'id': '0f8fad5b-d9cb-469f-a165-70867728950e',
+        },
+    ),
+    (
+        'send_to_tags',
+        None,
+        {'tags': ['python', 'vip'], 'message': 'Hello from Python SDK!'},
+    ),
+]
+
+
+def check_identical() -> None:
+    """Assert `Signer.sign` matches `authorization` for every case.
+
+    Raises:
+        AssertionError: If any header differs
+    """
+    signer = Signer(API_KEY, API_SECRET)
+    for name, params, data in CASES:
+        expected = authorization(
+            {
+                'apiKey': API_KEY,
+                'apiSecret': API_SECRET,
+                'params': params,
+                'data': data,
+            }
+        )
+        actual = signer.sign(params, data, formatted_date=expected['Date'])
+        assert actual == expected, f'{name}: {actual} != {expected}'
+
+        current = signer.sign(params, data)
+        assert current['Date'].endswith(' GMT'), f'{name}: {current}'
+
+
+def run(number: int = 20000) -> None:
+    """Print per-call signing cost for each case.
+
+    Args:
+        number (int): Calls per measurement.
+    """
+    signer = Signer(API_KEY, API_SECRET)
+    print(
+        f'{"case":<18}{"authorization":>16}{"Signer.sign":>16}{"speedup":>10}'
+    )
+    for name, params, data in CASES:
+        config = {
+            'apiKey': API_KEY,
+            'apiSecret': API_SECRET,
+            'params': params,
+            'data': data,
+        }
+        legacy = min(
+            timeit.repeat(
+                lambda config=config: authorization(config),
+                number=number,
+                repeat=3,
+            )
+        )
+        fast = min(
+            timeit.repeat(
+                lambda params=params, data=data: signer.sign(params, data),
+                number=number,
+                repeat=3,
+            )
+        )
+        print(
+            f'{name:<18}'
+            f'{legacy / number * 1e6:>13.2f} us'
+            f'{fast / number * 1e6:>13.2f} us'
+            f'{legacy / fast:>9.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    logger.remove()
+    check_identical()
+    print('Signer.sign output is byte-identical to authorization()')
+    run()
@@ -0,0 +1,214 @@
+"""In-process stand-in for the CSM API.
+
+Serves realistic `status`, `contacts`, `messages` and send payloads through
+an `httpx.MockTransport`, so benchmarks exercise the real request signing,
+connection pool and response validation without network noise. Response
+bodies are encoded once and reused, keeping the server's own cost out of
+the measurements.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+BASE_URL = 'https://csm.mock/'
+API_PREFIX = '/api/rest'
+EPOCH = datetime(2025, 1, 1, 8, 0)
+DEFAULT_TOTAL = 1000
+
+FIRST_NAMES = ['Julio', 'María', 'José', 'Ana', 'Luis', 'Sofía', 'Carlos']
+LAST_NAMES = ['Rodríguez', 'López', 'García', 'Pérez', 'Hernández']
+
+
+def contact_payload(index: int) -> Dict:
+    """Build the JSON of one contact.
+
+    Args:
+        index (int): Position of the contact.
+
+    Returns:
+        Dict: The contact as returned by the API
+    """
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last = LAST_NAMES[index % len(LAST_NAMES)]
+    phone = f'{31240000 + index:08d}'
+    return {
+        'msisdn': f'502{phone}',
+        'tags': ['python', 'vip'] if index % 5 == 0 else ['python'],
+        'first_name': first,
+        'last_name': last,
+        'full_name': f'{first} {last}',
+        'email': f'{first.lower()}.{index}@example.com',
+        'status': 'BLOCKED' if index % 17 == 0 else 'ACTIVE',
+        'phone_number': phone,
+        'country_code': '502',
+        'added_from': 'API',
+        'profile_uid': f'0f8fad5b-d9cb-469f-a165-{index:012d}',
+        'monitoring': index % 7 == 0,
+    }
+
+
+def message_payload(index: int) -> Dict:
+    """Build the JSON of one message of the log.
+
+    Args:
+        index (int): Position of the message.
+
+    Returns:
+        Dict: The message as returned by the API
+    """
+    return {
+        'message_id': f'7c9e6679-7425-40de-944b-{index:012d}',
+        'short_code': '12345',
+        'type': 1,
+        'direction': 'MO' if index % 4 == 0 else 'MT',
+        'status': 'DELIVERED' if index % 9 else 'FAILED',
+        'message': 'Hola! Tu código es 123 456 — válido por 5 min',
+        'sent_count': 1,
+        'error_count': 0 if index % 9 else 1,
+        'total_recipients': 1,
+        'msisdn': f'502{31240000 + index % 500:08d}',
+        'country': 'GT',
+        'is_billable': True,
+        'is_scheduled': False,
+        'created_on': (EPOCH + timedelta(seconds=30 * index)).isoformat(),
+        'created_by': 'api@example.com',
+    }
+
+
+def send_payload(data: Dict, tags: bool) -> Dict:
+    """Build the JSON answering a send request.
+
+    Args:
+        data (Dict): The request payload.
+        tags (bool): Whether it is a send to tags.
+
+    Returns:
+        Dict: The sent message as returned by the API
+    """
+    payload = {
+        'id': data.get('id') or '0f8fad5b-d9cb-469f-a165-70867728950e',
+        'short_code': '12345',
+        'type': 1,
+        'direction': 'MT',
+        'status': 'SENT',
+        'sent_from': 'API',
+        'message': data.get('message', ''),
+        'sent_count': 1,
+        'error_count': 0,
+        'total_recipients': 1,
+        'is_billable': True,
+        'is_scheduled': False,
+        'created_on': EPOCH.isoformat(),
+        'total_monitors': 0,
+    }
+    if not tags:
+        payload.update(
+            message_id='7c9e6679-7425-40de-944b-e07fc1f90ae7',
+            msisdn=data.get('msisdn', ''),
+            country='GT',
+            created_by='api@example.com',
+        )
+    return payload
+
+
+class MockCSMServer:
+    """Answer CSM API requests from memory.
+
+    Listing endpoints honour `start` and `limit` over `total` generated
+    rows. Requests without `Date` and `Authorization` headers are rejected
+    with 401, like the real API.
+
+    Args:
+        latency (float): Seconds added to every response.
+        total (int): Number of contacts and of messages.
+    """
+
+    def __init__(self, latency: float = 0.0, total: int = DEFAULT_TOTAL):
+        """Initialize the server and encode its payloads."""
+        self.latency = latency
+        self.total = total
+        self.requests = 0
+        self._contacts = [
+            json.dumps(contact_payload(i)).encode() for i in range(total)
+        ]
+        self._messages = [
+            json.dumps(message_payload(i)).encode() for i in range(total)
+        ]
+        self._pages: Dict[Tuple[str, int, int], bytes] = {}
+
+    def transport(self) -> httpx.MockTransport:
+        """Build a transport for `CSMClient`.
+
+        Returns:
+            httpx.MockTransport: Transport that blocks for the latency
+        """
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if self.latency:
+                time.sleep(self.latency)
+            return self.respond(request)
+
+        return httpx.MockTransport(handler)
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        """Answer one request.
+
+        Args:
+            request (httpx.Request): The request.
+
+        Returns:
+            httpx.Response: The response
+        """
+        self.requests += 1
+        if 'Authorization' not in request.headers or (
+            'Date' not in request.headers
+        ):
+            return httpx.Response(401, json={'error': 'Unauthorized'})
+
+        endpoint = request.url.path[len(API_PREFIX) :].strip('/')
+        params = request.url.params
+        body = self._route(request.method, endpoint, params, request.content)
+        if body is None:
+            return httpx.Response(404, json={'error': 'Not found'})
+        return httpx.Response(
+            200, content=body, headers={'Content-Type': 'application/json'}
+        )
+
+    def _route(
+        self,
+        method: str,
+        endpoint: str,
+        params: httpx.QueryParams,
+        content: bytes,
+    ) -> Optional[bytes]:
+        if method == 'GET':
+            if endpoint == 'status':
+                return b'{"status":"OK","version":"1.0"}'
+            if endpoint in ('contacts', 'messages'):
+                return self._page(
+                    endpoint,
+                    int(params.get('start', 0)),
+                    int(params.get('limit', 50)),
+                )
+            if endpoint.startswith('contacts/'):
+                return self._contacts[0]
+        elif method == 'POST':
+            data = json.loads(content or b'{}')
+            if endpoint == 'messages/send_to_contact':
+                return json.dumps(send_payload(data, tags=False)).encode()
+            if endpoint == 'messages/send':
+                return json.dumps(send_payload(data, tags=True)).encode()
+        return None
+
+    def _page(self, endpoint: str, start: int, limit: int) -> bytes:
+        key = (endpoint, start, limit)
+        page = self._pages.get(key)
+        if page is None:
+            rows = self._contacts if endpoint == 'contacts' else self._messages
+            page = b'[' + b','.join(rows[start : start + limit]) + b']'
+            self._pages[key] = page
+        return page
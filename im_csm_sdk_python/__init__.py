@@ -5,15 +5,72 @@
 
 # Core functionality
 # Configuration
-from .configs.config import get_config
+from .analytics.contact_index import ContactIndex
+from .analytics.message_log import MessageLog
+from .configs.config import (
+    Settings,
+    get_config,
+    get_settings,
+    reload_settings,
+)
 from .configs.logger import logger
+from .core.accounts import AccountRegistry
+from .core.adaptive import AdaptiveLimiter, AdaptiveLimiters
+from .core.async_client import AsyncCSMClient
+from .core.bulk import BulkStats, asend_many, send_many
+from .core.campaign import CampaignResult, InputFormat, run_campaign
+from .core.cache import (
+    ContactCache,
+    MemoryCacheBackend,
+    SqliteCacheBackend,
+)
+from .core.client import CSMClient, get_default_client, set_default_client
 from .core.contacts import get_contact, list_contacts
+from .core.errors import (
+    CircuitOpenError,
+    ContactNotFoundError,
+    MessageTemplateError,
+)
 from .core.messages import (
     list_messages,
     send_to_contact,
     send_to_tags,
 )
+from .core.msisdn import (
+    MsisdnBatch,
+    MsisdnNormalizer,
+    MsisdnRejection,
+    normalize_msisdns,
+)
+from .core.pagination import (
+    aiter_contacts,
+    aiter_messages,
+    iter_contacts,
+    iter_messages,
+)
+from .core.sharding import fetch_messages_sharded, iter_messages_sharded
 from .core.status import get_status
+from .core.templates import MessageTemplate, RenderedMessage
+from .helpers.metrics import (
+    AttemptSample,
+    CallbackCollector,
+    Metrics,
+    MetricsCollector,
+    Phase,
+)
+from .helpers.rate_limit import FileTokenBucket, RateLimiter, TokenBucket
+from .helpers.retry import CircuitBreaker, Retrier, RetryPolicy
+from .helpers.sms import SmsEncoding, SmsInfo, sms_info
+from .schemas.contacts import ContactStatus
+from .schemas.request import ResultMode
+from .storage.export import (
+    ExportFormat,
+    ExportResult,
+    MessageExporter,
+    export_messages,
+)
+from .storage.message_store import MessageStore, SyncResult, sync_messages
+from .utils.timeit import Profiler, profiler
 
 __all__ = [
     # Core functions
@@ -23,7 +80,77 @@ __all__ = [
     'send_to_contact',
     'get_status',
     'send_to_tags',
+    'ResultMode',
+    # Pagination
+    'iter_contacts',
+    'iter_messages',
+    'aiter_contacts',
+    'aiter_messages',
+    'iter_messages_sharded',
+    'fetch_messages_sharded',
+    # Bulk operations
+    'send_many',
+    'asend_many',
+    'BulkStats',
+    'AdaptiveLimiter',
+    'AdaptiveLimiters',
+    'run_campaign',
+    'CampaignResult',
+    'InputFormat',
+    'MessageTemplate',
+    'RenderedMessage',
+    'MessageTemplateError',
+    'SmsEncoding',
+    'SmsInfo',
+    'sms_info',
+    'MsisdnNormalizer',
+    'MsisdnBatch',
+    'MsisdnRejection',
+    'normalize_msisdns',
+    # Resilience
+    'Retrier',
+    'RetryPolicy',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'RateLimiter',
+    'TokenBucket',
+    'FileTokenBucket',
+    # Metrics
+    'Metrics',
+    'MetricsCollector',
+    'CallbackCollector',
+    'AttemptSample',
+    'Phase',
+    # Profiling
+    'Profiler',
+    'profiler',
+    # Caching
+    'ContactCache',
+    'MemoryCacheBackend',
+    'SqliteCacheBackend',
+    'ContactNotFoundError',
+    # Analytics
+    'MessageLog',
+    'ContactIndex',
+    'ContactStatus',
+    # Storage
+    'MessageStore',
+    'SyncResult',
+    'sync_messages',
+    'export_messages',
+    'MessageExporter',
+    'ExportFormat',
+    'ExportResult',
+    # Clients
+    'CSMClient',
+    'AsyncCSMClient',
+    'get_default_client',
+    'set_default_client',
+    'AccountRegistry',
     # Configuration
     'get_config',
+    'get_settings',
+    'reload_settings',
+    'Settings',
     'logger',
 ]
@@ -0,0 +1,105 @@
+"""Command line entry point: `python -m im_csm_sdk_python`."""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from typing import List, Optional
+
+from .core.bulk import DEFAULT_CONCURRENCY
+from .core.campaign import (
+    DEFAULT_CHECKPOINT_INTERVAL,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_WORKERS,
+    InputFormat,
+    run_campaign,
+)
+
+
+def _campaign(args: argparse.Namespace) -> int:
+    result = run_campaign(
+        args.input,
+        args.results,
+        args.checkpoint,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        chunk_size=args.chunk_size,
+        checkpoint_interval=args.checkpoint_interval,
+        input_format=InputFormat(args.format) if args.format else None,
+        msisdn_column=args.msisdn_column,
+        message_column=args.message_column,
+        id_column=args.id_column,
+        restart=args.restart,
+    )
+    print(json.dumps(asdict(result)))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a command.
+
+    Args:
+        argv (List[str], optional): Arguments. Defaults to `sys.argv`.
+
+    Returns:
+        int: Exit status
+    """
+    parser = argparse.ArgumentParser(prog='python -m im_csm_sdk_python')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    campaign = commands.add_parser(
+        'campaign',
+        help='send a message to every row of a CSV or NDJSON file',
+        description='Send a message to every row of a CSV or NDJSON file, '
+        'resuming from the checkpoint of an earlier run.',
+    )
+    campaign.add_argument('input', help='CSV with a header, or NDJSON')
+    campaign.add_argument('results', help='NDJSON file of outcomes')
+    campaign.add_argument(
+        '--checkpoint', help='checkpoint file (default: RESULTS.checkpoint)'
+    )
+    campaign.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help='worker processes, 0 to send from this process',
+    )
+    campaign.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help='requests in flight per worker',
+    )
+    campaign.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help='rows handed to a worker at once',
+    )
+    campaign.add_argument(
+        '--checkpoint-interval',
+        type=float,
+        default=DEFAULT_CHECKPOINT_INTERVAL,
+        help='seconds between two checkpoints',
+    )
+    campaign.add_argument(
+        '--format',
+        choices=[input_format.value for input_format in InputFormat],
+        help='input format (default: from the extension)',
+    )
+    campaign.add_argument('--msisdn-column', default='msisdn')
+    campaign.add_argument('--message-column', default='message')
+    campaign.add_argument('--id-column', default='id')
+    campaign.add_argument(
+        '--restart',
+        action='store_true',
+        help='ignore the checkpoint and start over',
+    )
+    campaign.set_defaults(handler=_campaign)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
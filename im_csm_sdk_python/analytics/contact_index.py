@@ -0,0 +1,644 @@
+import json
+import os
+import struct
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from loguru import logger
+
+from ..core.client import CSMClient
+from ..core.pagination import iter_contacts
+from ..schemas.contacts import Contact, ContactStatus, ListContactsParams
+from ..schemas.messages import SendToTagsData
+from ..schemas.records import ContactRecord
+from ..schemas.request import ResultMode
+
+ContactRow = Union[Contact, ContactRecord, Dict[str, Any]]
+Membership = Tuple[FrozenSet[str], Optional[str]]
+StatusFilter = Union[ContactStatus, str, Iterable[Union[ContactStatus, str]]]
+
+FORMAT_MAGIC = b'CSMIDX1\n'
+_HEADER = struct.Struct('<Q')
+# Positions of the bits set in every byte value
+_BYTE_BITS = tuple(
+    tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)
+)
+
+
+def _bin_count(bitmap: int) -> int:
+    return bin(bitmap).count('1')
+
+
+# Number of contacts in a bitmap; int.bit_count is Python 3.10+
+_popcount = getattr(int, 'bit_count', _bin_count)
+
+
+def to_bitmap(ids: Iterable[int]) -> int:
+    """Pack contact ids into a bitmap.
+
+    Args:
+        ids (Iterable[int]): The contact ids.
+
+    Returns:
+        int: Bitmap with the bit of every id set
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for id_ in ids:
+        buffer[id_ >> 3] |= 1 << (id_ & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def from_bitmap(bitmap: int) -> List[int]:
+    """Unpack a bitmap into sorted contact ids.
+
+    Args:
+        bitmap (int): The bitmap.
+
+    Returns:
+        List[int]: The ids of the bits set, in ascending order
+    """
+    ids: List[int] = []
+    extend = ids.extend
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for position, byte in enumerate(data):
+        if byte:
+            base = position * 8
+            extend([base + bit for bit in _BYTE_BITS[byte]])
+    return ids
+
+
+class _Postings:
+    """Id sets by name, with their bitmaps built on demand and cached.
+
+    Sets take the single-contact updates of a refresh, bitmaps the bulk set
+    operations of queries. Either side is derived from the other lazily,
+    so a loaded index answers queries without decoding its bitmaps.
+    """
+
+    __slots__ = ('_sets', '_bitmaps')
+
+    def __init__(self):
+        """Initialize empty postings."""
+        self._sets: Dict[str, Set[int]] = {}
+        self._bitmaps: Dict[str, int] = {}
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names with at least one member."""
+        return iter({**self._bitmaps, **self._sets})
+
+    @classmethod
+    def from_bitmaps(cls, bitmaps: Dict[str, int]) -> '_Postings':
+        """Initialize postings from saved bitmaps."""
+        postings = cls()
+        postings._bitmaps = dict(bitmaps)
+        return postings
+
+    def members(self, name: str) -> Set[int]:
+        """Get the mutable id set of a name."""
+        ids = self._sets.get(name)
+        if ids is None:
+            ids = self._sets[name] = set(
+                from_bitmap(self._bitmaps.get(name, 0))
+            )
+        return ids
+
+    def bitmap(self, name: str) -> int:
+        """Get the bitmap of a name."""
+        bitmap = self._bitmaps.get(name)
+        if bitmap is None:
+            ids = self._sets.get(name)
+            if not ids:
+                return 0
+            bitmap = self._bitmaps[name] = to_bitmap(ids)
+        return bitmap
+
+    def add(self, name: str, id_: int) -> None:
+        """Add an id to a name."""
+        self.members(name).add(id_)
+        self._bitmaps.pop(name, None)
+
+    def discard(self, name: str, id_: int) -> None:
+        """Remove an id from a name."""
+        ids = self.members(name)
+        ids.discard(id_)
+        self._bitmaps.pop(name, None)
+        if not ids:
+            del self._sets[name]
+
+    def count(self, name: str) -> int:
+        """Number of ids of a name."""
+        if name in self._sets:
+            return len(self._sets[name])
+        return _popcount(self._bitmaps.get(name, 0))
+
+
+def _join(values: List[Optional[str]]) -> bytes:
+    return '\n'.join(value or '' for value in values).encode()
+
+
+def _split(data: bytes, size: int) -> List[Optional[str]]:
+    if not size:
+        return []
+    return [value or None for value in data.decode().split('\n')]
+
+
+def _get(row: ContactRow, name: str) -> Any:
+    if isinstance(row, dict):
+        return row.get(name)
+    return getattr(row, name)
+
+
+def _status_values(status: StatusFilter) -> List[str]:
+    if isinstance(status, (str, ContactStatus)):
+        status = [status]
+    return [getattr(value, 'value', value) for value in status]
+
+
+@dataclass
+class RefreshStats:
+    """Outcome of a `ContactIndex.refresh`.
+
+    Attributes:
+        added (int): Contacts that were not indexed yet.
+        updated (int): Contacts whose tags, status or msisdn changed.
+        unchanged (int): Contacts already indexed as listed.
+        removed (int): Indexed contacts missing from the listing.
+    """
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+class ContactIndex:
+    """Inverted index from tags to contacts, for sizing tag audiences.
+
+    Each contact gets a dense integer id, and every tag and status maps to
+    the set of its contact ids. Queries run on bitmaps of those ids stored
+    as Python integers, so unions, intersections and differences are single
+    bitwise operations and counts are popcounts. Bitmaps are rebuilt only
+    for the tags a refresh changed.
+
+    Contacts are identified by `profile_uid`. Removed contacts leave a
+    free id that is not reused until the index is rebuilt.
+
+    Args:
+        contacts (Iterable[Contact | ContactRecord | dict], optional):
+            Contacts to index, e.g. `iter_contacts` in any result mode.
+    """
+
+    def __init__(self, contacts: Optional[Iterable[ContactRow]] = None):
+        """Initialize the index and load the given contacts."""
+        self._keys: List[Optional[str]] = []
+        self._msisdns: List[Optional[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._tags = _Postings()
+        self._statuses = _Postings()
+        # Tags and status of every id, decoded lazily after `load`
+        self._rows: Optional[List[Optional[Membership]]] = []
+        self._alive: Optional[int] = 0
+        if contacts is not None:
+            self.update(contacts)
+
+    @classmethod
+    def build(
+        cls,
+        params: Optional[ListContactsParams] = None,
+        page_size: Optional[int] = None,
+        client: Optional[CSMClient] = None,
+    ) -> 'ContactIndex':
+        """Build an index from one streamed pass over `list_contacts`.
+
+        Args:
+            params (ListContactsParams, optional): Filters for the listing.
+            page_size (int, optional): Number of contacts per request.
+            client (CSMClient, optional): The client to use. Defaults to the
+                shared default client.
+
+        Returns:
+            ContactIndex: The new index
+        """
+        index = cls()
+        index.refresh(params, page_size=page_size, client=client, prune=False)
+        return index
+
+    def __len__(self) -> int:
+        """Number of indexed contacts."""
+        return len(self._ids)
+
+    def __contains__(self, profile_uid: object) -> bool:
+        """Whether a contact is indexed."""
+        return profile_uid in self._ids
+
+    @property
+    def tags(self) -> List[str]:
+        """Indexed tags, sorted."""
+        return sorted(self._tags)
+
+    def tag_counts(self) -> Dict[str, int]:
+        """Number of contacts of every tag.
+
+        Returns:
+            Dict[str, int]: Contact count by tag
+        """
+        return {tag: self._tags.count(tag) for tag in self._tags}
+
+    def status_counts(self) -> Dict[str, int]:
+        """Number of contacts of every status.
+
+        Returns:
+            Dict[str, int]: Contact count by status
+        """
+        return {
+            status: self._statuses.count(status) for status in self._statuses
+        }
+
+    def add(self, contact: ContactRow) -> bool:
+        """Index a contact, or re-index it if it changed.
+
+        Args:
+            contact (Contact | ContactRecord | dict): The contact.
+
+        Returns:
+            bool: Whether the index changed
+        """
+        key = _get(contact, 'profile_uid')
+        msisdn = _get(contact, 'msisdn')
+        status = _get(contact, 'status')
+        membership = (
+            frozenset(_get(contact, 'tags') or ()),
+            getattr(status, 'value', status),
+        )
+        rows = self._contact_rows()
+
+        id_ = self._ids.get(key)
+        if id_ is None:
+            id_ = self._ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._msisdns.append(msisdn)
+            rows.append(None)
+            self._alive = None
+        elif rows[id_] == membership and self._msisdns[id_] == msisdn:
+            return False
+        else:
+            self._msisdns[id_] = msisdn
+
+        previous = rows[id_]
+        if previous is not None:
+            old_tags, old_status = previous
+            for tag in old_tags - membership[0]:
+                self._tags.discard(tag, id_)
+            if old_status != membership[1]:
+                self._statuses.discard(old_status, id_)
+        else:
+            old_tags, old_status = frozenset(), None
+
+        for tag in membership[0] - old_tags:
+            self._tags.add(tag, id_)
+        if old_status != membership[1]:
+            self._statuses.add(membership[1], id_)
+        rows[id_] = membership
+        return True
+
+    def update(self, contacts: Iterable[ContactRow]) -> RefreshStats:
+        """Index many contacts.
+
+        Args:
+            contacts (Iterable[ContactRow]): The contacts.
+
+        Returns:
+            RefreshStats: Added, updated and unchanged counts
+        """
+        stats = RefreshStats()
+        for contact in contacts:
+            known = _get(contact, 'profile_uid') in self._ids
+            if not self.add(contact):
+                stats.unchanged += 1
+            elif known:
+                stats.updated += 1
+            else:
+                stats.added += 1
+        return stats
+
+    def remove(self, profile_uid: str) -> bool:
+        """Drop a contact from the index.
+
+        Args:
+            profile_uid (str): The contact profile identifier.
+
+        Returns:
+            bool: Whether the contact was indexed
+        """
+        id_ = self._ids.pop(profile_uid, None)
+        if id_ is None:
+            return False
+        rows = self._contact_rows()
+        tags, status = rows[id_]
+        for tag in tags:
+            self._tags.discard(tag, id_)
+        self._statuses.discard(status, id_)
+        rows[id_] = None
+        self._keys[id_] = None
+        self._msisdns[id_] = None
+        self._alive = None
+        return True
+
+    def refresh(
+        self,
+        params: Optional[ListContactsParams] = None,
+        page_size: Optional[int] = None,
+        client: Optional[CSMClient] = None,
+        prune: bool = True,
+    ) -> RefreshStats:
+        """Bring the index up to date with one pass over `list_contacts`.
+
+        Only contacts that changed touch the index. With `prune`, indexed
+        contacts missing from the listing are removed, so pass the same
+        `params` the index was built with.
+
+        Args:
+            params (ListContactsParams, optional): Filters for the listing.
+            page_size (int, optional): Number of contacts per request.
+            client (CSMClient, optional): The client to use. Defaults to the
+                shared default client.
+            prune (bool): Whether to remove contacts no longer listed.
+
+        Returns:
+            RefreshStats: What changed
+        """
+        seen: Set[str] = set()
+
+        def contacts() -> Iterator[ContactRecord]:
+            for contact in iter_contacts(
+                params,
+                page_size=page_size,
+                client=client,
+                mode=ResultMode.RECORD,
+            ):
+                seen.add(contact.profile_uid)
+                yield contact
+
+        stats = self.update(contacts())
+        if prune:
+            for key in [key for key in self._ids if key not in seen]:
+                self.remove(key)
+                stats.removed += 1
+        logger.info('Contact index refreshed: {}', stats)
+        return stats
+
+    def select(
+        self,
+        any_of: Optional[Iterable[str]] = None,
+        all_of: Optional[Iterable[str]] = None,
+        none_of: Optional[Iterable[str]] = None,
+        status: Optional[StatusFilter] = None,
+    ) -> int:
+        """Get the bitmap of contacts matching tag and status filters.
+
+        Args:
+            any_of (Iterable[str], optional): Contacts with at least one of
+                these tags (union).
+            all_of (Iterable[str], optional): Contacts with all these tags
+                (intersection).
+            none_of (Iterable[str], optional): Contacts with none of these
+                tags (difference).
+            status (ContactStatus | Iterable[ContactStatus], optional):
+                Contacts with one of these statuses.
+
+        Returns:
+            int: The bitmap of matching contact ids
+        """
+        bitmap = self._alive_bitmap()
+        if any_of is not None:
+            bitmap &= self.union(*any_of)
+        if all_of is not None:
+            for tag in all_of:
+                bitmap &= self._tags.bitmap(tag)
+        if none_of is not None:
+            bitmap &= ~self.union(*none_of)
+        if status is not None:
+            statuses = 0
+            for value in _status_values(status):
+                statuses |= self._statuses.bitmap(value)
+            bitmap &= statuses
+        return bitmap
+
+    def count(
+        self,
+        any_of: Optional[Iterable[str]] = None,
+        all_of: Optional[Iterable[str]] = None,
+        none_of: Optional[Iterable[str]] = None,
+        status: Optional[StatusFilter] = None,
+    ) -> int:
+        """Count contacts matching tag and status filters.
+
+        See `select` for the filters.
+
+        Returns:
+            int: Number of matching contacts
+        """
+        return _popcount(self.select(any_of, all_of, none_of, status))
+
+    def union(self, *tags: str) -> int:
+        """Bitmap of contacts with any of the tags."""
+        bitmap = 0
+        for tag in tags:
+            bitmap |= self._tags.bitmap(tag)
+        return bitmap
+
+    def union_count(self, *tags: str) -> int:
+        """Number of contacts with any of the tags."""
+        return _popcount(self.union(*tags))
+
+    def intersection_count(self, *tags: str) -> int:
+        """Number of contacts with all the tags."""
+        return _popcount(self.select(all_of=tags))
+
+    def difference_count(self, tag: str, *others: str) -> int:
+        """Number of contacts with `tag` and none of the `others`."""
+        return _popcount(self._tags.bitmap(tag) & ~self.union(*others))
+
+    def overlap(self, tags: Iterable[str]) -> Dict[Tuple[str, str], int]:
+        """Count the contacts shared by every pair of tags.
+
+        Args:
+            tags (Iterable[str]): The tags to compare.
+
+        Returns:
+            Dict[Tuple[str, str], int]: Shared contacts by pair of tags
+        """
+        tags = list(tags)
+        return {
+            (first, second): _popcount(
+                self._tags.bitmap(first) & self._tags.bitmap(second)
+            )
+            for i, first in enumerate(tags)
+            for second in tags[i + 1 :]
+        }
+
+    def audience_size(
+        self,
+        data: SendToTagsData,
+        status: Optional[StatusFilter] = ContactStatus.ACTIVE,
+    ) -> int:
+        """Estimate the recipients of a `send_to_tags` request.
+
+        Args:
+            data (SendToTagsData): The request payload.
+            status (ContactStatus | Iterable[ContactStatus], optional):
+                Statuses that receive messages. Defaults to active contacts.
+
+        Returns:
+            int: Number of contacts with any of the request tags
+        """
+        return self.count(any_of=data.tags, status=status)
+
+    def msisdns(self, bitmap: int) -> List[Optional[str]]:
+        """Get the MSISDNs of the contacts of a bitmap."""
+        return [self._msisdns[id_] for id_ in from_bitmap(bitmap)]
+
+    def profile_uids(self, bitmap: int) -> List[Optional[str]]:
+        """Get the profile identifiers of the contacts of a bitmap."""
+        return [self._keys[id_] for id_ in from_bitmap(bitmap)]
+
+    def save(self, path: str) -> None:
+        """Write the index to a file.
+
+        The file holds a small JSON header, the raw tag and status bitmaps
+        and the newline-separated contact keys and MSISDNs, so loading it
+        rebuilds nothing.
+
+        Args:
+            path (str): Path of the index file. Parent directories are
+                created.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        bitmaps = [('alive', '', self._alive_bitmap())]
+        bitmaps += [('tag', tag, self._tags.bitmap(tag)) for tag in self._tags]
+        bitmaps += [
+            ('status', status, self._statuses.bitmap(status))
+            for status in self._statuses
+        ]
+        names = [(kind, name) for kind, name, _ in bitmaps]
+        blobs = [
+            bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+            for _, _, bitmap in bitmaps
+        ]
+        blobs.append(_join(self._keys))
+        blobs.append(_join(self._msisdns))
+        header = json.dumps(
+            {
+                'bitmaps': [
+                    [kind, name, len(blob)]
+                    for (kind, name), blob in zip(names, blobs)
+                ],
+                'size': len(self._keys),
+                'keys': len(blobs[-2]),
+                'msisdns': len(blobs[-1]),
+            },
+            separators=(',', ':'),
+        ).encode()
+
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(FORMAT_MAGIC)
+            file.write(_HEADER.pack(len(header)))
+            file.write(header)
+            for blob in blobs:
+                file.write(blob)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'ContactIndex':
+        """Read an index written by `save`.
+
+        Args:
+            path (str): Path of the index file.
+
+        Returns:
+            ContactIndex: The loaded index
+
+        Raises:
+            ValueError: If the file is not a contact index
+        """
+        with open(path, 'rb') as file:
+            content = file.read()
+        if not content.startswith(FORMAT_MAGIC):
+            raise ValueError(f'{path} is not a contact index file')
+
+        offset = len(FORMAT_MAGIC)
+        (size,) = _HEADER.unpack_from(content, offset)
+        offset += _HEADER.size
+        header = json.loads(content[offset : offset + size])
+        offset += size
+
+        bitmaps: Dict[str, Dict[str, int]] = {
+            'alive': {},
+            'tag': {},
+            'status': {},
+        }
+        for kind, name, length in header['bitmaps']:
+            bitmaps[kind][name] = int.from_bytes(
+                content[offset : offset + length], 'little'
+            )
+            offset += length
+        keys = _split(
+            content[offset : offset + header['keys']], header['size']
+        )
+        offset += header['keys']
+        msisdns = _split(
+            content[offset : offset + header['msisdns']], header['size']
+        )
+
+        index = cls()
+        index._keys = keys
+        index._msisdns = msisdns
+        index._ids = {
+            key: id_ for id_, key in enumerate(index._keys) if key is not None
+        }
+        index._tags = _Postings.from_bitmaps(bitmaps['tag'])
+        index._statuses = _Postings.from_bitmaps(bitmaps['status'])
+        index._rows = None
+        index._alive = bitmaps['alive'].get('')
+        return index
+
+    def _alive_bitmap(self) -> int:
+        if self._alive is None:
+            self._alive = to_bitmap(self._ids.values())
+        return self._alive
+
+    def _contact_rows(self) -> List[Optional[Membership]]:
+        if self._rows is None:
+            tags: List[Set[str]] = [set() for _ in self._keys]
+            statuses: List[Optional[str]] = [None] * len(self._keys)
+            for tag in self._tags:
+                for id_ in from_bitmap(self._tags.bitmap(tag)):
+                    tags[id_].add(tag)
+            for status in self._statuses:
+                for id_ in from_bitmap(self._statuses.bitmap(status)):
+                    statuses[id_] = status
+            self._rows = [
+                (frozenset(tags[id_]), statuses[id_])
+                if key is not None
+                else None
+                for id_, key in enumerate(self._keys)
+            ]
+        return self._rows
@@ -0,0 +1,495 @@
+import calendar
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from ..schemas.messages import Message
+from ..schemas.records import MessageRecord
+
+MessageRow = Union[Message, MessageRecord, Dict[str, Any]]
+
+NUMERIC_COLUMNS = {
+    'type': 'q',
+    'sent_count': 'q',
+    'error_count': 'q',
+    'total_recipients': 'q',
+    'is_billable': 'b',
+    'is_scheduled': 'b',
+    'created_on': 'd',
+}
+CATEGORY_COLUMNS = (
+    'status',
+    'country',
+    'short_code',
+    'direction',
+    'msisdn',
+    'created_by',
+)
+TEXT_COLUMNS = ('message_id', 'message')
+
+
+class DictColumn:
+    """Dictionary-encoded string column.
+
+    Each distinct value is stored once and rows hold a compact integer code
+    into the value list.
+    """
+
+    __slots__ = ('codes', 'values', '_index')
+
+    def __init__(self):
+        """Initialize an empty column."""
+        self.codes = array('I')
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Number of rows in the column."""
+        return len(self.codes)
+
+    def encode(self, value: str) -> int:
+        """Get the code of a value, adding it to the dictionary if needed."""
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code_of(self, value: str) -> Optional[int]:
+        """Get the code of a value, or `None` if it never occurs."""
+        return self._index.get(value)
+
+    def append(self, value: str) -> None:
+        """Append a value to the column."""
+        self.codes.append(self.encode(value))
+
+    def __getitem__(self, row: int) -> str:
+        """Decode the value of one row."""
+        return self.values[self.codes[row]]
+
+    def decoded(self) -> List[str]:
+        """Decode every row of the column."""
+        values = self.values
+        return [values[code] for code in self.codes]
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    # Imported on first use, so importing the SDK does not pay for NumPy
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return numpy
+
+
+def _parse_date(value: Union[datetime, str]) -> datetime:
+    if isinstance(value, str):
+        # `fromisoformat` only reads a `Z` suffix from Python 3.11
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _to_epoch(value: datetime) -> float:
+    seconds = calendar.timegm(value.utctimetuple())
+    return seconds + value.microsecond / 1e6
+
+
+def _get(row: MessageRow, name: str) -> Any:
+    if isinstance(row, dict):
+        return row.get(name)
+    return getattr(row, name)
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, 'value', value)
+
+
+class MessageLog:
+    """Compact columnar store of messages with vectorized aggregations.
+
+    Numeric and boolean fields live in `array` columns, `created_on` is
+    stored as UTC epoch seconds, and low-cardinality strings (`status`,
+    `country`, `short_code`, `direction`, `msisdn`, `created_by`) are
+    dictionary-encoded. Aggregations run over the compact columns, and use
+    NumPy when it is installed.
+
+    Args:
+        rows (Iterable[Message | MessageRecord | dict], optional): Messages
+            to load, e.g. the pages returned by `list_messages` in any
+            result mode.
+    """
+
+    def __init__(self, rows: Optional[Iterable[MessageRow]] = None):
+        """Initialize the log and load the given rows."""
+        self._numeric: Dict[str, array] = {
+            name: array(typecode) for name, typecode in NUMERIC_COLUMNS.items()
+        }
+        self._categories: Dict[str, DictColumn] = {
+            name: DictColumn() for name in CATEGORY_COLUMNS
+        }
+        self._text: Dict[str, List[str]] = {name: [] for name in TEXT_COLUMNS}
+        self._naive_dates = True
+        if rows is not None:
+            self.extend(rows)
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Iterable[MessageRow]]) -> 'MessageLog':
+        """Build a log from an iterable of `list_messages` pages.
+
+        Args:
+            pages (Iterable[Iterable[MessageRow]]): The pages to load.
+
+        Returns:
+            MessageLog: The loaded log
+        """
+        log = cls()
+        for page in pages:
+            log.extend(page)
+        return log
+
+    def __len__(self) -> int:
+        """Number of messages in the log."""
+        return len(self._text['message_id'])
+
+    def append(self, row: MessageRow) -> None:
+        """Append one message.
+
+        Args:
+            row (Message | MessageRecord | dict): The message to append.
+        """
+        # Strings of DICT and RECORD rows may carry an offset too
+        created_on = _parse_date(_get(row, 'created_on'))
+        if created_on.tzinfo is not None:
+            self._naive_dates = False
+        for name, column in self._numeric.items():
+            if name == 'created_on':
+                column.append(_to_epoch(created_on))
+            else:
+                column.append(_get(row, name))
+        for name, column in self._categories.items():
+            column.append(_enum_value(_get(row, name)))
+        for name, column in self._text.items():
+            column.append(_get(row, name))
+
+    def extend(self, rows: Iterable[MessageRow]) -> None:
+        """Append many messages.
+
+        Args:
+            rows (Iterable[MessageRow]): The messages to append.
+        """
+        for row in rows:
+            self.append(row)
+
+    def column(self, name: str) -> Sequence[Any]:
+        """Get a column by field name.
+
+        Numeric columns are returned as arrays, categorical columns as their
+        integer code arrays and text columns as lists.
+
+        Args:
+            name (str): The `Message` field name.
+
+        Returns:
+            Sequence[Any]: The column values
+
+        Raises:
+            KeyError: If the column does not exist
+        """
+        if name in self._numeric:
+            return self._numeric[name]
+        if name in self._categories:
+            return self._categories[name].codes
+        return self._text[name]
+
+    def to_numpy(self, name: str) -> Any:
+        """Get a NumPy copy of a numeric or categorical column.
+
+        The array is copied, so the log can keep growing while the caller
+        holds it; a view would pin the column buffer and make `append`
+        fail.
+
+        Args:
+            name (str): The `Message` field name.
+
+        Returns:
+            numpy.ndarray: The column values or category codes
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        np = _numpy()
+        if np is None:
+            raise ImportError(
+                'NumPy is required for to_numpy(); install the '
+                "'analytics' extra"
+            )
+        column = self.column(name)
+        return np.array(column, dtype=column.typecode)
+
+    def categories(self, name: str) -> List[str]:
+        """Get the distinct values of a categorical column, in code order.
+
+        Args:
+            name (str): The categorical column name.
+
+        Returns:
+            List[str]: The values, indexed by code
+        """
+        return self._categories[name].values
+
+    def take(self, rows: Iterable[int]) -> 'MessageLog':
+        """Build a new log with the given row positions.
+
+        Args:
+            rows (Iterable[int]): Row positions to keep, in order.
+
+        Returns:
+            MessageLog: The selected rows
+        """
+        selected = MessageLog()
+        selected._naive_dates = self._naive_dates
+        rows = list(rows)
+        for name, column in self._numeric.items():
+            target = selected._numeric[name]
+            target.extend(column[row] for row in rows)
+        for name, column in self._categories.items():
+            target = selected._categories[name]
+            values = column.values
+            codes = column.codes
+            for row in rows:
+                target.append(values[codes[row]])
+        for name, column in self._text.items():
+            selected._text[name] = [column[row] for row in rows]
+        return selected
+
+    def where(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        **equals: Any,
+    ) -> 'MessageLog':
+        """Filter the log by time range and exact column values.
+
+        Args:
+            since (datetime, optional): Keep messages created at or after.
+            until (datetime, optional): Keep messages created before.
+            **equals: Column values to match, e.g. `status='DELIVERED'` or
+                `is_billable=True`.
+
+        Returns:
+            MessageLog: The matching rows
+        """
+        conditions = []
+        for name, value in equals.items():
+            if name in self._categories:
+                code = self._categories[name].code_of(_enum_value(value))
+                if code is None:
+                    return self.take(())
+                conditions.append((self._categories[name].codes, code))
+            else:
+                conditions.append((self._numeric[name], value))
+
+        created_on = self._numeric['created_on']
+        low = _to_epoch(since) if since is not None else None
+        high = _to_epoch(until) if until is not None else None
+
+        np = _numpy()
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            for column, value in conditions:
+                mask &= np.frombuffer(column, dtype=column.typecode) == value
+            dates = np.frombuffer(created_on, dtype='d')
+            if low is not None:
+                mask &= dates >= low
+            if high is not None:
+                mask &= dates < high
+            return self.take(np.flatnonzero(mask).tolist())
+
+        rows = range(len(self))
+        for column, value in conditions:
+            rows = [row for row in rows if column[row] == value]
+        if low is not None:
+            rows = [row for row in rows if created_on[row] >= low]
+        if high is not None:
+            rows = [row for row in rows if created_on[row] < high]
+        return self.take(rows)
+
+    def sum(self, name: str) -> int:
+        """Sum a numeric column.
+
+        Args:
+            name (str): The numeric column name.
+
+        Returns:
+            int: The column total
+        """
+        column = self._numeric[name]
+        np = _numpy()
+        if np is not None:
+            return np.frombuffer(column, dtype=column.typecode).sum().item()
+        return sum(column)
+
+    def count_by(self, key: str) -> Dict[str, int]:
+        """Count messages per value of a categorical column.
+
+        Args:
+            key (str): The categorical column name, e.g. `status`.
+
+        Returns:
+            Dict[str, int]: Message count per value
+        """
+        column = self._categories[key]
+        values = column.values
+        return {
+            values[code]: count
+            for code, count in Counter(column.codes).items()
+        }
+
+    def sum_by(self, key: str, name: str) -> Dict[str, int]:
+        """Sum a numeric column per value of a categorical column.
+
+        Args:
+            key (str): The categorical column name, e.g. `country`.
+            name (str): The numeric column name, e.g. `sent_count`.
+
+        Returns:
+            Dict[str, int]: Column total per value
+        """
+        column = self._categories[key]
+        totals = _bincount(
+            column.codes, self._numeric[name], len(column.values)
+        )
+        return {
+            value: int(total) for value, total in zip(column.values, totals)
+        }
+
+    def ratio_by(
+        self, key: str, name: str = 'is_billable'
+    ) -> Dict[str, float]:
+        """Mean of a numeric or boolean column per categorical value.
+
+        With the default column this is the billable ratio, e.g. by
+        `country` or `short_code`.
+
+        Args:
+            key (str): The categorical column name.
+            name (str): The numeric or boolean column name.
+
+        Returns:
+            Dict[str, float]: Mean per value
+        """
+        counts = self.count_by(key)
+        totals = self.sum_by(key, name)
+        return {
+            value: totals[value] / count for value, count in counts.items()
+        }
+
+    def bucket(self, width: timedelta) -> array:
+        """Get the start of the time bucket of every message.
+
+        Args:
+            width (timedelta): The bucket width, e.g. one hour.
+
+        Returns:
+            array: Bucket start as epoch seconds, one per message
+        """
+        size = width.total_seconds()
+        created_on = self._numeric['created_on']
+        np = _numpy()
+        if np is not None:
+            dates = np.frombuffer(created_on, dtype='d')
+            return array('d', (np.floor(dates / size) * size).tobytes())
+        return array('d', ((value // size) * size for value in created_on))
+
+    def count_by_bucket(self, width: timedelta) -> Dict[datetime, int]:
+        """Count messages per time bucket of `created_on`.
+
+        Args:
+            width (timedelta): The bucket width.
+
+        Returns:
+            Dict[datetime, int]: Message count per bucket start, sorted
+        """
+        counts = Counter(self.bucket(width))
+        return {
+            self._from_epoch(start): counts[start] for start in sorted(counts)
+        }
+
+    def sum_by_bucket(
+        self, width: timedelta, name: str
+    ) -> Dict[datetime, int]:
+        """Sum a numeric column per time bucket of `created_on`.
+
+        Args:
+            width (timedelta): The bucket width.
+            name (str): The numeric column name.
+
+        Returns:
+            Dict[datetime, int]: Column total per bucket start, sorted
+        """
+        totals: Dict[float, int] = {}
+        for start, value in zip(self.bucket(width), self._numeric[name]):
+            totals[start] = totals.get(start, 0) + value
+        return {
+            self._from_epoch(start): totals[start] for start in sorted(totals)
+        }
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the messages as plain dicts.
+
+        Yields:
+            Dict[str, Any]: One message with decoded values
+        """
+        numeric = self._numeric
+        categories = self._categories
+        text = self._text
+        for row in range(len(self)):
+            data = {name: column[row] for name, column in text.items()}
+            for name, column in categories.items():
+                data[name] = column[row]
+            for name, column in numeric.items():
+                data[name] = column[row]
+            data['created_on'] = self._from_epoch(data['created_on'])
+            yield data
+
+    def to_messages(self) -> List[Message]:
+        """Convert the log back to `Message` models.
+
+        Returns:
+            List[Message]: The messages, in insertion order
+        """
+        return [Message.model_validate(data) for data in self.rows()]
+
+    def _from_epoch(self, value: float) -> datetime:
+        moment = datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(
+            seconds=value
+        )
+        return moment.replace(tzinfo=None) if self._naive_dates else moment
+
+
+def _bincount(codes: array, weights: array, size: int) -> Sequence[int]:
+    np = _numpy()
+    if np is not None:
+        return np.bincount(
+            np.frombuffer(codes, dtype=codes.typecode),
+            weights=np.frombuffer(weights, dtype=weights.typecode),
+            minlength=size,
+        )
+    totals = [0] * size
+    for code, weight in zip(codes, weights):
+        totals[code] += weight
+    return totals
@@ -1,9 +1,134 @@
 import os
-from typing import Any, Dict
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
 
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 
-load_dotenv()
+_dotenv: Optional[Dict[str, Optional[str]]] = None
+_settings: Optional['Settings'] = None
+_lock = threading.RLock()
+
+
+def _dotenv_values() -> Dict[str, Optional[str]]:
+    global _dotenv
+
+    if _dotenv is None:
+        with _lock:
+            if _dotenv is None:
+                _dotenv = dotenv_values()
+    return _dotenv
+
+
+def env(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Get a setting from the environment or the `.env` file.
+
+    The `.env` file is parsed once, on first use, and never copied into
+    `os.environ`. Environment variables take precedence over it.
+
+    Args:
+        name (str): The variable name.
+        default (str, optional): Value when the variable is not set.
+
+    Returns:
+        str, optional: The value
+    """
+    value = os.environ.get(name)
+    if value is None:
+        value = _dotenv_values().get(name)
+    return default if value is None else value
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Immutable credentials and base URL of one API account.
+
+    Attributes:
+        api_key (str): The account API key.
+        api_secret (str): The account API secret.
+        url (str): The base URL of the API.
+    """
+
+    api_key: str
+    api_secret: str = field(repr=False)
+    url: str
+
+    @classmethod
+    def from_env(cls, prefix: str = '') -> 'Settings':
+        """Read the settings from `API_KEY`, `API_SECRET` and `URL`.
+
+        Args:
+            prefix (str): Prefix of the variable names, e.g. `ACME_` for
+                `ACME_API_KEY`.
+
+        Returns:
+            Settings: The settings
+
+        Raises:
+            ValueError: If required environment variables are missing
+        """
+        names = [f'{prefix}API_KEY', f'{prefix}API_SECRET', f'{prefix}URL']
+        values = [env(name) for name in names]
+        missing = [name for name, value in zip(names, values) if not value]
+        if missing:
+            raise ValueError(
+                f'Missing required environment variables: {", ".join(missing)}'
+            )
+        return cls(*values)
+
+    def as_config(self) -> Dict[str, Any]:
+        """Get the settings as a configuration dictionary.
+
+        Returns:
+            Dict[str, Any]: Configuration dictionary with apiKey, apiSecret
+            and url
+        """
+        return {
+            'apiKey': self.api_key,
+            'apiSecret': self.api_secret,
+            'url': self.url,
+        }
+
+
+def get_settings() -> Settings:
+    """Get the default account settings.
+
+    They are read from the environment on first use and kept, so later
+    calls cost a global lookup. Call `reload_settings` after changing the
+    environment.
+
+    Returns:
+        Settings: The default settings
+
+    Raises:
+        ValueError: If required environment variables are missing
+    """
+    global _settings
+
+    if _settings is None:
+        with _lock:
+            if _settings is None:
+                _settings = Settings.from_env()
+    return _settings
+
+
+def reload_settings() -> Settings:
+    """Read the default settings and the `.env` file again.
+
+    Clients already created keep their settings.
+
+    Returns:
+        Settings: The new default settings
+
+    Raises:
+        ValueError: If required environment variables are missing
+    """
+    global _dotenv, _settings
+
+    with _lock:
+        _dotenv = None
+        _settings = None
+    return get_settings()
 
 
 def get_config() -> Dict[str, Any]:
@@ -15,32 +140,16 @@ def get_config() -> Dict[str, Any]:
     Raises:
         ValueError: If required environment variables are missing
     """
-    api_key = os.getenv('API_KEY')
-    api_secret = os.getenv('API_SECRET')
-    url = os.getenv('URL')
-
-    if not api_key or not api_secret or not url:
-        missing = []
-        if not api_key:
-            missing.append('API_KEY')
-        if not api_secret:
-            missing.append('API_SECRET')
-        if not url:
-            missing.append('URL')
-        raise ValueError(
-            f'Missing required environment variables: {", ".join(missing)}'
-        )
-
-    return {
-        'apiKey': api_key,
-        'apiSecret': api_secret,
-        'url': url,
-    }
-
-
-# For backwards compatibility, but prefer get_config()
-config = {
-    'apiKey': os.getenv('API_KEY'),
-    'apiSecret': os.getenv('API_SECRET'),
-    'url': os.getenv('URL'),
-}
+    return get_settings().as_config()
+
+
+def __getattr__(name: str) -> Any:
+    # For backwards compatibility, but prefer get_settings(). The legacy
+    # `config` dict is built on access instead of at import time.
+    if name == 'config':
+        return {
+            'apiKey': env('API_KEY'),
+            'apiSecret': env('API_SECRET'),
+            'url': env('URL'),
+        }
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,15 +1,34 @@
-import os
-
 from loguru import logger
 
-log_path = os.getenv('LOG_PATH', 'logs/im-csm-sdk-python.log')
-log_level = os.getenv('LOG_LEVEL', 'DEBUG')
+from .config import env
+
+log_path = env('LOG_PATH', 'logs/im-csm-sdk-python.log')
+log_level = env('LOG_LEVEL', 'DEBUG')
+# With enqueue, records are written by loguru's background thread, so log
+# calls never block on disk I/O; the queue is flushed on interpreter exit
+log_queued = env('LOG_QUEUED', 'false').lower() in ('1', 'true', 'yes')
+log_buffer_size = int(env('LOG_BUFFER_SIZE', '65536'))
+
+sink_options = {}
+if log_queued:
+    # The file is line buffered by default, one write per record. Queued
+    # records are batched instead: the buffer is written when it is full,
+    # on rotation and when loguru stops the sink at exit
+    sink_options['buffering'] = log_buffer_size
+
 logger.add(
     log_path,
     level=log_level,
     rotation='00:00',
     retention='1 month',
     compression='gz',
+    enqueue=log_queued,
+    **sink_options,
 )
 
-logger.info(f'Logger configuration: {log_path=}, {log_level=}')
+logger.info(
+    'Logger configuration: log_path={!r}, log_level={!r}, log_queued={!r}',
+    log_path,
+    log_level,
+    log_queued,
+)
@@ -0,0 +1,177 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from ..configs.config import Settings
+from .client import CSMClient
+
+
+class AccountRegistry:
+    """Named API accounts, each with its own pooled client and signer.
+
+    Serving several tenants from one process only needs one registry: every
+    account keeps its credentials in an immutable `Settings` and gets a
+    `CSMClient`, created on first use, with its own connection pool and
+    precomputed `Signer`. Looking up an account is a dict lookup, and the
+    registry is safe to share between threads.
+
+    Args:
+        **client_options: Keyword arguments of `CSMClient` used for every
+            account, e.g. `max_connections` or `transport`.
+    """
+
+    def __init__(self, **client_options: Any):
+        """Initialize an empty registry."""
+        self.client_options = client_options
+        self._settings: Dict[str, Settings] = {}
+        self._options: Dict[str, Dict[str, Any]] = {}
+        self._clients: Dict[str, CSMClient] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(
+        cls, names: Iterable[str], **client_options: Any
+    ) -> 'AccountRegistry':
+        """Build a registry from prefixed environment variables.
+
+        The account `acme` reads `ACME_API_KEY`, `ACME_API_SECRET` and
+        `ACME_URL`.
+
+        Args:
+            names (Iterable[str]): The account names.
+            **client_options: Keyword arguments of `CSMClient`.
+
+        Returns:
+            AccountRegistry: The registry
+
+        Raises:
+            ValueError: If required environment variables are missing
+        """
+        registry = cls(**client_options)
+        for name in names:
+            registry.register(name, Settings.from_env(f'{name.upper()}_'))
+        return registry
+
+    def register(
+        self, name: str, settings: Settings, **client_options: Any
+    ) -> None:
+        """Add an account, or replace it and close its previous client.
+
+        Args:
+            name (str): The account name.
+            settings (Settings): Its credentials and base URL.
+            **client_options: Keyword arguments of `CSMClient` for this
+                account, over the registry ones.
+        """
+        with self._lock:
+            self._settings[name] = settings
+            self._options[name] = client_options
+            previous = self._clients.pop(name, None)
+        if previous is not None:
+            previous.close()
+        logger.info('Registered account {}', name)
+
+    def unregister(self, name: str) -> None:
+        """Remove an account and close its client.
+
+        Args:
+            name (str): The account name.
+
+        Raises:
+            KeyError: If the account is not registered
+        """
+        with self._lock:
+            if name not in self._settings:
+                raise KeyError(f'Unknown account {name!r}')
+            del self._settings[name]
+            del self._options[name]
+            previous = self._clients.pop(name, None)
+        if previous is not None:
+            previous.close()
+
+    def client(self, name: str) -> CSMClient:
+        """Get the client of an account.
+
+        Args:
+            name (str): The account name.
+
+        Returns:
+            CSMClient: The client, created on first use
+
+        Raises:
+            KeyError: If the account is not registered
+        """
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                settings = self._settings.get(name)
+                if settings is None:
+                    raise KeyError(f'Unknown account {name!r}')
+                client = CSMClient(
+                    settings.api_key,
+                    settings.api_secret,
+                    settings.url,
+                    **{**self.client_options, **self._options[name]},
+                )
+                self._clients[name] = client
+            return client
+
+    __getitem__ = client
+
+    def settings(self, name: str) -> Settings:
+        """Get the settings of an account.
+
+        Args:
+            name (str): The account name.
+
+        Returns:
+            Settings: Its credentials and base URL
+
+        Raises:
+            KeyError: If the account is not registered
+        """
+        settings = self._settings.get(name)
+        if settings is None:
+            raise KeyError(f'Unknown account {name!r}')
+        return settings
+
+    def names(self) -> List[str]:
+        """Names of the registered accounts."""
+        return list(self._settings)
+
+    def __contains__(self, name: object) -> bool:
+        """Whether an account is registered."""
+        return name in self._settings
+
+    def __len__(self) -> int:
+        """Number of registered accounts."""
+        return len(self._settings)
+
+    def __enter__(self) -> 'AccountRegistry':
+        """Enter the registry context."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the clients when leaving the context."""
+        self.close()
+
+    def close(self, name: Optional[str] = None) -> None:
+        """Close the clients, which are created again on next use.
+
+        Args:
+            name (str, optional): Only close this account's client.
+        """
+        with self._lock:
+            if name is None:
+                clients = list(self._clients.values())
+                self._clients.clear()
+            else:
+                client = self._clients.pop(name, None)
+                clients = [client] if client is not None else []
+        for client in clients:
+            client.close()
@@ -0,0 +1,61 @@
+from typing import Any, Dict, List, Type, TypeVar, Union
+
+from httpx import Response
+from pydantic import TypeAdapter
+
+from ..schemas.contacts import Contact
+from ..schemas.messages import (
+    Message,
+    SendToContactResponse,
+    SendToTagsResponse,
+)
+from ..schemas.records import ContactRecord, MessageRecord, Record
+from ..schemas.request import ResultMode
+
+T = TypeVar('T')
+
+ta_contacts = TypeAdapter(List[Contact])
+ta_contact = TypeAdapter(Contact)
+ta_messages = TypeAdapter(List[Message])
+ta_message = TypeAdapter(Message)
+ta_send_to_contact_response = TypeAdapter(SendToContactResponse)
+ta_send_to_tags_response = TypeAdapter(SendToTagsResponse)
+
+ContactResult = Union[Contact, Dict[str, Any], ContactRecord]
+ContactsResult = Union[
+    List[Contact], List[Dict[str, Any]], List[ContactRecord]
+]
+MessagesResult = Union[
+    List[Message], List[Dict[str, Any]], List[MessageRecord]
+]
+
+
+def decode_response(
+    response: Response,
+    adapter: TypeAdapter[T],
+    record: Type[Record],
+    mode: ResultMode = ResultMode.MODEL,
+) -> Any:
+    """Decode a response body in the requested result mode.
+
+    Models are validated straight from the raw bytes with `validate_json`,
+    without building intermediate Python dicts.
+
+    Args:
+        response (httpx.Response): Response from the API
+        adapter (TypeAdapter): Adapter used in MODEL mode.
+        record (Type[Record]): Record type used in RECORD mode.
+        mode (ResultMode): The shape of the result.
+
+    Returns:
+        Any: Validated models, plain dicts or records, matching the JSON
+    """
+    if mode == ResultMode.MODEL:
+        return adapter.validate_json(response.content)
+
+    data = response.json()
+    if mode == ResultMode.DICT:
+        return data
+    if isinstance(data, list):
+        return [record(item) for item in data]
+    return record(data)
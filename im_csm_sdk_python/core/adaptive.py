@@ -0,0 +1,319 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Union
+
+from httpx import HTTPStatusError, TimeoutException
+from loguru import logger
+
+from .errors import CircuitOpenError
+
+DEFAULT_INITIAL_LIMIT = 10
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 200
+DEFAULT_DECREASE_FACTOR = 0.7
+DEFAULT_LATENCY_TOLERANCE = 2.0
+DEFAULT_ERROR_THRESHOLD = 0.05
+MIN_WINDOW_SAMPLES = 20
+HISTORY_SIZE = 1000
+
+
+def is_overload(error: Optional[BaseException]) -> bool:
+    """Whether an error means the API is overloaded.
+
+    Args:
+        error (BaseException, optional): The error of a request.
+
+    Returns:
+        bool: True for 429 and 5xx responses, timeouts and an open circuit
+    """
+    if isinstance(error, HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, (TimeoutException, CircuitOpenError))
+
+
+@dataclass(frozen=True)
+class LimitAdjustment:
+    """One change of an adaptive limit.
+
+    Attributes:
+        at (float): `time.time()` of the change.
+        previous (int): Limit before the change.
+        limit (int): Limit after the change.
+        reason (str): `increase`, `errors` or `latency`.
+        p90 (float): 90th percentile latency of the window, in seconds.
+        error_rate (float): Share of overloaded requests in the window.
+    """
+
+    at: float
+    previous: int
+    limit: int
+    reason: str
+    p90: float
+    error_rate: float
+
+
+class AdaptiveLimiter:
+    """AIMD limit on the number of requests in flight to one endpoint.
+
+    Completions are judged in windows of about one round of requests. The
+    limit grows by `increase` after a window that used the whole limit with
+    healthy responses, and shrinks by `decrease_factor` after a window
+    whose 429/5xx rate exceeds `error_threshold` or whose p90 latency
+    exceeds `latency_tolerance` times the baseline latency. The baseline
+    follows the lowest observed median and drifts up slowly.
+
+    Use one limiter per endpoint so a slow listing does not throttle
+    sends. The limiter is thread-safe and can be shared by threads and
+    event loops.
+
+    Args:
+        name (str): Label used in logs, e.g. the endpoint.
+        initial (int): Starting limit.
+        min_limit (int): Lowest limit.
+        max_limit (int): Highest limit.
+        increase (int): Additive step after a healthy, saturated window.
+        decrease_factor (float): Multiplicative step after an unhealthy one.
+        latency_tolerance (float): Allowed p90 over baseline latency ratio.
+        error_threshold (float): Allowed share of overloaded requests.
+    """
+
+    def __init__(
+        self,
+        name: str = 'default',
+        initial: int = DEFAULT_INITIAL_LIMIT,
+        min_limit: int = DEFAULT_MIN_LIMIT,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        increase: int = 1,
+        decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+        latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+        error_threshold: float = DEFAULT_ERROR_THRESHOLD,
+    ):
+        """Initialize the limiter."""
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError('Limits must satisfy 1 <= min <= initial <= max')
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.error_threshold = error_threshold
+        self.baseline: Optional[float] = None
+        self.history: Deque[LimitAdjustment] = deque(maxlen=HISTORY_SIZE)
+        self._limit = initial
+        self._in_flight = 0
+        self._peak = 0
+        self._latencies: List[float] = []
+        self._overloads = 0
+        self._condition = threading.Condition()
+
+    @classmethod
+    def fixed(cls, limit: int, name: str = 'fixed') -> 'AdaptiveLimiter':
+        """Build a limiter that never changes its limit.
+
+        Args:
+            limit (int): The limit.
+            name (str): Label used in logs.
+
+        Returns:
+            AdaptiveLimiter: The limiter
+
+        Raises:
+            ValueError: If limit is lower than 1
+        """
+        if limit < 1:
+            raise ValueError('Concurrency must be at least 1')
+        return cls(name, initial=limit, min_limit=limit, max_limit=limit)
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests holding a slot."""
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free.
+
+        Returns:
+            bool: Whether a slot was taken
+        """
+        with self._condition:
+            if self._in_flight >= self._limit:
+                return False
+            self._take()
+            return True
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a free slot and take it.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait.
+
+        Returns:
+            bool: Whether a slot was taken before the timeout
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._in_flight < self._limit, timeout
+            ):
+                return False
+            self._take()
+            return True
+
+    async def aacquire(self, poll_interval: float = 0.005) -> None:
+        """Wait for a free slot without blocking the event loop.
+
+        Slots can be released from other threads, so the wait polls.
+
+        Args:
+            poll_interval (float): Seconds between two checks.
+        """
+        while not self.try_acquire():
+            await asyncio.sleep(poll_interval)
+
+    def release(self, latency: float, overloaded: bool = False) -> None:
+        """Give back a slot and record how the request went.
+
+        Args:
+            latency (float): Seconds the request took.
+            overloaded (bool): Whether it failed with an overload signal.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._latencies.append(latency)
+            self._overloads += overloaded
+            if len(self._latencies) >= max(self._limit, MIN_WINDOW_SAMPLES):
+                self._adjust()
+            self._condition.notify_all()
+
+    def cancel(self) -> None:
+        """Give back a slot whose request was never sent."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _take(self) -> None:
+        self._in_flight += 1
+        self._peak = max(self._peak, self._in_flight)
+
+    def _adjust(self) -> None:
+        latencies = sorted(self._latencies)
+        count = len(latencies)
+        p50 = latencies[count // 2]
+        p90 = latencies[min(count - 1, math.ceil(count * 0.9) - 1)]
+        error_rate = self._overloads / count
+        saturated = self._peak >= self._limit
+
+        if self.baseline is None or p50 < self.baseline:
+            self.baseline = p50
+        else:
+            self.baseline += (p50 - self.baseline) * 0.05
+
+        previous = self._limit
+        if error_rate > self.error_threshold:
+            reason = 'errors'
+        elif p90 > self.baseline * self.latency_tolerance:
+            reason = 'latency'
+        elif saturated:
+            reason = 'increase'
+        else:
+            reason = ''
+
+        if reason == 'increase':
+            self._limit = min(self.max_limit, previous + self.increase)
+        elif reason:
+            self._limit = max(
+                self.min_limit, math.floor(previous * self.decrease_factor)
+            )
+
+        self._latencies = []
+        self._overloads = 0
+        self._peak = self._in_flight
+        if self._limit != previous:
+            self.history.append(
+                LimitAdjustment(
+                    time.time(), previous, self._limit, reason, p90, error_rate
+                )
+            )
+            logger.debug(
+                'Concurrency {}: {} -> {} ({}, p90={:.3f}s, errors={:.1%})',
+                self.name,
+                previous,
+                self._limit,
+                reason,
+                p90,
+                error_rate,
+            )
+
+
+class AdaptiveLimiters:
+    """One `AdaptiveLimiter` per endpoint, created on first use.
+
+    Args:
+        **defaults: Keyword arguments for every new `AdaptiveLimiter`.
+    """
+
+    def __init__(self, **defaults: Union[int, float]):
+        """Initialize an empty registry."""
+        self.defaults = defaults
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> AdaptiveLimiter:
+        """Get the limiter of an endpoint.
+
+        Args:
+            endpoint (str): The endpoint, e.g. `messages/send_to_contact`.
+
+        Returns:
+            AdaptiveLimiter: The endpoint limiter
+        """
+        key = endpoint.strip('/')
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = AdaptiveLimiter(
+                    key, **self.defaults
+                )
+            return limiter
+
+    def limits(self) -> Dict[str, int]:
+        """Current limit of every endpoint.
+
+        Returns:
+            Dict[str, int]: Limit by endpoint
+        """
+        with self._lock:
+            return {
+                key: limiter.limit for key, limiter in self._limiters.items()
+            }
+
+
+Concurrency = Union[int, AdaptiveLimiter]
+
+
+def as_limiter(concurrency: Concurrency) -> AdaptiveLimiter:
+    """Turn a fixed concurrency into a limiter.
+
+    Args:
+        concurrency (int | AdaptiveLimiter): A fixed number of requests in
+            flight, or a limiter to use as is.
+
+    Returns:
+        AdaptiveLimiter: The limiter
+
+    Raises:
+        ValueError: If a fixed concurrency is lower than 1
+    """
+    if isinstance(concurrency, AdaptiveLimiter):
+        return concurrency
+    return AdaptiveLimiter.fixed(concurrency)
@@ -0,0 +1,304 @@
+from typing import Any, Awaitable, Dict, Optional
+
+import httpx
+from loguru import logger
+
+from ..helpers.api_request import AnyRequest, async_send_request
+from ..helpers.authentication import Signer
+from ..helpers.metrics import MetricsCollector
+from ..helpers.rate_limit import RateLimiter
+from ..helpers.retry import Retrier
+from ..helpers.single_flight import AsyncSingleFlight, request_key
+from ..schemas.contacts import ListContactsParams
+from ..schemas.messages import (
+    ListMessagesParams,
+    SendToContactData,
+    SendToContactResponse,
+    SendToTagsData,
+    SendToTagsResponse,
+)
+from ..schemas.request import ResultMode
+from .adapters import (
+    ContactResult,
+    ContactsResult,
+    MessagesResult,
+)
+from .client import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_TIMEOUT,
+    http_client_options,
+    resolve_config,
+)
+from .endpoints import Endpoints, decode
+
+
+class AsyncCSMClient:
+    """Asyncio client for the IM CSM API.
+
+    The client owns a long-lived `httpx.AsyncClient`, so many requests can
+    be in flight on a single event loop while sharing pooled connections.
+    Signing and response validation are the same as in `CSMClient`.
+
+    Args:
+        api_key (str, optional): The account API key. Defaults to `API_KEY`.
+        api_secret (str, optional): The account API secret. Defaults to
+            `API_SECRET`.
+        url (str, optional): The base URL of the API. Defaults to `URL`.
+        max_connections (int): Maximum number of open connections.
+        max_keepalive_connections (int): Maximum number of idle connections
+            kept in the pool.
+        keepalive_expiry (float): Seconds an idle connection is kept alive.
+        timeout (float): Default timeout in seconds for every operation.
+        connect_timeout (float, optional): Timeout for establishing a
+            connection. Defaults to `timeout`.
+        http2 (bool): Whether to enable HTTP/2. Requires the `http2` extra.
+        transport (httpx.AsyncBaseTransport, optional): Custom transport,
+            e.g. an `httpx.MockTransport` for offline use.
+        retrier (Retrier, optional): Retry policy, circuit breaker and their
+            metrics, e.g. `Retrier(RetryPolicy(), CircuitBreaker())`.
+            Defaults to sending every request once.
+        rate_limiter (RateLimiter, optional): Per-endpoint rate limits
+            applied before every attempt. Defaults to no limit.
+        coalesce (bool): Whether identical GET requests in flight at the
+            same time share one upstream call.
+        metrics (MetricsCollector, optional): Receives request counts,
+            sizes and phase timings, e.g. a `Metrics`. Disabled by default.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        url: Optional[str] = None,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: float = DEFAULT_TIMEOUT,
+        connect_timeout: Optional[float] = None,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        retrier: Optional[Retrier] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        coalesce: bool = True,
+        metrics: Optional[MetricsCollector] = None,
+    ):
+        """Initialize the client and its connection pool."""
+        self.config = resolve_config(api_key, api_secret, url)
+        self.signer = Signer(self.config['apiKey'], self.config['apiSecret'])
+        self.endpoints = Endpoints(self.config['url'])
+        self.metrics = metrics
+        self.retrier = retrier
+        self.rate_limiter = rate_limiter
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self._http = httpx.AsyncClient(
+            transport=transport,
+            **http_client_options(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                timeout=timeout,
+                connect_timeout=connect_timeout,
+                http2=http2,
+            ),
+        )
+
+    async def __aenter__(self) -> 'AsyncCSMClient':
+        """Enter the client context."""
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the client when leaving the context."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._http.aclose()
+
+    async def send_request(self, api_request: AnyRequest) -> httpx.Response:
+        """Send an authenticated request through the connection pool.
+
+        Identical GET requests sent concurrently share one upstream call
+        and its response.
+
+        Args:
+            api_request (ApiRequest | PreparedRequest): The request to send.
+                The client methods use prepared requests of `endpoints`.
+
+        Returns:
+            httpx.Response: Response from the API
+        """
+
+        def send() -> Awaitable[httpx.Response]:
+            return async_send_request(
+                api_request,
+                client=self._http,
+                config=self.config,
+                signer=self.signer,
+                retrier=self.retrier,
+                rate_limiter=self.rate_limiter,
+                metrics=self.metrics,
+            )
+
+        key = request_key(api_request) if self.single_flight else None
+        if key is None:
+            return await send()
+        return await self.single_flight.do(key, send)
+
+    async def list_contacts(
+        self,
+        params: ListContactsParams,
+        mode: ResultMode = ResultMode.MODEL,
+    ) -> ContactsResult:
+        """List all contacts.
+
+        Args:
+            params (ListContactsParams): The parameters to list the contacts.
+            mode (ResultMode): Return models, plain dicts or records.
+
+        Returns:
+            List[Contact]: List of contacts
+
+        Raises:
+            Exception: If API response is invalid
+        """
+        try:
+            logger.info('Step 1. List contacts')
+
+            request = self.endpoints.contacts.request(
+                params=params.model_dump(exclude_none=True)
+            )
+            response = await self.send_request(request)
+
+            return decode(request, response, mode, self.metrics)
+        except Exception as e:
+            logger.error(f'Error listing contacts: {e}')
+            raise e
+
+    async def get_contact(
+        self, msisdn: str, mode: ResultMode = ResultMode.MODEL
+    ) -> ContactResult:
+        """Get a contact by MSISDN.
+
+        Args:
+            msisdn (str): The MSISDN number of the contact to retrieve.
+            mode (ResultMode): Return a model, a plain dict or a record.
+
+        Returns:
+            Contact: The contact information
+
+        Raises:
+            Exception: If API response is invalid
+        """
+        try:
+            logger.info('Step 1. Get contact {}', msisdn)
+
+            request = self.endpoints.contact.request(
+                params={'msisdn': msisdn}, path=msisdn
+            )
+            response = await self.send_request(request)
+
+            return decode(request, response, mode, self.metrics)
+        except Exception as e:
+            logger.error(f'Error getting contact: {e}')
+            raise e
+
+    async def list_messages(
+        self,
+        params: ListMessagesParams,
+        mode: ResultMode = ResultMode.MODEL,
+    ) -> MessagesResult:
+        """Gets log message list.
+
+        Args:
+            params (ListMessagesParams): The parameters to list the messages.
+            mode (ResultMode): Return models, plain dicts or records.
+
+        Returns:
+            List[Message]: List of messages
+
+        Raises:
+            Exception: If API response is invalid
+        """
+        try:
+            logger.info('Step 1. List messages')
+
+            request = self.endpoints.messages.request(
+                params=params.model_dump(exclude_none=True)
+            )
+            response = await self.send_request(request)
+
+            return decode(request, response, mode, self.metrics)
+        except Exception as e:
+            logger.error(f'Error listing messages: {e}')
+            raise e
+
+    async def send_to_contact(
+        self, data: SendToContactData
+    ) -> SendToContactResponse:
+        """Sends a message to a specific contact.
+
+        Args:
+            data (SendToContactData): The data payload to send the message.
+
+        Returns:
+            SendToContactResponse: The message just sent
+
+        Raises:
+            Exception: If API response is invalid
+        """
+        try:
+            logger.info('Step 1. Send message to contact {}', data.msisdn)
+
+            request = self.endpoints.send_to_contact.request(
+                data=data.model_dump(exclude_none=True)
+            )
+            response = await self.send_request(request)
+
+            return decode(request, response, metrics=self.metrics)
+        except Exception as e:
+            logger.error(f'Error sending message to contact: {e}')
+            raise e
+
+    async def send_to_tags(self, data: SendToTagsData) -> SendToTagsResponse:
+        """Sends a message to a specific tag.
+
+        Args:
+            data (SendToTagsData): The data payload to send the message.
+
+        Returns:
+            SendToTagsResponse: The message just sent
+        """
+        try:
+            logger.info('Step 1. Send message to tags {}', data.tags)
+
+            request = self.endpoints.send_to_tags.request(
+                data=data.model_dump(exclude_none=True)
+            )
+            response = await self.send_request(request)
+
+            return decode(request, response, metrics=self.metrics)
+        except Exception as e:
+            logger.error(f'Error sending message to tags: {e}')
+            raise e
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Get the status of the API.
+
+        Returns:
+            Dict[str, Any]: The status information from the API
+
+        Raises:
+            ValueError: If API response is invalid
+        """
+        try:
+            logger.info('Step 1. Get API status')
+
+            response = await self.send_request(self.endpoints.status.request())
+
+            return response.json()
+        except Exception as e:
+            logger.error(f'Error getting status: {e}')
+            raise e
@@ -0,0 +1,310 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..schemas.messages import SendToContactData, SendToContactResponse
+from .adaptive import AdaptiveLimiter, Concurrency, as_limiter, is_overload
+from .async_client import AsyncCSMClient
+from .client import CSMClient, get_default_client
+
+SendResult = Tuple[SendToContactData, Union[SendToContactResponse, Exception]]
+
+DEFAULT_CONCURRENCY = 10
+
+# Marks the end of the payloads; `None` is left to the items themselves
+_DONE = object()
+
+
+@dataclass
+class BulkStats:
+    """Aggregate counters for a bulk send.
+
+    The counters are updated as results complete and can be read from
+    another thread while the send is running.
+
+    Attributes:
+        submitted (int): Number of payloads handed to the API.
+        succeeded (int): Number of payloads sent successfully.
+        failed (int): Number of payloads that raised an error.
+        errors (Dict[str, int]): Failures grouped by exception type.
+        started_at (float, optional): `time.monotonic()` of the first submit.
+        finished_at (float, optional): `time.monotonic()` of the last result.
+    """
+
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @property
+    def completed(self) -> int:
+        """Number of payloads with a result."""
+        return self.succeeded + self.failed
+
+    @property
+    def in_flight(self) -> int:
+        """Number of payloads still waiting for a result."""
+        return self.submitted - self.completed
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the first submit."""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at or time.monotonic()
+        return end - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Completed payloads per second."""
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def record_submit(self) -> None:
+        """Count a payload handed to the API."""
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.monotonic()
+            self.submitted += 1
+
+    def record_result(
+        self, result: Union[SendToContactResponse, Exception]
+    ) -> None:
+        """Count a completed payload.
+
+        Args:
+            result (SendToContactResponse | Exception): The payload outcome.
+        """
+        with self._lock:
+            if isinstance(result, Exception):
+                self.failed += 1
+                name = type(result).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+            else:
+                self.succeeded += 1
+            self.finished_at = time.monotonic()
+
+
+def _send_one(
+    client: CSMClient, data: SendToContactData, limiter: AdaptiveLimiter
+) -> Union[SendToContactResponse, Exception]:
+    started = time.perf_counter()
+    result: Union[SendToContactResponse, Exception]
+    try:
+        result = client.send_to_contact(data)
+    except Exception as e:
+        result = e
+    limiter.release(
+        time.perf_counter() - started,
+        isinstance(result, Exception) and is_overload(result),
+    )
+    return result
+
+
+def send_many(
+    items: Iterable[SendToContactData],
+    *,
+    client: Optional[CSMClient] = None,
+    concurrency: Concurrency = DEFAULT_CONCURRENCY,
+    stats: Optional[BulkStats] = None,
+) -> Iterator[SendResult]:
+    """Send messages to many contacts with bounded concurrency.
+
+    Inputs are consumed lazily and at most `concurrency` requests are in
+    flight at any time, so memory stays flat regardless of input size.
+    Failures do not stop the send; they are yielded as results.
+
+    Pass an `AdaptiveLimiter` as `concurrency` to tune the number of
+    requests in flight from observed latency and 429/5xx responses.
+
+    Args:
+        items (Iterable[SendToContactData]): The payloads to send.
+        client (CSMClient, optional): The client to send with. Defaults to
+            the shared default client.
+        concurrency (int | AdaptiveLimiter): Maximum number of requests in
+            flight, fixed or adaptive.
+        stats (BulkStats, optional): Counters updated as results complete.
+
+    Yields:
+        Tuple[SendToContactData, SendToContactResponse | Exception]: Each
+            input with its response or error, in completion order.
+
+    Raises:
+        ValueError: If concurrency is lower than 1
+    """
+    limiter = as_limiter(concurrency)
+    client = client or get_default_client()
+    stats = stats if stats is not None else BulkStats()
+    source = iter(items)
+    pending: Dict[Future, SendToContactData] = {}
+    # A payload read from the source while every slot was taken
+    waiting: List[SendToContactData] = []
+
+    with ThreadPoolExecutor(
+        max_workers=limiter.max_limit, thread_name_prefix='csm-bulk'
+    ) as executor:
+
+        def fill() -> None:
+            while True:
+                if not waiting:
+                    data = next(source, _DONE)
+                    if data is _DONE:
+                        return
+                    waiting.append(data)
+                # With nothing of ours in flight, wait for other users
+                if pending and (
+                    len(pending) >= limiter.limit or not limiter.try_acquire()
+                ):
+                    return
+                if not pending:
+                    limiter.acquire()
+                data = waiting.pop()
+                stats.record_submit()
+                pending[executor.submit(_send_one, client, data, limiter)] = (
+                    data
+                )
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                data = pending.pop(future)
+                result = future.result()
+                stats.record_result(result)
+                yield data, result
+            fill()
+
+
+async def _asend_one(
+    client: AsyncCSMClient, data: SendToContactData, limiter: AdaptiveLimiter
+) -> SendResult:
+    started = time.perf_counter()
+    result: Union[SendToContactResponse, Exception]
+    try:
+        result = await client.send_to_contact(data)
+    except Exception as e:
+        result = e
+    limiter.release(
+        time.perf_counter() - started,
+        isinstance(result, Exception) and is_overload(result),
+    )
+    return data, result
+
+
+def _start_send(
+    client: AsyncCSMClient, data: SendToContactData, limiter: AdaptiveLimiter
+) -> 'asyncio.Future[SendResult]':
+    task = asyncio.ensure_future(_asend_one(client, data, limiter))
+
+    def give_back(task: 'asyncio.Future[SendResult]') -> None:
+        # A task cancelled before or while sending never reaches `release`
+        if task.cancelled():
+            limiter.cancel()
+
+    task.add_done_callback(give_back)
+    return task
+
+
+async def asend_many(
+    items: Union[
+        Iterable[SendToContactData], AsyncIterable[SendToContactData]
+    ],
+    *,
+    client: AsyncCSMClient,
+    concurrency: Concurrency = DEFAULT_CONCURRENCY,
+    stats: Optional[BulkStats] = None,
+) -> AsyncIterator[SendResult]:
+    """Send messages to many contacts on the running event loop.
+
+    Same semantics as `send_many`, using tasks instead of threads.
+
+    Args:
+        items (Iterable | AsyncIterable[SendToContactData]): The payloads
+            to send.
+        client (AsyncCSMClient): The client to send with.
+        concurrency (int | AdaptiveLimiter): Maximum number of requests in
+            flight, fixed or adaptive.
+        stats (BulkStats, optional): Counters updated as results complete.
+
+    Yields:
+        Tuple[SendToContactData, SendToContactResponse | Exception]: Each
+            input with its response or error, in completion order.
+
+    Raises:
+        ValueError: If concurrency is lower than 1
+    """
+    limiter = as_limiter(concurrency)
+    stats = stats if stats is not None else BulkStats()
+    if isinstance(items, AsyncIterable):
+        source = items.__aiter__()
+    else:
+        source = _aiter_sync(items)
+    pending = set()
+    waiting: List[SendToContactData] = []
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted:
+                if not waiting:
+                    try:
+                        waiting.append(await source.__anext__())
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                if pending and (
+                    len(pending) >= limiter.limit or not limiter.try_acquire()
+                ):
+                    break
+                if not pending:
+                    await limiter.aacquire()
+                data = waiting.pop()
+                stats.record_submit()
+                pending.add(_start_send(client, data, limiter))
+
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                data, result = task.result()
+                stats.record_result(result)
+                yield data, result
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            # Let the cancelled sends give their slots back
+            await asyncio.wait(pending)
+
+
+async def _aiter_sync(
+    items: Iterable[SendToContactData],
+) -> AsyncIterator[SendToContactData]:
+    for item in items:
+        yield item
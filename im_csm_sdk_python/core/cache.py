@@ -0,0 +1,407 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Protocol, Tuple
+
+from httpx import HTTPStatusError
+from loguru import logger
+
+from ..schemas.contacts import Contact
+from .adapters import ta_contact
+from .client import CSMClient, get_default_client
+from .errors import ContactNotFoundError
+
+DEFAULT_MAX_SIZE = 10_000
+DEFAULT_TTL = 300.0
+DEFAULT_NEGATIVE_TTL = 60.0
+
+# A cached lookup: the contact, or None when the API answered 404
+CacheEntry = Optional[Contact]
+
+
+class CacheBackend(Protocol):
+    """Storage used by `ContactCache`.
+
+    Backends own expiry and eviction. `get` returns whether a live entry
+    was found and the entry itself, `set` returns how many entries were
+    evicted to make room.
+    """
+
+    def get(self, key: str) -> Tuple[bool, CacheEntry]:
+        """Get a live entry."""
+        ...
+
+    def set(self, key: str, value: CacheEntry, ttl: float) -> int:
+        """Store an entry for `ttl` seconds."""
+        ...
+
+    def delete(self, key: str) -> None:
+        """Remove an entry."""
+        ...
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        ...
+
+
+def _copy(value: CacheEntry) -> CacheEntry:
+    # `tags` is the only mutable field, so this is a deep copy for less
+    if value is None:
+        return None
+    return value.model_copy(update={'tags': list(value.tags)})
+
+
+class MemoryCacheBackend:
+    """In-process LRU backend with per-entry expiry.
+
+    Contacts are copied in and out, so callers never share the stored
+    object.
+
+    Args:
+        max_size (int): Maximum number of entries kept.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        """Initialize an empty backend."""
+        self.max_size = max_size
+        self._entries: 'OrderedDict[str, Tuple[float, CacheEntry]]' = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of stored entries, including expired ones."""
+        return len(self._entries)
+
+    def get(self, key: str) -> Tuple[bool, CacheEntry]:
+        """Get a live entry and mark it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Tuple[bool, CacheEntry]: Whether the entry was found, and the entry
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return False, None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        return True, _copy(value)
+
+    def set(self, key: str, value: CacheEntry, ttl: float) -> int:
+        """Store an entry, evicting the least recently used ones if full.
+
+        Args:
+            key (str): The cache key.
+            value (CacheEntry): The contact, or `None` for a missing contact.
+            ttl (float): Seconds the entry stays valid.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        evicted = 0
+        value = _copy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def delete(self, key: str) -> None:
+        """Remove an entry.
+
+        Args:
+            key (str): The cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class SqliteCacheBackend:
+    """LRU backend stored in a local SQLite file.
+
+    Several worker processes on the same host can share one file. Entries
+    expire by wall-clock time, and the least recently used entries are
+    evicted beyond `max_size`.
+
+    Args:
+        path (str): Path of the SQLite database file.
+        max_size (int): Maximum number of entries kept.
+    """
+
+    def __init__(self, path: str, max_size: int = DEFAULT_MAX_SIZE):
+        """Initialize the backend and create its table."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_size = max_size
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS contact_cache ('
+                ' key TEXT PRIMARY KEY,'
+                ' value BLOB,'
+                ' expires_at REAL NOT NULL,'
+                ' accessed_at REAL NOT NULL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS contact_cache_accessed_at'
+                ' ON contact_cache (accessed_at)'
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not be used across a fork, so a forked child
+        # leaves the inherited one alone and opens its own
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Tuple[bool, CacheEntry]:
+        """Get a live entry and mark it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Tuple[bool, CacheEntry]: Whether the entry was found, and the entry
+        """
+        now = time.time()
+        with self._connection() as connection:
+            row = connection.execute(
+                'SELECT value, expires_at FROM contact_cache WHERE key = ?',
+                (key,),
+            ).fetchone()
+            if row is None:
+                return False, None
+            value, expires_at = row
+            if expires_at <= now:
+                connection.execute(
+                    'DELETE FROM contact_cache WHERE key = ?', (key,)
+                )
+                return False, None
+            connection.execute(
+                'UPDATE contact_cache SET accessed_at = ? WHERE key = ?',
+                (now, key),
+            )
+        if value is None:
+            return True, None
+        return True, ta_contact.validate_json(value)
+
+    def set(self, key: str, value: CacheEntry, ttl: float) -> int:
+        """Store an entry, evicting the least recently used ones if full.
+
+        Args:
+            key (str): The cache key.
+            value (CacheEntry): The contact, or `None` for a missing contact.
+            ttl (float): Seconds the entry stays valid.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        now = time.time()
+        payload = value.model_dump_json() if value is not None else None
+        with self._connection() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO contact_cache'
+                ' (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, payload, now + ttl, now),
+            )
+            (size,) = connection.execute(
+                'SELECT COUNT(*) FROM contact_cache'
+            ).fetchone()
+            if size <= self.max_size:
+                return 0
+            evicted = size - self.max_size
+            connection.execute(
+                'DELETE FROM contact_cache WHERE key IN ('
+                ' SELECT key FROM contact_cache'
+                ' ORDER BY accessed_at LIMIT ?)',
+                (evicted,),
+            )
+        return evicted
+
+    def delete(self, key: str) -> None:
+        """Remove an entry.
+
+        Args:
+            key (str): The cache key.
+        """
+        with self._connection() as connection:
+            connection.execute(
+                'DELETE FROM contact_cache WHERE key = ?', (key,)
+            )
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._connection() as connection:
+            connection.execute('DELETE FROM contact_cache')
+
+
+@dataclass
+class CacheStats:
+    """Counters for a `ContactCache`.
+
+    Attributes:
+        hits (int): Lookups answered from the cache, including negative hits.
+        negative_hits (int): Hits on a cached 404.
+        misses (int): Lookups that went to the API.
+        evictions (int): Entries evicted to respect the size limit.
+        invalidations (int): Entries removed through `invalidate`.
+    """
+
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def add(self, **counts: int) -> None:
+        """Increment counters by name.
+
+        Args:
+            **counts: The increment of each counter.
+        """
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+
+class ContactCache:
+    """TTL/LRU cache in front of `get_contact`, keyed by MSISDN.
+
+    Contacts are cached for `ttl` seconds. A 404 from the API is cached for
+    `negative_ttl` seconds and raised as `ContactNotFoundError` without
+    another round trip.
+
+    Args:
+        client (CSMClient, optional): The client used on misses. Defaults to
+            the shared default client.
+        backend (CacheBackend, optional): Where entries are stored. Defaults
+            to a `MemoryCacheBackend` holding `max_size` entries.
+        max_size (int): Size of the default backend.
+        ttl (float): Seconds a contact stays cached.
+        negative_ttl (float): Seconds a missing contact stays cached. Use 0
+            to disable negative caching.
+    """
+
+    def __init__(
+        self,
+        client: Optional[CSMClient] = None,
+        backend: Optional[CacheBackend] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+    ):
+        """Initialize the cache."""
+        self._client = client
+        self.backend = backend or MemoryCacheBackend(max_size)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = CacheStats()
+
+    @property
+    def client(self) -> CSMClient:
+        """The client used on cache misses."""
+        return self._client or get_default_client()
+
+    def get_contact(self, msisdn: str) -> Contact:
+        """Get a contact by MSISDN, from the cache when possible.
+
+        Args:
+            msisdn (str): The MSISDN number of the contact to retrieve.
+
+        Returns:
+            Contact: The contact information
+
+        Raises:
+            ContactNotFoundError: If the API has no contact for the MSISDN
+            Exception: If API response is invalid
+        """
+        found, contact = self.backend.get(msisdn)
+        if found:
+            if contact is None:
+                self.stats.add(hits=1, negative_hits=1)
+                raise ContactNotFoundError(msisdn)
+            self.stats.add(hits=1)
+            return contact
+
+        self.stats.add(misses=1)
+        try:
+            contact = self.client.get_contact(msisdn)
+        except HTTPStatusError as e:
+            if e.response.status_code != 404:
+                raise
+            if self.negative_ttl > 0:
+                self._store(msisdn, None, self.negative_ttl)
+            raise ContactNotFoundError(msisdn) from e
+
+        self._store(msisdn, contact, self.ttl)
+        return contact
+
+    def put(self, contact: Contact) -> None:
+        """Store a contact obtained elsewhere, e.g. from `list_contacts`.
+
+        Args:
+            contact (Contact): The contact to cache. Ignored without msisdn.
+        """
+        if contact.msisdn:
+            self._store(contact.msisdn, contact, self.ttl)
+
+    def invalidate(self, msisdn: str) -> None:
+        """Drop the cached entry of an MSISDN.
+
+        Args:
+            msisdn (str): The MSISDN to invalidate.
+        """
+        self.backend.delete(msisdn)
+        self.stats.add(invalidations=1)
+
+    def invalidate_many(self, msisdns: Iterable[str]) -> None:
+        """Drop the cached entries of several MSISDNs.
+
+        Args:
+            msisdns (Iterable[str]): The MSISDNs to invalidate.
+        """
+        for msisdn in msisdns:
+            self.invalidate(msisdn)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self.backend.clear()
+
+    def _store(self, msisdn: str, value: CacheEntry, ttl: float) -> None:
+        evicted = self.backend.set(msisdn, value, ttl)
+        if evicted:
+            self.stats.add(evictions=evicted)
+            logger.debug('Contact cache evicted {} entries', evicted)
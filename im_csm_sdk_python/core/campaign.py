@@ -0,0 +1,597 @@
+import csv
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from functools import partial
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from loguru import logger
+from pydantic import ValidationError
+
+from ..schemas.messages import SendToContactData, SendToContactResponse
+from .bulk import DEFAULT_CONCURRENCY, send_many
+from .client import CSMClient, resolve_config
+
+DEFAULT_WORKERS = 4
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_CHECKPOINT_INTERVAL = 5.0
+CHECKPOINT_SUFFIX = '.checkpoint'
+PARENT_POLL_INTERVAL = 1.0
+
+STATUS_ERROR = 'ERROR'
+STATUS_INVALID = 'INVALID'
+
+# A row to send: its input offset and payload
+Row = Tuple[int, SendToContactData]
+
+
+class InputFormat(str, Enum):
+    """Enum for campaign input file formats."""
+
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+
+    @classmethod
+    def detect(cls, path: str) -> 'InputFormat':
+        """Guess the format from the file extension.
+
+        Args:
+            path (str): The input file path.
+
+        Returns:
+            InputFormat: NDJSON for `.ndjson`/`.jsonl`, CSV otherwise
+        """
+        extension = os.path.splitext(path)[1].lower()
+        return cls.NDJSON if extension in ('.ndjson', '.jsonl') else cls.CSV
+
+
+def _records(
+    file: BinaryIO, offset: int, quoted: bool
+) -> Iterator[Tuple[int, bytes]]:
+    file.seek(offset)
+    while True:
+        record = file.readline()
+        if not record:
+            return
+        # A quoted CSV field may span lines
+        while quoted and record.count(b'"') % 2:
+            line = file.readline()
+            if not line:
+                break
+            record += line
+        start = offset
+        offset += len(record)
+        if record.strip():
+            yield start, record
+
+
+def _iter_rows(
+    file: BinaryIO, input_format: InputFormat, offset: int
+) -> Iterator[Tuple[int, Union[Dict[str, Any], Exception]]]:
+    quoted = input_format == InputFormat.CSV
+    columns: List[str] = []
+    if quoted:
+        header = next(_records(file, 0, quoted), None)
+        if header is None:
+            return
+        columns = next(csv.reader([header[1].decode('utf-8-sig')]))
+        offset = max(offset, header[0] + len(header[1]))
+
+    for start, record in _records(file, offset, quoted):
+        try:
+            if quoted:
+                values = next(csv.reader([record.decode('utf-8')]))
+                yield start, dict(zip(columns, values))
+            else:
+                row = json.loads(record)
+                if not isinstance(row, dict):
+                    raise ValueError('Row is not a JSON object')
+                yield start, row
+        except (ValueError, csv.Error) as e:
+            yield start, e
+
+
+@dataclass
+class CampaignCheckpoint:
+    """Progress of a campaign, saved next to its results.
+
+    Every input row before `offset` has an outcome in the results file, as
+    do the rows after it listed in `completed`. The results file holds
+    `results_size` bytes of outcomes at the time of the checkpoint; lines
+    written after it are recovered on resume.
+
+    Attributes:
+        campaign_id (str): Identifier of the run, used to derive message ids.
+        input_size (int): Size of the input file, to detect a changed input.
+        offset (int): Input offset up to which every row is done.
+        completed (List[int]): Offsets of done rows after `offset`.
+        results_size (int): Bytes of the results file covered.
+        succeeded (int): Rows sent successfully.
+        failed (int): Rows whose send failed.
+        invalid (int): Rows that could not be parsed or validated.
+        finished (bool): Whether every row is done.
+    """
+
+    campaign_id: str
+    input_size: int
+    offset: int = 0
+    completed: List[int] = field(default_factory=list)
+    results_size: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    invalid: int = 0
+    finished: bool = False
+
+    @classmethod
+    def load(cls, path: str) -> Optional['CampaignCheckpoint']:
+        """Read a checkpoint file.
+
+        Args:
+            path (str): The checkpoint path.
+
+        Returns:
+            CampaignCheckpoint, optional: The checkpoint, or `None` if the
+            file does not exist
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf8') as file:
+            return cls(**json.load(file))
+
+    def save(self, path: str) -> None:
+        """Write the checkpoint atomically.
+
+        Args:
+            path (str): The checkpoint path.
+        """
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf8') as file:
+            json.dump(asdict(self), file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    def count(self, status: str) -> None:
+        """Count the outcome of a row.
+
+        Args:
+            status (str): The outcome status.
+        """
+        if status == STATUS_INVALID:
+            self.invalid += 1
+        elif status == STATUS_ERROR:
+            self.failed += 1
+        else:
+            self.succeeded += 1
+
+
+@dataclass
+class CampaignResult:
+    """Summary of a campaign run.
+
+    Attributes:
+        campaign_id (str): Identifier of the run.
+        succeeded (int): Rows sent successfully, including earlier runs.
+        failed (int): Rows whose send failed, including earlier runs.
+        invalid (int): Rows that could not be parsed or validated.
+        skipped (int): Rows already done by an earlier run.
+        elapsed (float): Seconds spent by this run.
+        results_path (str): Path of the NDJSON outcomes.
+        checkpoint_path (str): Path of the checkpoint.
+    """
+
+    campaign_id: str
+    succeeded: int
+    failed: int
+    invalid: int
+    skipped: int
+    elapsed: float
+    results_path: str
+    checkpoint_path: str
+
+    @property
+    def total(self) -> int:
+        """Number of rows with an outcome."""
+        return self.succeeded + self.failed + self.invalid
+
+
+def outcome(
+    offset: int,
+    data: SendToContactData,
+    result: Union[SendToContactResponse, Exception],
+) -> Dict[str, Any]:
+    """Build the results line of a sent row.
+
+    Args:
+        offset (int): Input offset of the row.
+        data (SendToContactData): The payload.
+        result (SendToContactResponse | Exception): The send outcome.
+
+    Returns:
+        Dict[str, Any]: `offset`, `msisdn`, `id`, `status`, `message_id`
+        and `error`
+    """
+    if isinstance(result, Exception):
+        return {
+            'offset': offset,
+            'msisdn': data.msisdn,
+            'id': data.id,
+            'status': STATUS_ERROR,
+            'message_id': None,
+            'error': f'{type(result).__name__}: {result}',
+        }
+    return {
+        'offset': offset,
+        'msisdn': data.msisdn,
+        'id': data.id,
+        'status': result.status,
+        'message_id': result.message_id,
+        'error': None,
+    }
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return '; '.join(
+            f'{".".join(map(str, detail["loc"]))}: {detail["msg"]}'
+            for detail in error.errors()
+        )
+    return str(error)
+
+
+# Client and concurrency of a worker process, set by `_init_worker`
+_worker_client: Optional[CSMClient] = None
+_worker_concurrency = DEFAULT_CONCURRENCY
+
+
+def _watch_parent(parent: int) -> None:
+    # A killed runner cannot stop its pool, so workers leave on their own
+    while os.getppid() == parent:
+        time.sleep(PARENT_POLL_INTERVAL)
+    os._exit(1)
+
+
+def _init_worker(
+    client_factory: Callable[[], CSMClient], concurrency: int, parent: int
+) -> None:
+    global _worker_client, _worker_concurrency
+    _worker_client = client_factory()
+    _worker_concurrency = concurrency
+    if os.getpid() != parent:
+        threading.Thread(
+            target=_watch_parent, args=(parent,), daemon=True
+        ).start()
+
+
+def _send_chunk(rows: List[Row]) -> List[Dict[str, Any]]:
+    offsets = {id(data): offset for offset, data in rows}
+    return [
+        outcome(offsets[id(data)], data, result)
+        for data, result in send_many(
+            (data for _, data in rows),
+            concurrency=_worker_concurrency,
+            client=_worker_client,
+        )
+    ]
+
+
+@dataclass
+class _Chunk:
+    end: int
+    offsets: List[int]
+    rows: List[Row]
+    done: bool = False
+
+
+class _CampaignRun:
+    def __init__(
+        self,
+        checkpoint: CampaignCheckpoint,
+        checkpoint_path: str,
+        results: BinaryIO,
+        checkpoint_interval: float,
+    ):
+        self.checkpoint = checkpoint
+        self.checkpoint_path = checkpoint_path
+        self.results = results
+        self.checkpoint_interval = checkpoint_interval
+        self.completed: Set[int] = set(checkpoint.completed)
+        self.chunks: Deque[_Chunk] = deque()
+        self.saved_at = time.monotonic()
+
+    def recover(self) -> None:
+        """Take over outcomes written after the last checkpoint."""
+        size = self.checkpoint.results_size
+        self.results.seek(0, os.SEEK_END)
+        if self.results.tell() < size:
+            raise ValueError('Results file is shorter than its checkpoint')
+        self.results.seek(size)
+        recovered = 0
+        for line in self.results:
+            # A line cut by a crash is dropped and its row sent again
+            if not line.endswith(b'\n'):
+                break
+            row = json.loads(line)
+            self.completed.add(row['offset'])
+            self.checkpoint.count(row['status'])
+            size += len(line)
+            recovered += 1
+        self.results.seek(size)
+        self.results.truncate()
+        if recovered:
+            logger.info('Recovered {} outcomes after checkpoint', recovered)
+
+    def write(self, outcomes: List[Dict[str, Any]]) -> None:
+        """Append outcomes to the results file."""
+        if not outcomes:
+            return
+        self.results.write(
+            b''.join(
+                json.dumps(row, ensure_ascii=False).encode() + b'\n'
+                for row in outcomes
+            )
+        )
+        self.results.flush()
+        for row in outcomes:
+            self.completed.add(row['offset'])
+            self.checkpoint.count(row['status'])
+
+    def advance(self) -> None:
+        """Move the checkpoint offset past the leading done chunks."""
+        while self.chunks and self.chunks[0].done:
+            chunk = self.chunks.popleft()
+            self.checkpoint.offset = chunk.end
+            self.completed.difference_update(chunk.offsets)
+        if time.monotonic() - self.saved_at >= self.checkpoint_interval:
+            self.save()
+
+    def save(self) -> None:
+        """Write the checkpoint after the results it covers."""
+        os.fsync(self.results.fileno())
+        self.checkpoint.completed = sorted(self.completed)
+        self.checkpoint.results_size = self.results.tell()
+        self.checkpoint.save(self.checkpoint_path)
+        self.saved_at = time.monotonic()
+        logger.info(
+            'Campaign {}: {} sent, {} failed, {} invalid',
+            self.checkpoint.campaign_id,
+            self.checkpoint.succeeded,
+            self.checkpoint.failed,
+            self.checkpoint.invalid,
+        )
+
+    def read_chunks(
+        self,
+        file: BinaryIO,
+        input_format: InputFormat,
+        chunk_size: int,
+        columns: Tuple[str, str, str],
+    ) -> Iterator[_Chunk]:
+        """Read the rows left to send, in chunks."""
+        msisdn_column, message_column, id_column = columns
+        namespace = uuid.UUID(self.checkpoint.campaign_id)
+        chunk = _Chunk(self.checkpoint.offset, [], [])
+        invalid = []
+
+        for offset, row in _iter_rows(file, input_format, chunk.end):
+            chunk.offsets.append(offset)
+            chunk.end = file.tell()
+            if offset in self.completed:
+                continue
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                msisdn = row.get(msisdn_column)
+                # A stable id lets the API drop a send repeated on resume
+                data = SendToContactData(
+                    msisdn=str(msisdn) if msisdn is not None else None,
+                    message=row.get(message_column),
+                    id=row.get(id_column)
+                    or str(uuid.uuid5(namespace, str(offset))),
+                )
+            except (ValueError, csv.Error, ValidationError) as e:
+                invalid.append(
+                    {
+                        'offset': offset,
+                        'msisdn': None
+                        if isinstance(row, Exception)
+                        else row.get(msisdn_column),
+                        'id': None,
+                        'status': STATUS_INVALID,
+                        'message_id': None,
+                        'error': _describe(e),
+                    }
+                )
+                continue
+            chunk.rows.append((offset, data))
+            if len(chunk.rows) >= chunk_size:
+                self.write(invalid)
+                invalid = []
+                yield chunk
+                chunk = _Chunk(chunk.end, [], [])
+
+        self.write(invalid)
+        if chunk.offsets:
+            yield chunk
+
+    def run(
+        self,
+        executor: Executor,
+        chunks: Iterator[_Chunk],
+        max_pending: int,
+    ) -> None:
+        """Send the chunks, recording outcomes as they complete."""
+        pending: Dict[Future, _Chunk] = {}
+
+        def fill() -> None:
+            while len(pending) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                self.chunks.append(chunk)
+                if chunk.rows:
+                    pending[executor.submit(_send_chunk, chunk.rows)] = chunk
+                else:
+                    chunk.done = True
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = pending.pop(future)
+                self.write(future.result())
+                chunk.done = True
+            self.advance()
+            fill()
+        self.advance()
+
+
+def run_campaign(
+    input_path: str,
+    results_path: str,
+    checkpoint_path: Optional[str] = None,
+    *,
+    workers: int = DEFAULT_WORKERS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+    input_format: Optional[InputFormat] = None,
+    msisdn_column: str = 'msisdn',
+    message_column: str = 'message',
+    id_column: str = 'id',
+    client_factory: Optional[Callable[[], CSMClient]] = None,
+    restart: bool = False,
+) -> CampaignResult:
+    """Send a message to every row of a CSV or NDJSON file.
+
+    The input is streamed in chunks of `chunk_size` rows to a pool of
+    worker processes, each sending through its own pooled `CSMClient` with
+    `concurrency` requests in flight. The outcome of every row is appended
+    to `results_path` as one NDJSON line with `offset`, `msisdn`, `id`,
+    `status`, `message_id` and `error`, in completion order.
+
+    Progress is checkpointed every `checkpoint_interval` seconds. Running
+    again with the same paths resumes after the rows that already have an
+    outcome. Rows without an `id` column get one derived from the campaign
+    and their input offset, so a row that was in flight during a crash is
+    sent again with the same id and can be deduplicated by the API.
+
+    Args:
+        input_path (str): CSV file with a header, or NDJSON file.
+        results_path (str): NDJSON file of outcomes.
+        checkpoint_path (str, optional): Checkpoint file. Defaults to the
+            results path with a `.checkpoint` suffix.
+        workers (int): Worker processes. Use 0 to send from this process.
+        concurrency (int): Requests in flight per worker.
+        chunk_size (int): Rows handed to a worker at once.
+        checkpoint_interval (float): Seconds between two checkpoints.
+        input_format (InputFormat, optional): Input format. Defaults to
+            detecting it from the extension.
+        msisdn_column (str): Column or key of the phone number.
+        message_column (str): Column or key of the message text.
+        id_column (str): Column or key of an optional message id.
+        client_factory (Callable[[], CSMClient], optional): Builds the
+            client of each worker. Must be picklable. Defaults to a
+            `CSMClient` with the environment credentials.
+        restart (bool): Ignore an existing checkpoint and start over.
+
+    Returns:
+        CampaignResult: Counters of the whole campaign
+
+    Raises:
+        ValueError: If the input changed since the checkpoint, or if
+            required environment variables are missing
+    """
+    started = time.monotonic()
+    checkpoint_path = checkpoint_path or f'{results_path}{CHECKPOINT_SUFFIX}'
+    input_format = input_format or InputFormat.detect(input_path)
+    if client_factory is None:
+        config = resolve_config()
+        client_factory = partial(
+            CSMClient, config['apiKey'], config['apiSecret'], config['url']
+        )
+
+    input_size = os.path.getsize(input_path)
+    checkpoint = None if restart else CampaignCheckpoint.load(checkpoint_path)
+    if checkpoint is not None and checkpoint.input_size != input_size:
+        raise ValueError(
+            f'{input_path} changed since the checkpoint; use restart'
+        )
+    resumed = checkpoint is not None
+    if checkpoint is None:
+        checkpoint = CampaignCheckpoint(uuid.uuid4().hex, input_size)
+        logger.info('Campaign {}: starting', checkpoint.campaign_id)
+    else:
+        logger.info('Campaign {}: resuming', checkpoint.campaign_id)
+
+    directory = os.path.dirname(results_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    mode = 'r+b' if resumed and os.path.exists(results_path) else 'w+b'
+    with open(results_path, mode) as results:
+        run = _CampaignRun(
+            checkpoint, checkpoint_path, results, checkpoint_interval
+        )
+        if resumed:
+            run.recover()
+        skipped = checkpoint.succeeded + checkpoint.failed + checkpoint.invalid
+
+        if not checkpoint.finished:
+            if workers > 0:
+                executor: Executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(client_factory, concurrency, os.getpid()),
+                )
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    initializer=_init_worker,
+                    initargs=(client_factory, concurrency, os.getpid()),
+                )
+            with open(input_path, 'rb') as file, executor:
+                chunks = run.read_chunks(
+                    file,
+                    input_format,
+                    chunk_size,
+                    (msisdn_column, message_column, id_column),
+                )
+                run.run(executor, chunks, max(1, workers) * 2)
+            checkpoint.finished = True
+        run.save()
+
+    return CampaignResult(
+        campaign_id=checkpoint.campaign_id,
+        succeeded=checkpoint.succeeded,
+        failed=checkpoint.failed,
+        invalid=checkpoint.invalid,
+        skipped=skipped,
+        elapsed=time.monotonic() - started,
+        results_path=results_path,
+        checkpoint_path=checkpoint_path,
+    )
@@ -0,0 +1,409 @@
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+from loguru import logger
+
+from ..configs.config import get_settings
+from ..helpers.api_request import AnyRequest, send_request
+from ..helpers.authentication import Signer
+from ..helpers.metrics import MetricsCollector
+from ..helpers.rate_limit import RateLimiter
+from ..helpers.retry import Retrier
+from ..helpers.single_flight import SingleFlight, request_key
+from ..schemas.contacts import ListContactsParams
+from ..schemas.messages import (
+    ListMessagesParams,
+    SendToContactData,
+    SendToContactResponse,
+    SendToTagsData,
+    SendToTagsResponse,
+)
+from ..schemas.request import ResultMode
+from .adapters import (
+    ContactResult,
+    ContactsResult,
+    MessagesResult,
+)
+from .endpoints import Endpoints, decode
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+def resolve_config(
+    api_key: Optional[str] = None,
+    api_secret: Optional[str] = None,
+    url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Resolve client credentials, falling back to the default settings.
+
+    Args:
+        api_key (str, optional): The account API key.
+        api_secret (str, optional): The account API secret.
+        url (str, optional): The base URL of the API.
+
+    Returns:
+        Dict[str, Any]: Configuration dictionary with apiKey, apiSecret, url
+
+    Raises:
+        ValueError: If required environment variables are missing
+    """
+    if api_key and api_secret and url:
+        return {'apiKey': api_key, 'apiSecret': api_secret, 'url': url}
+
+    settings = get_settings()
+    return {
+        'apiKey': api_key or settings.api_key,
+        'apiSecret': api_secret or settings.api_secret,
+        'url': url or settings.url,
+    }
+
+
+def http_client_options(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    timeout: float = DEFAULT_TIMEOUT,
+    connect_timeout: Optional[float] = None,
+    http2: bool = False,
+) -> Dict[str, Any]:
+    """Build the pool options shared by the sync and async clients.
+
+    Args:
+        max_connections (int): Maximum number of open connections.
+        max_keepalive_connections (int): Maximum number of idle connections.
+        keepalive_expiry (float): Seconds an idle connection is kept alive.
+        timeout (float): Default timeout in seconds for every operation.
+        connect_timeout (float, optional): Timeout for establishing a
+            connection. Defaults to `timeout`.
+        http2 (bool): Whether to enable HTTP/2.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for `httpx.Client`
+    """
+    return {
+        'limits': httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        'timeout': httpx.Timeout(timeout, connect=connect_timeout),
+        'http2': http2,
+    }
+
+
+class CSMClient:
+    """Pooled client for the IM CSM API.
+
+    The client owns a long-lived `httpx.Client`, so TCP and TLS connections
+    are kept alive and reused between calls. It is safe to share a single
+    instance between threads.
+
+    Args:
+        api_key (str, optional): The account API key. Defaults to `API_KEY`.
+        api_secret (str, optional): The account API secret. Defaults to
+            `API_SECRET`.
+        url (str, optional): The base URL of the API. Defaults to `URL`.
+        max_connections (int): Maximum number of open connections.
+        max_keepalive_connections (int): Maximum number of idle connections
+            kept in the pool.
+        keepalive_expiry (float): Seconds an idle connection is kept alive.
+        timeout (float): Default timeout in seconds for every operation.
+        connect_timeout (float, optional): Timeout for establishing a
+            connection. Defaults to `timeout`.
+        http2 (bool): Whether to enable HTTP/2. Requires the `http2` extra.
+        transport (httpx.BaseTransport, optional): Custom transport, e.g. an
+            `httpx.MockTransport` for offline use.
+        retrier (Retrier, optional): Retry policy, circuit breaker and their
+            metrics, e.g. `Retrier(RetryPolicy(), CircuitBreaker())`.
+            Defaults to sending every request once.
+        rate_limiter (RateLimiter, optional): Per-endpoint rate limits
+            applied before every attempt. Defaults to no limit.
+        coalesce (bool): Whether identical GET requests in flight at the
+            same time share one upstream call.
+        metrics (MetricsCollector, optional): Receives request counts,
+            sizes and phase timings, e.g. a `Metrics`. Disabled by default.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        url: Optional[str] = None,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: float = DEFAULT_TIMEOUT,
+        connect_timeout: Optional[float] = None,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        retrier: Optional[Retrier] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        coalesce: bool = True,
+        metrics: Optional[MetricsCollector] = None,
+    ):
+        """Initialize the client and its connection pool."""
+        self.config = resolve_config(api_key, api_secret, url)
+        self.signer = Signer(self.config['apiKey'], self.config['apiSecret'])
+        self.endpoints = Endpoints(self.config['url'])
+        self.metrics = metrics
+        self.retrier = retrier
+        self.rate_limiter = rate_limiter
+        self.single_flight = SingleFlight() if coalesce else None
+        self._http = httpx.Client(
+            transport=transport,
+            **http_client_options(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                timeout=timeout,
+                connect_timeout=connect_timeout,
+                http2=http2,
+            ),
+        )
+
+    def __enter__(self) -> 'CSMClient':
+        """Enter the client context."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the client when leaving the context."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying connection pool."""
+        self._http.close()
+
+    def send_request(self, api_request: AnyRequest) -> httpx.Response:
+        """Send an authenticated request through the connection pool.
+
+        Identical GET requests sent concurrently share one upstream call
+        and its response.
+
+        Args:
+            api_request (ApiRequest | PreparedRequest): The request to send.
+                The client methods use prepared requests of `endpoints`.
+
+        Returns:
+            httpx.Response: Response from the API
+        """
+
+        def send() -> httpx.Response:
+            return send_request(
+                api_request,
+                client=self._http,
+                config=self.config,
+                signer=self.signer,
+                retrier=self.retrier,
+                rate_limiter=self.rate_limiter,
+                metrics=self.metrics,
+            )
+
+        key = request_key(api_request) if self.single_flight else None
+        if key is None:
+            return send()
+        return self.single_flight.do(key, send)
+
+    def list_contacts(
+        self,
+        params: ListContactsParams,
+        mode: ResultMode = ResultMode.MODEL,
+    ) -> ContactsResult:
+        """List all contacts.
+
+        Args:
+            params (ListContactsParams): The parameters to list the contacts.
+            mode (ResultMode): Return models, plain dicts or records.
+
+        Returns:
+            List[Contact]: List of contacts
+
+        Raises:
+            Exception: If API response is invalid
+        """
+        try:
+            logger.info('Step 1. List contacts')
+
+            request = self.endpoints.contacts.request(
+                params=params.model_dump(exclude_none=True)
+            )
+            response = self.send_request(request)
+
+            return decode(request, response, mode, self.metrics)
+        except Exception as e:
+            logger.error(f'Error listing contacts: {e}')
+            raise e
+
+    def get_contact(
+        self, msisdn: str, mode: ResultMode = ResultMode.MODEL
+    ) -> ContactResult:
+        """Get a contact by MSISDN.
+
+        Args:
+            msisdn (str): The MSISDN number of the contact to retrieve.
+            mode (ResultMode): Return a model, a plain dict or a record.
+
+        Returns:
+            Contact: The contact information
+
+        Raises:
+            Exception: If API response is invalid
+        """
+        try:
+            logger.info('Step 1. Get contact {}', msisdn)
+
+            request = self.endpoints.contact.request(
+                params={'msisdn': msisdn}, path=msisdn
+            )
+            response = self.send_request(request)
+
+            return decode(request, response, mode, self.metrics)
+        except Exception as e:
+            logger.error(f'Error getting contact: {e}')
+            raise e
+
+    def list_messages(
+        self,
+        params: ListMessagesParams,
+        mode: ResultMode = ResultMode.MODEL,
+    ) -> MessagesResult:
+        """Gets log message list.
+
+        Args:
+            params (ListMessagesParams): The parameters to list the messages.
+            mode (ResultMode): Return models, plain dicts or records.
+
+        Returns:
+            List[Message]: List of messages
+
+        Raises:
+            Exception: If API response is invalid
+        """
+        try:
+            logger.info('Step 1. List messages')
+
+            request = self.endpoints.messages.request(
+                params=params.model_dump(exclude_none=True)
+            )
+            response = self.send_request(request)
+
+            return decode(request, response, mode, self.metrics)
+        except Exception as e:
+            logger.error(f'Error listing messages: {e}')
+            raise e
+
+    def send_to_contact(
+        self, data: SendToContactData
+    ) -> SendToContactResponse:
+        """Sends a message to a specific contact.
+
+        Args:
+            data (SendToContactData): The data payload to send the message.
+
+        Returns:
+            SendToContactResponse: The message just sent
+
+        Raises:
+            Exception: If API response is invalid
+        """
+        try:
+            logger.info('Step 1. Send message to contact {}', data.msisdn)
+
+            request = self.endpoints.send_to_contact.request(
+                data=data.model_dump(exclude_none=True)
+            )
+            response = self.send_request(request)
+
+            return decode(request, response, metrics=self.metrics)
+        except Exception as e:
+            logger.error(f'Error sending message to contact: {e}')
+            raise e
+
+    def send_to_tags(self, data: SendToTagsData) -> SendToTagsResponse:
+        """Sends a message to a specific tag.
+
+        Args:
+            data (SendToTagsData): The data payload to send the message.
+
+        Returns:
+            SendToTagsResponse: The message just sent
+        """
+        try:
+            logger.info('Step 1. Send message to tags {}', data.tags)
+
+            request = self.endpoints.send_to_tags.request(
+                data=data.model_dump(exclude_none=True)
+            )
+            response = self.send_request(request)
+
+            return decode(request, response, metrics=self.metrics)
+        except Exception as e:
+            logger.error(f'Error sending message to tags: {e}')
+            raise e
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the status of the API.
+
+        Returns:
+            Dict[str, Any]: The status information from the API
+
+        Raises:
+            ValueError: If API response is invalid
+        """
+        try:
+            logger.info('Step 1. Get API status')
+
+            response = self.send_request(self.endpoints.status.request())
+
+            return response.json()
+        except Exception as e:
+            logger.error(f'Error getting status: {e}')
+            raise e
+
+
+_default_client: Optional[CSMClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> CSMClient:
+    """Get the shared client used by the module-level functions.
+
+    The client is created from environment variables on first use.
+
+    Returns:
+        CSMClient: The default client
+
+    Raises:
+        ValueError: If required environment variables are missing
+    """
+    global _default_client
+
+    if _default_client is not None:
+        return _default_client
+
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = CSMClient()
+        return _default_client
+
+
+def set_default_client(client: Optional[CSMClient]) -> None:
+    """Replace the shared client used by the module-level functions.
+
+    The previous default client, if any, is closed.
+
+    Args:
+        client (CSMClient, optional): The new default client. Pass `None` to
+            recreate it from environment variables on next use.
+    """
+    global _default_client
+
+    with _default_client_lock:
+        previous, _default_client = _default_client, client
+
+    if previous is not None and previous is not client:
+        previous.close()
@@ -1,21 +1,22 @@
-from typing import List
-
-from loguru import logger
-from pydantic import TypeAdapter
-
-from ..helpers.api_request import send_request
-from ..schemas.contacts import Contact, ListContactsParams
-from ..schemas.request import ApiRequest, ApiRequestType
-
-ta_contacts = TypeAdapter(List[Contact])
-ta_contact = TypeAdapter(Contact)
-
-
-def list_contacts(params: ListContactsParams) -> List[Contact]:
+from ..schemas.contacts import ListContactsParams
+from ..schemas.request import ResultMode
+from .adapters import (  # noqa: F401
+    ContactResult,
+    ContactsResult,
+    ta_contact,
+    ta_contacts,
+)
+from .client import get_default_client
+
+
+def list_contacts(
+    params: ListContactsParams, mode: ResultMode = ResultMode.MODEL
+) -> ContactsResult:
     """List all contacts.
 
     Args:
         params (ListContactsParams): The parameters to list the contacts.
+        mode (ResultMode): Return models, plain dicts or records.
 
     Returns:
         List[Contact]: List of contacts
@@ -23,30 +24,17 @@ def list_contacts(params: ListContactsParams) -> List[Contact]:
     Raises:
         Exception: If API response is invalid
     """
-    try:
-        logger.info('Step 1. List contacts')
-
-        response = send_request(
-            ApiRequest(
-                type=ApiRequestType.GET,
-                endpoint='contacts',
-                params=params.model_dump(exclude_none=True),
-            )
-        )
+    return get_default_client().list_contacts(params, mode)
 
-        data = response.json()
 
-        return ta_contacts.validate_python(data)
-    except Exception as e:
-        logger.error(f'Error listing contacts: {e}')
-        raise e
-
-
-def get_contact(msisdn: str) -> Contact:
+def get_contact(
+    msisdn: str, mode: ResultMode = ResultMode.MODEL
+) -> ContactResult:
     """Get a contact by MSISDN.
 
     Args:
         msisdn (str): The MSISDN number of the contact to retrieve.
+        mode (ResultMode): Return a model, a plain dict or a record.
 
     Returns:
         Contact: The contact information
@@ -54,20 +42,4 @@ def get_contact(msisdn: str) -> Contact:
     Raises:
         Exception: If API response is invalid
     """
-    try:
-        logger.info(f'Step 1. Get contact {msisdn}')
-
-        response = send_request(
-            ApiRequest(
-                type=ApiRequestType.GET,
-                endpoint=f'contacts/{msisdn}',
-                params={'msisdn': msisdn},
-            )
-        )
-
-        data = response.json()
-
-        return ta_contact.validate_python(data)
-    except Exception as e:
-        logger.error(f'Error getting contact: {e}')
-        raise e
+    return get_default_client().get_contact(msisdn, mode)
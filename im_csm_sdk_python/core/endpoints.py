@@ -0,0 +1,88 @@
+from time import perf_counter
+from typing import Any, Optional
+
+from httpx import Response
+
+from ..helpers.metrics import MetricsCollector, Phase
+from ..helpers.prepared import PreparedEndpoint, PreparedRequest
+from ..schemas.records import ContactRecord, MessageRecord
+from ..schemas.request import ApiRequestType, ResultMode
+from .adapters import (
+    decode_response,
+    ta_contact,
+    ta_contacts,
+    ta_messages,
+    ta_send_to_contact_response,
+    ta_send_to_tags_response,
+)
+
+
+class Endpoints:
+    """The API endpoints compiled once for a client's base URL.
+
+    Args:
+        base_url (str): The base URL of the API.
+    """
+
+    __slots__ = (
+        'status',
+        'contacts',
+        'contact',
+        'messages',
+        'send_to_contact',
+        'send_to_tags',
+    )
+
+    def __init__(self, base_url: str):
+        """Compile every endpoint."""
+        get, post = ApiRequestType.GET, ApiRequestType.POST
+        self.status = PreparedEndpoint(base_url, get, 'status')
+        self.contacts = PreparedEndpoint(
+            base_url, get, 'contacts', ta_contacts, ContactRecord
+        )
+        # Called with the msisdn as path, i.e. `contacts/<msisdn>`
+        self.contact = PreparedEndpoint(
+            base_url, get, 'contacts', ta_contact, ContactRecord, 'msisdn'
+        )
+        self.messages = PreparedEndpoint(
+            base_url, get, 'messages', ta_messages, MessageRecord
+        )
+        self.send_to_contact = PreparedEndpoint(
+            base_url,
+            post,
+            'messages/send_to_contact',
+            ta_send_to_contact_response,
+        )
+        self.send_to_tags = PreparedEndpoint(
+            base_url, post, 'messages/send', ta_send_to_tags_response
+        )
+
+
+def decode(
+    request: PreparedRequest,
+    response: Response,
+    mode: Optional[ResultMode] = None,
+    metrics: Optional[MetricsCollector] = None,
+) -> Any:
+    """Decode the response of a prepared request with its endpoint adapter.
+
+    Args:
+        request (PreparedRequest): The request.
+        response (httpx.Response): Its response.
+        mode (ResultMode, optional): The shape of the result. Defaults to
+            validating the adapter's model, for endpoints without records.
+        metrics (MetricsCollector, optional): Receives the DECODE time.
+
+    Returns:
+        Any: The decoded result
+    """
+    if metrics is not None:
+        start = perf_counter()
+        result = decode(request, response, mode)
+        metrics.observe(request.route, Phase.DECODE, perf_counter() - start)
+        return result
+
+    endpoint = request.prepared
+    if mode is None:
+        return endpoint.adapter.validate_json(response.content)
+    return decode_response(response, endpoint.adapter, endpoint.record, mode)
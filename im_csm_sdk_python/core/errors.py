@@ -0,0 +1,30 @@
+class ContactNotFoundError(LookupError):
+    """Raised when the API has no contact for an MSISDN.
+
+    Args:
+        msisdn (str): The MSISDN that was looked up.
+    """
+
+    def __init__(self, msisdn: str):
+        """Initialize the error for an MSISDN."""
+        super().__init__(f'Contact {msisdn} not found')
+        self.msisdn = msisdn
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit is open.
+
+    Args:
+        retry_in (float): Seconds until a probe request is allowed.
+    """
+
+    def __init__(self, retry_in: float):
+        """Initialize the error with the remaining open time."""
+        super().__init__(
+            f'Circuit breaker is open, retry in {retry_in:.1f} seconds'
+        )
+        self.retry_in = retry_in
+
+
+class MessageTemplateError(ValueError):
+    """Raised when a message template cannot be compiled or rendered."""
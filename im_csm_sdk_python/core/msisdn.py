@@ -0,0 +1,379 @@
+from array import array
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from loguru import logger
+
+from ..schemas.messages import SendToContactData
+
+DEFAULT_COUNTRY_CODE = '502'
+DEFAULT_BATCH_SIZE = 65536
+
+# Formatting characters dropped before validation
+_FORMATTING = ' \t-.()/ ‐‑‒–—−'
+_STRIP = str.maketrans('', '', _FORMATTING)
+# Joins a batch so it is cleaned with one `str.translate` call
+_SEPARATOR = '\n'
+
+Number = Union[str, int]
+
+
+@dataclass(frozen=True)
+class NumberingPlan:
+    """Length and prefix rules of the national numbers of a country.
+
+    Attributes:
+        country_code (str): Country calling code, e.g. `502`.
+        national_lengths (Tuple[int, ...]): Valid national number lengths.
+        leading_digits (str): Digits a national number may start with.
+        trunk_prefix (str, optional): Prefix dialed before national
+            numbers inside the country, removed when present.
+    """
+
+    country_code: str
+    national_lengths: Tuple[int, ...]
+    leading_digits: str = '123456789'
+    trunk_prefix: Optional[str] = None
+
+
+NUMBERING_PLANS: Dict[str, NumberingPlan] = {
+    plan.country_code: plan
+    for plan in (
+        NumberingPlan('502', (8,), '234567'),  # Guatemala
+        NumberingPlan('503', (8,), '267'),  # El Salvador
+        NumberingPlan('504', (8,), '23789'),  # Honduras
+        NumberingPlan('505', (8,), '2578'),  # Nicaragua
+        NumberingPlan('506', (8,), '245678'),  # Costa Rica
+        NumberingPlan('507', (7, 8), '23456789'),  # Panama
+        NumberingPlan('52', (10,), '23456789'),  # Mexico
+        NumberingPlan('57', (10,), '36'),  # Colombia
+        NumberingPlan('1', (10,), '23456789', '1'),  # NANP
+    )
+}
+
+
+class MsisdnRejection(str, Enum):
+    """Enum for the reasons a number is rejected."""
+
+    EMPTY = 'empty'
+    INVALID_CHARACTERS = 'invalid_characters'
+    UNKNOWN_COUNTRY = 'unknown_country'
+    INVALID_LENGTH = 'invalid_length'
+    INVALID_PREFIX = 'invalid_prefix'
+    DUPLICATE = 'duplicate'
+
+
+@dataclass
+class MsisdnBatch:
+    """Columns of accepted and rejected numbers.
+
+    Attributes:
+        accepted (List[str]): Normalized MSISDNs.
+        accepted_index (array): Input position of each accepted number.
+        rejected (List[str]): Raw value of each rejected number.
+        rejected_index (array): Input position of each rejected number.
+        rejected_reason (List[MsisdnRejection]): Why each was rejected.
+    """
+
+    accepted: List[str] = field(default_factory=list)
+    accepted_index: array = field(default_factory=lambda: array('q'))
+    rejected: List[str] = field(default_factory=list)
+    rejected_index: array = field(default_factory=lambda: array('q'))
+    rejected_reason: List[MsisdnRejection] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Number of input numbers."""
+        return len(self.accepted) + len(self.rejected)
+
+    def extend(self, other: 'MsisdnBatch') -> None:
+        """Append the columns of another batch.
+
+        Args:
+            other (MsisdnBatch): The batch to append.
+        """
+        self.accepted.extend(other.accepted)
+        self.accepted_index.extend(other.accepted_index)
+        self.rejected.extend(other.rejected)
+        self.rejected_index.extend(other.rejected_index)
+        self.rejected_reason.extend(other.rejected_reason)
+
+
+class MsisdnNormalizer:
+    """Normalize raw phone numbers to the MSISDNs the API expects.
+
+    An MSISDN is the E.164 number without its `+`: country code followed
+    by the national number, like `Contact.country_code` and
+    `Contact.phone_number` joined. Numbers written with `+` or `00` are
+    matched against their country's plan. Numbers without one are read as
+    national numbers of the default country, with or without its code.
+    Spaces, dashes, dots, slashes and parentheses are ignored.
+
+    Numbers already accepted are rejected as duplicates, also across
+    calls, so one normalizer can screen a whole campaign.
+
+    Args:
+        default_country_code (str): Country of numbers without `+`/`00`.
+        plans (Mapping[str, NumberingPlan], optional): Plans by country
+            code. Defaults to `NUMBERING_PLANS`.
+        dedupe (bool): Whether to reject repeated numbers.
+
+    Raises:
+        ValueError: If the default country has no plan
+    """
+
+    def __init__(
+        self,
+        default_country_code: str = DEFAULT_COUNTRY_CODE,
+        plans: Optional[Mapping[str, NumberingPlan]] = None,
+        dedupe: bool = True,
+    ):
+        """Initialize the normalizer."""
+        self.plans = dict(plans if plans is not None else NUMBERING_PLANS)
+        if default_country_code not in self.plans:
+            raise ValueError(f'No numbering plan for {default_country_code}')
+        self.default = self.plans[default_country_code]
+        self.dedupe = dedupe
+        self.seen: Set[str] = set()
+        self._position = 0
+        self._code_lengths = sorted(
+            {len(code) for code in self.plans}, reverse=True
+        )
+
+    def normalize(
+        self, numbers: Iterable[Number], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> MsisdnBatch:
+        """Normalize and dedupe numbers.
+
+        Args:
+            numbers (Iterable[str | int]): The raw numbers.
+            batch_size (int): Numbers processed at once.
+
+        Returns:
+            MsisdnBatch: Accepted and rejected columns, indexed by input
+            position
+        """
+        result = MsisdnBatch()
+        source = iter(numbers)
+        while True:
+            batch = list(islice(source, batch_size))
+            if not batch:
+                return result
+            result.extend(self.normalize_batch(batch))
+
+    def normalize_batch(self, numbers: List[Number]) -> MsisdnBatch:
+        """Normalize one batch of numbers.
+
+        Positions continue from the previous batch of this normalizer.
+
+        Args:
+            numbers (List[str | int]): The raw numbers.
+
+        Returns:
+            MsisdnBatch: Accepted and rejected columns
+        """
+        raw = [
+            number if type(number) is str else str(number)
+            for number in numbers
+        ]
+        cleaned = _SEPARATOR.join(raw).translate(_STRIP).split(_SEPARATOR)
+        if len(cleaned) != len(raw):
+            # A raw number held the separator, so clean one by one
+            cleaned = [number.translate(_STRIP) for number in raw]
+
+        result = MsisdnBatch()
+        accepted = result.accepted.append
+        accepted_index = result.accepted_index.append
+        rejected = result.rejected.append
+        rejected_index = result.rejected_index.append
+        rejected_reason = result.rejected_reason.append
+        seen = self.seen
+        dedupe = self.dedupe
+        parse = self._parse
+        # Fast paths for numbers of the default country written as national
+        # numbers, MSISDNs or E.164; anything else goes to `_parse`
+        code = self.default.country_code
+        international = '+' + code
+        leading = self.default.leading_digits
+        national = frozenset(self.default.national_lengths)
+        full = frozenset(length + len(code) for length in national)
+        plus = frozenset(length + 1 for length in full)
+        start = len(code)
+
+        position = self._position
+        for number, value in zip(cleaned, raw):
+            size = len(number)
+            if (
+                size in national
+                and number[0] in leading
+                and number.isascii()
+                and number.isdigit()
+            ):
+                msisdn = code + number
+            elif (
+                size in full
+                and number.startswith(code)
+                and number[start] in leading
+                and number.isascii()
+                and number.isdigit()
+            ):
+                msisdn = number
+            elif (
+                size in plus
+                and number.startswith(international)
+                and number[start + 1] in leading
+                and number.isascii()
+                and number[1:].isdigit()
+            ):
+                msisdn = number[1:]
+            else:
+                msisdn = parse(number)
+            if type(msisdn) is str:
+                if not dedupe or msisdn not in seen:
+                    if dedupe:
+                        seen.add(msisdn)
+                    accepted(msisdn)
+                    accepted_index(position)
+                    position += 1
+                    continue
+                msisdn = MsisdnRejection.DUPLICATE
+            rejected(value)
+            rejected_index(position)
+            rejected_reason(msisdn)
+            position += 1
+        self._position = position
+        return result
+
+    def payloads(
+        self,
+        items: Iterable[SendToContactData],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_reject: Optional[
+            Callable[[SendToContactData, MsisdnRejection], None]
+        ] = None,
+    ) -> Iterator[SendToContactData]:
+        """Screen payloads before `send_many`.
+
+        Payloads keep their order, with the MSISDN normalized. Payloads
+        with a rejected number are skipped and never sent.
+
+        Args:
+            items (Iterable[SendToContactData]): The payloads.
+            batch_size (int): Payloads screened at once.
+            on_reject (Callable, optional): Called with each skipped
+                payload and the reason. Defaults to logging a warning.
+
+        Yields:
+            SendToContactData: Each payload with a valid, new number.
+        """
+        source = iter(items)
+        while True:
+            batch = list(islice(source, batch_size))
+            if not batch:
+                return
+            start = self._position
+            result = self.normalize_batch([data.msisdn for data in batch])
+            verdicts: List[Union[str, MsisdnRejection, None]] = [None] * len(
+                batch
+            )
+            for msisdn, position in zip(
+                result.accepted, result.accepted_index
+            ):
+                verdicts[position - start] = msisdn
+            for reason, position in zip(
+                result.rejected_reason, result.rejected_index
+            ):
+                verdicts[position - start] = reason
+
+            for data, verdict in zip(batch, verdicts):
+                if isinstance(verdict, MsisdnRejection):
+                    if on_reject is not None:
+                        on_reject(data, verdict)
+                    else:
+                        logger.warning(
+                            'Skipping {}: {}', data.msisdn, verdict.value
+                        )
+                elif verdict == data.msisdn:
+                    yield data
+                else:
+                    yield data.model_copy(update={'msisdn': verdict})
+
+    def _parse(self, number: str) -> Union[str, MsisdnRejection]:
+        # `str.isdigit` also accepts digits such as `²` or `٣`
+        if not number.isascii():
+            return MsisdnRejection.INVALID_CHARACTERS
+        if number.isdigit():
+            if number.startswith('00'):
+                return self._international(number[2:])
+            return self._national(number)
+        if number[:1] == '+' and number[1:].isdigit():
+            return self._international(number[1:])
+        if not number:
+            return MsisdnRejection.EMPTY
+        return MsisdnRejection.INVALID_CHARACTERS
+
+    def _national(self, number: str) -> Union[str, MsisdnRejection]:
+        plan = self.default
+        code = plan.country_code
+        if len(number) not in plan.national_lengths:
+            if number.startswith(code) and (
+                len(number) - len(code) in plan.national_lengths
+            ):
+                return _check(plan, number[len(code) :])
+            trunk = plan.trunk_prefix
+            if trunk and number.startswith(trunk):
+                return _check(plan, number[len(trunk) :])
+            return MsisdnRejection.INVALID_LENGTH
+        return _check(plan, number)
+
+    def _international(self, number: str) -> Union[str, MsisdnRejection]:
+        for length in self._code_lengths:
+            plan = self.plans.get(number[:length])
+            if plan is not None:
+                return _check(plan, number[length:])
+        return MsisdnRejection.UNKNOWN_COUNTRY
+
+
+def _check(plan: NumberingPlan, national: str) -> Union[str, MsisdnRejection]:
+    if len(national) not in plan.national_lengths:
+        return MsisdnRejection.INVALID_LENGTH
+    if national[0] not in plan.leading_digits:
+        return MsisdnRejection.INVALID_PREFIX
+    return plan.country_code + national
+
+
+def normalize_msisdns(
+    numbers: Iterable[Number],
+    default_country_code: str = DEFAULT_COUNTRY_CODE,
+    plans: Optional[Mapping[str, NumberingPlan]] = None,
+    dedupe: bool = True,
+) -> MsisdnBatch:
+    """Normalize and dedupe raw phone numbers.
+
+    See `MsisdnNormalizer`.
+
+    Args:
+        numbers (Iterable[str | int]): The raw numbers.
+        default_country_code (str): Country of numbers without `+`/`00`.
+        plans (Mapping[str, NumberingPlan], optional): Plans by country
+            code. Defaults to `NUMBERING_PLANS`.
+        dedupe (bool): Whether to reject repeated numbers.
+
+    Returns:
+        MsisdnBatch: Accepted and rejected columns, indexed by input
+        position
+    """
+    normalizer = MsisdnNormalizer(default_country_code, plans, dedupe)
+    return normalizer.normalize(numbers)
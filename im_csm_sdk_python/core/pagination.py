@@ -0,0 +1,441 @@
+import asyncio
+import contextvars
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from ..schemas.contacts import Contact, ListContactsParams
+from ..schemas.messages import ListMessagesParams, Message
+from ..schemas.request import ResultMode
+from .adaptive import AdaptiveLimiter, Concurrency, as_limiter, is_overload
+from .async_client import AsyncCSMClient
+from .client import CSMClient, get_default_client
+
+T = TypeVar('T')
+# A fetched page, or the error of its request, and the request latency
+PageOutcome = Tuple[Optional[List[T]], Optional[Exception], float]
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def _first_offset(start: Optional[int]) -> int:
+    return start if start is not None and start >= 0 else 0
+
+
+def _page_size(limit: Optional[int], page_size: Optional[int]) -> int:
+    if page_size is not None:
+        if page_size < 1:
+            raise ValueError('Page size must be at least 1')
+        return page_size
+    return limit if limit is not None and limit >= 1 else DEFAULT_PAGE_SIZE
+
+
+def _fetch_timed(
+    fetch: Callable[[int, int], List[T]], start: int, page_size: int
+) -> PageOutcome:
+    started = time.perf_counter()
+    try:
+        return fetch(start, page_size), None, time.perf_counter() - started
+    except Exception as e:
+        return None, e, time.perf_counter() - started
+
+
+async def _afetch_timed(
+    fetch: Callable[[int, int], Awaitable[List[T]]],
+    start: int,
+    page_size: int,
+) -> PageOutcome:
+    started = time.perf_counter()
+    try:
+        page = await fetch(start, page_size)
+        return page, None, time.perf_counter() - started
+    except Exception as e:
+        return None, e, time.perf_counter() - started
+
+
+def _release_when_done(
+    limiter: AdaptiveLimiter,
+) -> Callable[[Union[Future, asyncio.Future]], None]:
+    # Done callbacks also run for requests cancelled before they started
+    def release(future: Union[Future, asyncio.Future]) -> None:
+        if future.cancelled():
+            limiter.cancel()
+            return
+        _, error, latency = future.result()
+        limiter.release(latency, is_overload(error))
+
+    return release
+
+
+def _page_of(outcome: PageOutcome) -> List[T]:
+    page, error, _ = outcome
+    if error is not None:
+        raise error
+    return page
+
+
+def _iter_pages_concurrently(
+    fetch: Callable[[int, int], List[T]],
+    start: int,
+    page_size: int,
+    limiter: AdaptiveLimiter,
+) -> Iterator[List[T]]:
+    release = _release_when_done(limiter)
+    futures: Deque[Future] = deque()
+    with ThreadPoolExecutor(
+        max_workers=limiter.max_limit, thread_name_prefix='csm-pages'
+    ) as executor:
+        try:
+            while True:
+                # With nothing of ours in flight, wait for other users
+                while not futures or (
+                    len(futures) < limiter.limit and limiter.try_acquire()
+                ):
+                    if not futures:
+                        limiter.acquire()
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        _fetch_timed,
+                        fetch,
+                        start,
+                        page_size,
+                    )
+                    future.add_done_callback(release)
+                    futures.append(future)
+                    start += page_size
+
+                page = _page_of(futures.popleft().result())
+                if page:
+                    yield page
+                if len(page) < page_size:
+                    return
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+async def _aiter_pages_concurrently(
+    fetch: Callable[[int, int], Awaitable[List[T]]],
+    start: int,
+    page_size: int,
+    limiter: AdaptiveLimiter,
+) -> AsyncIterator[List[T]]:
+    release = _release_when_done(limiter)
+    tasks: Deque[asyncio.Future] = deque()
+    try:
+        while True:
+            while not tasks or (
+                len(tasks) < limiter.limit and limiter.try_acquire()
+            ):
+                if not tasks:
+                    await limiter.aacquire()
+                task = asyncio.ensure_future(
+                    _afetch_timed(fetch, start, page_size)
+                )
+                task.add_done_callback(release)
+                tasks.append(task)
+                start += page_size
+
+            page = _page_of(await tasks.popleft())
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def iter_pages(
+    fetch: Callable[[int, int], List[T]],
+    start: int,
+    page_size: int,
+    prefetch: bool = True,
+    concurrency: Optional[Concurrency] = None,
+) -> Iterator[List[T]]:
+    """Walk `start`/`limit` pages until a short page is returned.
+
+    Args:
+        fetch (Callable[[int, int], List[T]]): Fetches one page given its
+            offset and size.
+        start (int): Offset of the first page.
+        page_size (int): Number of items requested per page.
+        prefetch (bool): Whether to fetch the next page in the background
+            while the current one is consumed.
+        concurrency (int | AdaptiveLimiter, optional): Fetch up to this many
+            pages ahead at once, fixed or adaptive. Pages are still yielded
+            in order, and requests already sent past the last page are
+            discarded. Overrides `prefetch`.
+
+    Yields:
+        List[T]: One page of items
+    """
+    if concurrency is not None:
+        yield from _iter_pages_concurrently(
+            fetch, start, page_size, as_limiter(concurrency)
+        )
+        return
+
+    if not prefetch:
+        while True:
+            page = fetch(start, page_size)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            start += page_size
+
+    with ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix='csm-prefetch'
+    ) as executor:
+        # Fetches run in a copy of the caller's context, so that context
+        # variables like the profiler's call stack carry over
+        def submit(start: int) -> Future:
+            context = contextvars.copy_context()
+            return executor.submit(context.run, fetch, start, page_size)
+
+        future = submit(start)
+        while future is not None:
+            page = future.result()
+            start += page_size
+            future = submit(start) if len(page) >= page_size else None
+            if page:
+                yield page
+
+
+async def aiter_pages(
+    fetch: Callable[[int, int], Awaitable[List[T]]],
+    start: int,
+    page_size: int,
+    prefetch: bool = True,
+    concurrency: Optional[Concurrency] = None,
+) -> AsyncIterator[List[T]]:
+    """Async version of `iter_pages`.
+
+    Args:
+        fetch (Callable[[int, int], Awaitable[List[T]]]): Fetches one page
+            given its offset and size.
+        start (int): Offset of the first page.
+        page_size (int): Number of items requested per page.
+        prefetch (bool): Whether to fetch the next page concurrently while
+            the current one is consumed.
+        concurrency (int | AdaptiveLimiter, optional): Fetch up to this many
+            pages ahead at once. Overrides `prefetch`.
+
+    Yields:
+        List[T]: One page of items
+    """
+    if concurrency is not None:
+        async for page in _aiter_pages_concurrently(
+            fetch, start, page_size, as_limiter(concurrency)
+        ):
+            yield page
+        return
+
+    if not prefetch:
+        while True:
+            page = await fetch(start, page_size)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            start += page_size
+
+    task = asyncio.ensure_future(fetch(start, page_size))
+    try:
+        while task is not None:
+            page = await task
+            start += page_size
+            task = (
+                asyncio.ensure_future(fetch(start, page_size))
+                if len(page) >= page_size
+                else None
+            )
+            if page:
+                yield page
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+def iter_contacts(
+    params: Optional[ListContactsParams] = None,
+    page_size: Optional[int] = None,
+    client: Optional[CSMClient] = None,
+    prefetch: bool = True,
+    mode: ResultMode = ResultMode.MODEL,
+    concurrency: Optional[Concurrency] = None,
+) -> Iterator[Contact]:
+    """Iterate over all contacts matching the parameters, page by page.
+
+    Only one page (plus the prefetched one) is held in memory at a time.
+
+    Args:
+        params (ListContactsParams, optional): Filters for the listing.
+            `start` is the offset of the first page and `limit`, if set, the
+            page size.
+        page_size (int, optional): Number of contacts per request. Overrides
+            `params.limit`.
+        client (CSMClient, optional): The client to use. Defaults to the
+            shared default client.
+        prefetch (bool): Whether to fetch the next page in the background.
+        mode (ResultMode): Yield models, plain dicts or records.
+        concurrency (int | AdaptiveLimiter, optional): Fetch up to this many
+            pages at once, fixed or adaptive. Overrides `prefetch`.
+
+    Yields:
+        Contact: Each contact, in API order
+    """
+    params = params or ListContactsParams()
+    client = client or get_default_client()
+
+    def fetch(start: int, limit: int) -> List[Contact]:
+        return client.list_contacts(
+            params.model_copy(update={'start': start, 'limit': limit}), mode
+        )
+
+    for page in iter_pages(
+        fetch,
+        _first_offset(params.start),
+        _page_size(params.limit, page_size),
+        prefetch,
+        concurrency,
+    ):
+        yield from page
+
+
+def iter_messages(
+    params: ListMessagesParams,
+    page_size: Optional[int] = None,
+    client: Optional[CSMClient] = None,
+    prefetch: bool = True,
+    mode: ResultMode = ResultMode.MODEL,
+    concurrency: Optional[Concurrency] = None,
+) -> Iterator[Message]:
+    """Iterate over all messages matching the parameters, page by page.
+
+    Only one page (plus the prefetched one) is held in memory at a time.
+
+    Args:
+        params (ListMessagesParams): Filters for the listing. `start` is the
+            offset of the first page and `limit`, if set, the page size.
+        page_size (int, optional): Number of messages per request. Overrides
+            `params.limit`.
+        client (CSMClient, optional): The client to use. Defaults to the
+            shared default client.
+        prefetch (bool): Whether to fetch the next page in the background.
+        mode (ResultMode): Yield models, plain dicts or records.
+        concurrency (int | AdaptiveLimiter, optional): Fetch up to this many
+            pages at once, fixed or adaptive. Overrides `prefetch`.
+
+    Yields:
+        Message: Each message, in API order
+    """
+    client = client or get_default_client()
+
+    def fetch(start: int, limit: int) -> List[Message]:
+        return client.list_messages(
+            params.model_copy(update={'start': start, 'limit': limit}), mode
+        )
+
+    for page in iter_pages(
+        fetch,
+        _first_offset(params.start),
+        _page_size(params.limit, page_size),
+        prefetch,
+        concurrency,
+    ):
+        yield from page
+
+
+async def aiter_contacts(
+    client: AsyncCSMClient,
+    params: Optional[ListContactsParams] = None,
+    page_size: Optional[int] = None,
+    prefetch: bool = True,
+    mode: ResultMode = ResultMode.MODEL,
+    concurrency: Optional[Concurrency] = None,
+) -> AsyncIterator[Contact]:
+    """Async version of `iter_contacts`.
+
+    Args:
+        client (AsyncCSMClient): The client to use.
+        params (ListContactsParams, optional): Filters for the listing.
+        page_size (int, optional): Number of contacts per request. Overrides
+            `params.limit`.
+        prefetch (bool): Whether to fetch the next page concurrently.
+        mode (ResultMode): Yield models, plain dicts or records.
+        concurrency (int | AdaptiveLimiter, optional): Fetch up to this many
+            pages at once, fixed or adaptive. Overrides `prefetch`.
+
+    Yields:
+        Contact: Each contact, in API order
+    """
+    params = params or ListContactsParams()
+
+    async def fetch(start: int, limit: int) -> List[Contact]:
+        return await client.list_contacts(
+            params.model_copy(update={'start': start, 'limit': limit}), mode
+        )
+
+    async for page in aiter_pages(
+        fetch,
+        _first_offset(params.start),
+        _page_size(params.limit, page_size),
+        prefetch,
+        concurrency,
+    ):
+        for contact in page:
+            yield contact
+
+
+async def aiter_messages(
+    client: AsyncCSMClient,
+    params: ListMessagesParams,
+    page_size: Optional[int] = None,
+    prefetch: bool = True,
+    mode: ResultMode = ResultMode.MODEL,
+    concurrency: Optional[Concurrency] = None,
+) -> AsyncIterator[Message]:
+    """Async version of `iter_messages`.
+
+    Args:
+        client (AsyncCSMClient): The client to use.
+        params (ListMessagesParams): Filters for the listing.
+        page_size (int, optional): Number of messages per request. Overrides
+            `params.limit`.
+        prefetch (bool): Whether to fetch the next page concurrently.
+        mode (ResultMode): Yield models, plain dicts or records.
+        concurrency (int | AdaptiveLimiter, optional): Fetch up to this many
+            pages at once, fixed or adaptive. Overrides `prefetch`.
+
+    Yields:
+        Message: Each message, in API order
+    """
+
+    async def fetch(start: int, limit: int) -> List[Message]:
+        return await client.list_messages(
+            params.model_copy(update={'start': start, 'limit': limit}), mode
+        )
+
+    async for page in aiter_pages(
+        fetch,
+        _first_offset(params.start),
+        _page_size(params.limit, page_size),
+        prefetch,
+        concurrency,
+    ):
+        for message in page:
+            yield message
@@ -0,0 +1,199 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from ..schemas.messages import ListMessagesParams, Message
+from .client import CSMClient, get_default_client
+from .pagination import DEFAULT_PAGE_SIZE, iter_messages
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_WINDOW = timedelta(hours=1)
+MIN_WINDOW = timedelta(seconds=1)
+MAX_WINDOW = timedelta(days=7)
+PAGES_PER_WINDOW = 4
+# Windows fetched ahead of the oldest one not yet yielded, per worker
+READ_AHEAD = 2
+
+
+def next_window_size(
+    window: timedelta,
+    rows: int,
+    target_rows: int,
+    min_window: timedelta = MIN_WINDOW,
+    max_window: timedelta = MAX_WINDOW,
+) -> timedelta:
+    """Size the next window from the page density of a finished one.
+
+    Args:
+        window (timedelta): Length of the finished window.
+        rows (int): Number of messages the finished window returned.
+        target_rows (int): Desired number of messages per window.
+        min_window (timedelta): Smallest window allowed.
+        max_window (timedelta): Largest window allowed.
+
+    Returns:
+        timedelta: The length to use for the next window
+    """
+    if rows == 0:
+        size = window * 2
+    else:
+        size = window * (target_rows / rows)
+        # Avoid oscillating on noisy densities
+        size = max(window / 4, min(size, window * 4))
+    return max(min_window, min(size, max_window))
+
+
+def iter_messages_sharded(
+    params: ListMessagesParams,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    window: timedelta = DEFAULT_WINDOW,
+    page_size: Optional[int] = None,
+    target_rows: Optional[int] = None,
+    client: Optional[CSMClient] = None,
+) -> Iterator[Message]:
+    """Fetch a date range of messages as concurrent time windows.
+
+    The `start_date`/`end_date` range is split into sub-windows that are
+    paged independently on a shared connection pool. Window length adapts to
+    the observed density so each window holds about `target_rows`
+    messages. Windows are yielded in chronological order, sorted by
+    `created_on`, with duplicates at window boundaries removed by
+    `message_id`. At most `READ_AHEAD * concurrency` windows are fetched
+    or buffered ahead of the one being yielded, so a slow window holds
+    back new requests instead of growing the buffer.
+
+    Args:
+        params (ListMessagesParams): Filters for the listing. `start_date`
+            and `end_date` are required.
+        concurrency (int): Maximum number of windows fetched at once.
+        window (timedelta): Length of the first windows.
+        page_size (int, optional): Number of messages per request.
+        target_rows (int, optional): Desired messages per window. Defaults
+            to four pages.
+        client (CSMClient, optional): The client to use. Defaults to the
+            shared default client.
+
+    Yields:
+        Message: Each message, in `created_on` order
+
+    Raises:
+        ValueError: If the date range or concurrency is invalid
+    """
+    if params.start_date is None or params.end_date is None:
+        raise ValueError('start_date and end_date are required')
+    if params.start_date >= params.end_date:
+        raise ValueError('start_date must be before end_date')
+    if concurrency < 1:
+        raise ValueError('Concurrency must be at least 1')
+
+    client = client or get_default_client()
+    page_size = page_size or DEFAULT_PAGE_SIZE
+    target_rows = target_rows or page_size * PAGES_PER_WINDOW
+
+    def fetch(start_date: datetime, end_date: datetime) -> List[Message]:
+        window_params = params.model_copy(
+            update={'start_date': start_date, 'end_date': end_date, 'start': 0}
+        )
+        messages = list(
+            iter_messages(
+                window_params,
+                page_size=page_size,
+                client=client,
+                prefetch=False,
+            )
+        )
+        messages.sort(key=lambda message: message.created_on)
+        return messages
+
+    cursor = params.start_date
+    next_index = 0
+    emit_index = 0
+    pending: Dict[Future, Tuple[int, timedelta]] = {}
+    finished: Dict[int, List[Message]] = {}
+    previous_ids: Set[str] = set()
+    read_ahead = READ_AHEAD * concurrency
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix='csm-shard'
+    ) as executor:
+        while pending or cursor < params.end_date:
+            while (
+                len(pending) < concurrency
+                and next_index - emit_index < read_ahead
+                and cursor < params.end_date
+            ):
+                window_end = min(cursor + window, params.end_date)
+                future = executor.submit(fetch, cursor, window_end)
+                pending[future] = (next_index, window_end - cursor)
+                logger.debug(
+                    'Shard {}: {} -> {}', next_index, cursor, window_end
+                )
+                next_index += 1
+                cursor = window_end
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, length = pending.pop(future)
+                messages = future.result()
+                finished[index] = messages
+                window = next_window_size(length, len(messages), target_rows)
+
+            while emit_index in finished:
+                messages = finished.pop(emit_index)
+                emit_index += 1
+                current_ids = set()
+                for message in messages:
+                    if (
+                        message.message_id in previous_ids
+                        or message.message_id in current_ids
+                    ):
+                        continue
+                    current_ids.add(message.message_id)
+                    yield message
+                previous_ids = current_ids
+
+
+def fetch_messages_sharded(
+    params: ListMessagesParams,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    window: timedelta = DEFAULT_WINDOW,
+    page_size: Optional[int] = None,
+    target_rows: Optional[int] = None,
+    client: Optional[CSMClient] = None,
+) -> List[Message]:
+    """Fetch a date range of messages as concurrent time windows.
+
+    See `iter_messages_sharded` for the windowing behaviour.
+
+    Args:
+        params (ListMessagesParams): Filters for the listing. `start_date`
+            and `end_date` are required.
+        concurrency (int): Maximum number of windows fetched at once.
+        window (timedelta): Length of the first windows.
+        page_size (int, optional): Number of messages per request.
+        target_rows (int, optional): Desired messages per window.
+        client (CSMClient, optional): The client to use.
+
+    Returns:
+        List[Message]: The messages in `created_on` order
+
+    Raises:
+        ValueError: If the date range or concurrency is invalid
+    """
+    return list(
+        iter_messages_sharded(
+            params,
+            concurrency=concurrency,
+            window=window,
+            page_size=page_size,
+            target_rows=target_rows,
+            client=client,
+        )
+    )
@@ -1,9 +1,6 @@
 from typing import Any, Dict
 
-from loguru import logger
-
-from ..helpers.api_request import send_request
-from ..schemas.request import ApiRequest, ApiRequestType
+from .client import get_default_client
 
 
 def get_status() -> Dict[str, Any]:
@@ -15,17 +12,4 @@ def get_status() -> Dict[str, Any]:
     Raises:
         ValueError: If API response is invalid
     """
-    try:
-        logger.info('Step 1. Get API status')
-
-        response = send_request(
-            ApiRequest(
-                type=ApiRequestType.GET,
-                endpoint='status',
-            )
-        )
-
-        return response.json()
-    except Exception as e:
-        logger.error(f'Error getting status: {e}')
-        raise e
+    return get_default_client().get_status()
@@ -0,0 +1,256 @@
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from loguru import logger
+
+from ..helpers.sms import SmsEncoding, sms_info
+from ..schemas.messages import SendToContactData
+from .errors import MessageTemplateError
+
+DEFAULT_BATCH_SIZE = 1000
+
+# `{field}` or `{field|default}`; `{{` and `}}` are literal braces
+_TOKEN = re.compile(r'\{\{|\}\}|\{(\w+)(?:\|([^{}]*))?\}|[{}]')
+
+# A compiled placeholder: field, default and the literal text after it
+_Field = Tuple[str, Optional[str], str]
+
+Row = Any
+RenderResult = Union['RenderedMessage', MessageTemplateError]
+
+
+@dataclass(frozen=True)
+class RenderedMessage:
+    """A personalized message with its SMS size.
+
+    Attributes:
+        msisdn (str, optional): Phone number of the row.
+        message (str): The rendered text.
+        encoding (SmsEncoding): GSM-7 or UCS-2.
+        length (int): Septets for GSM-7, UTF-16 code units for UCS-2.
+        segments (int): Messages the text is split into.
+    """
+
+    msisdn: Optional[str]
+    message: str
+    encoding: SmsEncoding
+    length: int
+    segments: int
+
+    def to_send_data(self, id: Optional[str] = None) -> SendToContactData:
+        """Build the payload to send the message.
+
+        Args:
+            id (str, optional): Message id, used by the API to deduplicate.
+
+        Returns:
+            SendToContactData: The payload
+        """
+        return SendToContactData(
+            msisdn=self.msisdn, message=self.message, id=id
+        )
+
+
+def _compile(template: str) -> Tuple[str, List[_Field]]:
+    head = None
+    fields: List[_Field] = []
+    literal: List[str] = []
+    position = 0
+    for match in _TOKEN.finditer(template):
+        literal.append(template[position : match.start()])
+        position = match.end()
+        token = match.group()
+        if token in ('{{', '}}'):
+            literal.append(token[0])
+        elif match.group(1) is None:
+            raise MessageTemplateError(
+                f'Unmatched {token!r} at position {match.start()}'
+            )
+        else:
+            text = ''.join(literal)
+            if fields:
+                fields[-1] = (*fields[-1][:2], text)
+            else:
+                head = text
+            fields.append((match.group(1), match.group(2), ''))
+            literal = []
+    literal.append(template[position:])
+    text = ''.join(literal)
+    if fields:
+        fields[-1] = (*fields[-1][:2], text)
+    else:
+        head = text
+    return head or '', fields
+
+
+class MessageTemplate:
+    """Message template compiled once and rendered for many contacts.
+
+    Placeholders name a field of the row, e.g. `{first_name}`, with an
+    optional default used when the field is missing or `None`, e.g.
+    `{first_name|amigo}`. Use `{{` and `}}` for literal braces. Rows can
+    be `Contact` models, records or dicts.
+
+    Every rendered message reports its GSM-7/UCS-2 encoding and segment
+    count. Messages over `max_segments` are rejected before they reach the
+    API.
+
+    Args:
+        template (str): The template text.
+        max_segments (int, optional): Most segments a message may use.
+            Defaults to no limit.
+        msisdn_field (str): Field of the row with the phone number.
+
+    Raises:
+        MessageTemplateError: If the template has unmatched braces
+    """
+
+    def __init__(
+        self,
+        template: str,
+        max_segments: Optional[int] = None,
+        msisdn_field: str = 'msisdn',
+    ):
+        """Compile the template."""
+        self.template = template
+        self.max_segments = max_segments
+        self.msisdn_field = msisdn_field
+        self._head, self._fields = _compile(template)
+        self.fields: Tuple[str, ...] = tuple(
+            dict.fromkeys(name for name, _, _ in self._fields)
+        )
+
+    def render(self, row: Row) -> RenderedMessage:
+        """Render the message of one row.
+
+        Args:
+            row (Contact | Record | Mapping): The row.
+
+        Returns:
+            RenderedMessage: The message and its size
+
+        Raises:
+            MessageTemplateError: If a field without default is missing, or
+                if the message exceeds `max_segments`
+        """
+        get = _getter(row)
+        text = [self._head]
+        for name, default, literal in self._fields:
+            value = get(name)
+            if value is None:
+                if default is None:
+                    raise MessageTemplateError(f'Missing field {name!r}')
+                value = default
+            text.append(value if type(value) is str else str(value))
+            text.append(literal)
+
+        message = ''.join(text)
+        info = sms_info(message)
+        if self.max_segments is not None and info.segments > self.max_segments:
+            raise MessageTemplateError(
+                f'Message needs {info.segments} {info.encoding.value} '
+                f'segments, more than {self.max_segments}'
+            )
+        msisdn = get(self.msisdn_field)
+        return RenderedMessage(
+            msisdn=None if msisdn is None else str(msisdn),
+            message=message,
+            encoding=info.encoding,
+            length=info.length,
+            segments=info.segments,
+        )
+
+    def render_batch(self, rows: Sequence[Row]) -> List[RenderResult]:
+        """Render the messages of a batch of rows.
+
+        Args:
+            rows (Sequence[Row]): The rows.
+
+        Returns:
+            List[RenderedMessage | MessageTemplateError]: The message or
+            the error of each row, in order
+        """
+        render = self.render
+        results: List[RenderResult] = []
+        for row in rows:
+            try:
+                results.append(render(row))
+            except MessageTemplateError as e:
+                results.append(e)
+        return results
+
+    def render_many(
+        self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[Tuple[Row, RenderResult]]:
+        """Render a stream of rows in batches.
+
+        Rows are consumed lazily, `batch_size` at a time.
+
+        Args:
+            rows (Iterable[Row]): The rows.
+            batch_size (int): Rows rendered at once.
+
+        Yields:
+            Tuple[Row, RenderedMessage | MessageTemplateError]: Each row
+                with its message or error, in order.
+        """
+        source = iter(rows)
+        while True:
+            batch = list(islice(source, batch_size))
+            if not batch:
+                return
+            yield from zip(batch, self.render_batch(batch))
+
+    def payloads(
+        self,
+        rows: Iterable[Row],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_error: Optional[Callable[[Row, MessageTemplateError], None]] = None,
+    ) -> Iterator[SendToContactData]:
+        """Render rows into payloads for `send_many`.
+
+        Rows that fail to render, or that have no phone number, are
+        skipped and passed to `on_error`.
+
+        Args:
+            rows (Iterable[Row]): The rows.
+            batch_size (int): Rows rendered at once.
+            on_error (Callable, optional): Called with each skipped row and
+                its error. Defaults to logging a warning.
+
+        Yields:
+            SendToContactData: The payload of each valid row.
+        """
+        for row, result in self.render_many(rows, batch_size):
+            if not isinstance(result, MessageTemplateError) and (
+                result.msisdn is None
+            ):
+                result = MessageTemplateError(
+                    f'Missing field {self.msisdn_field!r}'
+                )
+            if isinstance(result, MessageTemplateError):
+                if on_error is not None:
+                    on_error(row, result)
+                else:
+                    logger.warning('Skipping row: {}', result)
+                continue
+            yield result.to_send_data()
+
+
+def _getter(row: Row) -> Callable[[str], Any]:
+    if type(row) is dict or isinstance(row, Mapping):
+        return row.get
+    return lambda name: getattr(row, name, None)
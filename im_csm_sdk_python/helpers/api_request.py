@@ -1,65 +1,308 @@
+from time import perf_counter
+from typing import Any, Dict, Optional, Tuple, Union
 from urllib.parse import urljoin
 
-from httpx import HTTPStatusError, Response, request
+from httpx import AsyncClient, Client, HTTPStatusError, Response, request
 from loguru import logger
 
 from ..configs.config import get_config
-from ..helpers.authentication import authorization
+from ..helpers.authentication import Signer, authorization
+from ..helpers.metrics import (
+    AsyncPoolTrace,
+    AttemptSample,
+    MetricsCollector,
+    PoolTrace,
+)
+from ..helpers.prepared import PreparedRequest
+from ..helpers.rate_limit import RateLimiter
+from ..helpers.retry import Retrier
 from ..schemas.request import ApiRequest
 
+AnyRequest = Union[ApiRequest, PreparedRequest]
 
-def send_request(api_request: ApiRequest) -> Response:
-    """Send authenticated request to API.
+
+def build_request(
+    api_request: AnyRequest,
+    config: Optional[Dict[str, Any]] = None,
+    signer: Optional[Signer] = None,
+) -> Dict[str, Any]:
+    """Sign a request and build the keyword arguments to send it.
 
     Args:
-        api_request (ApiRequest): Request data containing type, endpoint, params, data.
+        api_request (ApiRequest | PreparedRequest): Request data containing type, endpoint, params, data.
+        config (Dict[str, Any], optional): Configuration with apiKey,
+            apiSecret and url. Defaults to `get_config()`.
+        signer (Signer, optional): Precomputed signer for the account.
+            Defaults to calling `authorization` with the config.
 
     Returns:
-        httpx.Response: Response from the API
+        Dict[str, Any]: Keyword arguments for `httpx.Client.request`
 
     Raises:
         ValueError: If required API configuration is missing
-        HTTPStatusError: If HTTP request fails
     """  # noqa: E501
-    request_config = get_config()
+    if isinstance(api_request, PreparedRequest):
+        if signer is None:
+            config = config if config is not None else get_config()
+            signer = Signer(config['apiKey'], config['apiSecret'])
+        return api_request.build(signer)
 
-    request_config['params'] = api_request.params
-    request_config['data'] = api_request.data
+    if config is None:
+        config = get_config()
 
     try:
-        auth = authorization(request_config)
+        if signer is not None:
+            auth = signer.sign(api_request.params, api_request.data)
+        else:
+            auth = authorization(
+                {
+                    **config,
+                    'params': api_request.params,
+                    'data': api_request.data,
+                }
+            )
     except Exception as e:
         logger.error(f'Failed to generate authorization: {e}')
         raise
 
+    return {
+        'method': api_request.type,
+        'url': urljoin(config['url'], f'/api/rest{api_request.endpoint}'),
+        'json': api_request.data,
+        'params': api_request.params,
+        'headers': {
+            'Date': auth['Date'],
+            'Authorization': auth['Authorization'],
+        },
+    }
+
+
+def handle_response(response: Response) -> Response:
+    """Raise for HTTP errors and trace the response.
+
+    Args:
+        response (httpx.Response): Response from the API
+
+    Returns:
+        httpx.Response: The same response
+
+    Raises:
+        HTTPStatusError: If HTTP request fails
+    """
+    # Raise for HTTP errors
+    response.raise_for_status()
+
+    trace = logger.opt(lazy=True).trace
+    trace('Request URL: {}', lambda: response.request.url)
+    trace('Request response: {}', lambda: response.text)
+    trace('Request response status: {}', lambda: response.status_code)
+
+    return response
+
+
+class _Attempts:
+    """Times the attempts of one request for a metrics collector."""
+
+    __slots__ = (
+        'metrics',
+        'api_request',
+        'route',
+        'method',
+        'count',
+        'failed',
+    )
+
+    def __init__(self, metrics: MetricsCollector, api_request: AnyRequest):
+        self.metrics = metrics
+        self.api_request = api_request
+        self.route = getattr(api_request, 'route', api_request.endpoint)
+        self.method = getattr(api_request.type, 'value', api_request.type)
+        self.count = 0
+        self.failed: Optional[float] = None
+
+    def start(self) -> Tuple[AttemptSample, float]:
+        start = perf_counter()
+        self.count += 1
+        sample = AttemptSample(self.route, self.method, self.count)
+        if self.failed is not None:
+            sample.retry_wait = start - self.failed
+        if isinstance(self.api_request, PreparedRequest):
+            self.api_request.encode()
+            encoded = perf_counter()
+            sample.serialize = encoded - start
+            start = encoded
+        return sample, start
+
+    def finish(
+        self,
+        sample: AttemptSample,
+        sent: float,
+        acquired: Optional[float],
+        response: Optional[Response],
+    ) -> None:
+        end = perf_counter()
+        if acquired is not None:
+            sample.pool_wait = acquired - sent
+            sent = acquired
+        sample.network = end - sent
+        if response is not None:
+            sample.status = response.status_code
+            sample.bytes_out = len(response.request.content)
+            sample.bytes_in = len(response.content)
+        if response is None or response.is_error:
+            self.failed = end
+        self.metrics.record(sample)
+
+
+def send_request(
+    api_request: AnyRequest,
+    client: Optional[Client] = None,
+    config: Optional[Dict[str, Any]] = None,
+    signer: Optional[Signer] = None,
+    retrier: Optional[Retrier] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    metrics: Optional[MetricsCollector] = None,
+) -> Response:
+    """Send authenticated request to API.
+
+    Args:
+        api_request (ApiRequest | PreparedRequest): Request data containing type, endpoint, params, data.
+        client (httpx.Client, optional): Pooled HTTP client used to send the
+            request. When omitted a one-shot connection is opened.
+        config (Dict[str, Any], optional): Configuration with apiKey,
+            apiSecret and url. Defaults to `get_config()`.
+        signer (Signer, optional): Precomputed signer for the account.
+        retrier (Retrier, optional): Retry policy and circuit breaker. Each
+            attempt is signed again. Without it the request is sent once.
+        rate_limiter (RateLimiter, optional): Waits for the endpoint's
+            rate limit before every attempt.
+        metrics (MetricsCollector, optional): Receives the status, sizes
+            and phase timings of every attempt.
+
+    Returns:
+        httpx.Response: Response from the API
+
+    Raises:
+        ValueError: If required API configuration is missing
+        HTTPStatusError: If HTTP request fails
+        CircuitOpenError: If the retrier's circuit breaker is open
+    """  # noqa: E501
+    send = client.request if client is not None else request
+    attempts = _Attempts(metrics, api_request) if metrics else None
+
+    def attempt() -> Response:
+        if rate_limiter is not None:
+            rate_limiter.acquire(api_request)
+        if attempts is None:
+            request_kwargs = build_request(api_request, config, signer)
+            return handle_response(send(**request_kwargs))
+
+        sample, start = attempts.start()
+        request_kwargs = build_request(api_request, config, signer)
+        trace = PoolTrace()
+        if client is not None:
+            request_kwargs['extensions'] = {'trace': trace}
+        sent = perf_counter()
+        sample.sign = sent - start
+        try:
+            response = send(**request_kwargs)
+        except Exception:
+            attempts.finish(sample, sent, trace.acquired, None)
+            raise
+        attempts.finish(sample, sent, trace.acquired, response)
+        return handle_response(response)
+
     try:
         logger.info(
-            f'Step 3. Send {api_request.type} request to {api_request.endpoint}'  # noqa: E501
-        )
-        logger.trace(f'Data: {api_request.data}')
-        logger.trace(f'Params: {api_request.params}')
-
-        response = request(
-            method=api_request.type,
-            url=urljoin(
-                request_config['url'], f'/api/rest{api_request.endpoint}'
-            ),
-            json=api_request.data,
-            params=api_request.params,
-            headers={
-                'Date': auth['Date'],
-                'Authorization': auth['Authorization'],
-            },
+            'Step 3. Send {} request to {}',
+            api_request.type,
+            api_request.endpoint,
         )
+        trace = logger.opt(lazy=True).trace
+        trace('Data: {}', lambda: api_request.data)
+        trace('Params: {}', lambda: api_request.params)
+
+        if retrier is None:
+            return attempt()
+        return retrier.call(api_request, attempt)
+
+    except HTTPStatusError as e:
+        logger.error(f'HTTP error {e.response.status_code}: {e}')
+        raise e
+    except Exception as e:
+        logger.error(f'Request failed: {e}')
+        raise
+
 
-        # Raise for HTTP errors
-        response.raise_for_status()
+async def async_send_request(
+    api_request: AnyRequest,
+    client: AsyncClient,
+    config: Optional[Dict[str, Any]] = None,
+    signer: Optional[Signer] = None,
+    retrier: Optional[Retrier] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    metrics: Optional[MetricsCollector] = None,
+) -> Response:
+    """Send authenticated request to API without blocking the event loop.
 
-        logger.trace(f'Request URL: {response.request.url}')
-        logger.trace(f'Request response: {response.json()}')
-        logger.trace(f'Request response status: {response.status_code}')
+    Args:
+        api_request (ApiRequest | PreparedRequest): Request data containing type, endpoint, params, data.
+        client (httpx.AsyncClient): Pooled async HTTP client used to send
+            the request.
+        config (Dict[str, Any], optional): Configuration with apiKey,
+            apiSecret and url. Defaults to `get_config()`.
+        signer (Signer, optional): Precomputed signer for the account.
+        retrier (Retrier, optional): Retry policy and circuit breaker. Each
+            attempt is signed again. Without it the request is sent once.
+        rate_limiter (RateLimiter, optional): Waits for the endpoint's
+            rate limit before every attempt.
+        metrics (MetricsCollector, optional): Receives the status, sizes
+            and phase timings of every attempt.
+
+    Returns:
+        httpx.Response: Response from the API
+
+    Raises:
+        ValueError: If required API configuration is missing
+        HTTPStatusError: If HTTP request fails
+        CircuitOpenError: If the retrier's circuit breaker is open
+    """  # noqa: E501
+    attempts = _Attempts(metrics, api_request) if metrics else None
+
+    async def attempt() -> Response:
+        if rate_limiter is not None:
+            await rate_limiter.aacquire(api_request)
+        if attempts is None:
+            request_kwargs = build_request(api_request, config, signer)
+            return handle_response(await client.request(**request_kwargs))
+
+        sample, start = attempts.start()
+        request_kwargs = build_request(api_request, config, signer)
+        trace = AsyncPoolTrace()
+        request_kwargs['extensions'] = {'trace': trace}
+        sent = perf_counter()
+        sample.sign = sent - start
+        try:
+            response = await client.request(**request_kwargs)
+        except Exception:
+            attempts.finish(sample, sent, trace.acquired, None)
+            raise
+        attempts.finish(sample, sent, trace.acquired, response)
+        return handle_response(response)
+
+    try:
+        logger.info(
+            'Step 3. Send {} request to {}',
+            api_request.type,
+            api_request.endpoint,
+        )
+        trace = logger.opt(lazy=True).trace
+        trace('Data: {}', lambda: api_request.data)
+        trace('Params: {}', lambda: api_request.params)
 
-        return response
+        if retrier is None:
+            return await attempt()
+        return await retrier.acall(api_request, attempt)
 
     except HTTPStatusError as e:
         logger.error(f'HTTP error {e.response.status_code}: {e}')
@@ -2,7 +2,10 @@ import base64
 import hashlib
 import hmac
 import json
+import time
 from datetime import datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote as q_parse
 
 from loguru import logger
 
@@ -52,14 +55,143 @@ def authorization(config: dict) -> dict:
     ).digest()
     signature = base64.b64encode(sign).decode('utf-8')
 
-    logger.trace(f'{formatted_data=}')
-    logger.trace(f'{formatted_params=}')
-    logger.trace(f'{canonical_string=}')
-    logger.trace(f'{signature=}')
+    trace = logger.opt(lazy=True).trace
+    trace('formatted_data={}', lambda: repr(formatted_data))
+    trace('formatted_params={}', lambda: repr(formatted_params))
+    trace('canonical_string={}', lambda: repr(canonical_string))
+    trace('signature={}', lambda: repr(signature))
 
     auth['Date'] = formatted_date
     auth['Authorization'] = f'IM {config["apiKey"]}:{signature}'
 
-    logger.trace(f'Auth headers: {auth}')
+    trace('Auth headers: {}', lambda: auth)
 
     return auth
+
+
+_DATE_FORMAT = '%a, %d %b %Y %H:%M:%S GMT'
+_BOOL_VALUES = {True: 'true', False: 'false'}
+
+
+class Signer:
+    """Precomputed request signer bound to one apiKey/apiSecret pair.
+
+    Produces the same headers as `authorization`, but keeps the HMAC key
+    state, the encoded key and the formatted date (per second) between
+    calls, and feeds the canonical string to the HMAC in byte chunks.
+    Instances are safe to share between threads.
+
+    Args:
+        api_key (str): The account API key.
+        api_secret (str): The account API secret.
+
+    Raises:
+        ValueError: If the key or the secret is missing
+    """
+
+    def __init__(self, api_key: str, api_secret: str):
+        """Initialize the signer and its HMAC key state."""
+        if not api_key or not api_secret:
+            raise ValueError('Keys are needed!')
+
+        self.api_key = api_key
+        self._api_key_bytes = api_key.encode('utf-8')
+        self._authorization_prefix = f'IM {api_key}:'
+        self._hmac = hmac.new(
+            api_secret.encode('utf-8'), digestmod=hashlib.sha1
+        )
+        self._date_cache = (-1, '', b'')
+
+    def formatted_date(self) -> Tuple[str, bytes]:
+        """Get the RFC 1123 date for the current second.
+
+        Returns:
+            Tuple[str, bytes]: The formatted date and its UTF-8 encoding
+        """
+        now = int(time.time())
+        second, formatted, encoded = self._date_cache
+        if second != now:
+            formatted = time.strftime(_DATE_FORMAT, time.gmtime(now))
+            encoded = formatted.encode('utf-8')
+            self._date_cache = (now, formatted, encoded)
+        return formatted, encoded
+
+    def sign(
+        self,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        formatted_date: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Generate authentication headers for a request.
+
+        Args:
+            params (dict, optional): Query parameters of the request.
+            data (dict, optional): JSON body of the request.
+            formatted_date (str, optional): Date to sign with. Defaults to
+                the current time.
+
+        Returns:
+            Dict[str, str]: Authentication headers with Date and Authorization
+        """
+        canonical_data = None
+        if data:
+            canonical_data = json.dumps(data, separators=(',', ':')).encode(
+                'utf-8'
+            )
+        return self.sign_encoded(params, canonical_data, formatted_date)
+
+    def sign_encoded(
+        self,
+        params: Optional[dict] = None,
+        canonical_data: Optional[bytes] = None,
+        formatted_date: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Generate authentication headers for an already encoded body.
+
+        Args:
+            params (dict, optional): Query parameters of the request.
+            canonical_data (bytes, optional): The body as compact, ASCII-only
+                JSON, i.e. `json.dumps(data, separators=(',', ':'))`.
+            formatted_date (str, optional): Date to sign with. Defaults to
+                the current time.
+
+        Returns:
+            Dict[str, str]: Authentication headers with Date and Authorization
+        """
+        if formatted_date is None:
+            formatted_date, date_bytes = self.formatted_date()
+        else:
+            date_bytes = formatted_date.encode('utf-8')
+
+        sign = self._hmac.copy()
+        sign.update(self._api_key_bytes)
+        sign.update(date_bytes)
+        if params:
+            sign.update(canonical_params(params))
+        if canonical_data:
+            sign.update(canonical_data)
+
+        signature = base64.b64encode(sign.digest()).decode('ascii')
+
+        return {
+            'Date': formatted_date,
+            'Authorization': self._authorization_prefix + signature,
+        }
+
+
+def canonical_params(params: dict) -> bytes:
+    """Build the canonical query string used in the signature.
+
+    Args:
+        params (dict): Query parameters of the request.
+
+    Returns:
+        bytes: Parameters sorted by key, URL-quoted and joined with `&`
+    """
+    parts = []
+    for key in sorted(params):
+        value = params[key]
+        if value is True or value is False:
+            value = _BOOL_VALUES[value]
+        parts.append(f'{key}={q_parse(str(value)).replace("%20", "+")}')
+    return '&'.join(parts).encode('utf-8')
@@ -0,0 +1,436 @@
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from enum import Enum
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+
+# Prometheus' default latency buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+DEFAULT_NAMESPACE = 'csm'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Phase(str, Enum):
+    """A timed part of a request.
+
+    SERIALIZE encodes the JSON body, SIGN builds the signed request,
+    POOL_WAIT waits for a pooled connection, NETWORK sends it and reads the
+    response, DECODE validates the response, and RETRY_WAIT is the backoff
+    before a retry.
+    """
+
+    SERIALIZE = 'serialize'
+    SIGN = 'sign'
+    POOL_WAIT = 'pool_wait'
+    NETWORK = 'network'
+    DECODE = 'decode'
+    RETRY_WAIT = 'retry_wait'
+
+
+@dataclass
+class AttemptSample:
+    """Measurements of one attempt of a request.
+
+    Attributes:
+        route (str): The endpoint, with path values replaced by their name,
+            e.g. `/contacts/{msisdn}`.
+        method (str): The HTTP method.
+        attempt (int): Number of the attempt, from 1.
+        status (int): The HTTP status, or 0 when no response arrived.
+        bytes_out (int): Size of the request body.
+        bytes_in (int): Size of the response body.
+        serialize (float): Seconds encoding the body.
+        sign (float): Seconds signing and building the request.
+        pool_wait (float, optional): Seconds waiting for a pooled
+            connection, or `None` when the transport does not report it.
+        network (float): Seconds sending the request and reading the
+            response, after a connection was acquired.
+        retry_wait (float): Seconds since the previous attempt failed.
+    """
+
+    route: str
+    method: str
+    attempt: int = 1
+    status: int = 0
+    bytes_out: int = 0
+    bytes_in: int = 0
+    serialize: float = 0.0
+    sign: float = 0.0
+    pool_wait: Optional[float] = None
+    network: float = 0.0
+    retry_wait: float = 0.0
+
+    @property
+    def seconds(self) -> float:
+        """Duration of the attempt, from serializing to the response."""
+        pool_wait = self.pool_wait or 0.0
+        return self.serialize + self.sign + pool_wait + self.network
+
+
+class MetricsCollector(Protocol):
+    """Receiver of request metrics, e.g. `Metrics`."""
+
+    def record(self, sample: AttemptSample) -> None:
+        """Record one attempt of a request."""
+        ...
+
+    def observe(self, route: str, phase: Phase, seconds: float) -> None:
+        """Record a phase timed outside of an attempt, e.g. DECODE."""
+        ...
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds.
+
+    Args:
+        buckets (Sequence[float]): Increasing upper bounds, in seconds.
+    """
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize an empty histogram."""
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Add one value.
+
+        Args:
+            value (float): The value, in seconds.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Count of values up to each bound, ending with `+Inf`.
+
+        Returns:
+            List[Tuple[float, int]]: Upper bound and cumulative count
+        """
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside its bucket.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimate, or 0.0 without values
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        lower = 0.0
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.buckets[-1]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return ','.join(
+        f'{name}="{_escape(str(value))}"' for name, value in labels.items()
+    )
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """In-memory request metrics with a Prometheus text renderer.
+
+    Pass it as `metrics` to a client and serve `render_prometheus()` from
+    the service's `/metrics` endpoint. It keeps per-route counters of
+    requests by status, retries and bytes, and latency histograms of each
+    `Phase` and of whole attempts. It is safe to share between threads and
+    clients.
+
+    Args:
+        buckets (Sequence[float]): Histogram upper bounds, in seconds.
+        namespace (str): Prefix of the metric names.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        namespace: str = DEFAULT_NAMESPACE,
+    ):
+        """Initialize empty metrics."""
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop every measurement."""
+        with self._lock:
+            self.requests: Dict[Tuple[str, str, int], int] = {}
+            self.retries: Dict[Tuple[str, str], int] = {}
+            self.bytes_out: Dict[Tuple[str, str], int] = {}
+            self.bytes_in: Dict[Tuple[str, str], int] = {}
+            self.phases: Dict[Tuple[str, str], Histogram] = {}
+            self.latency: Dict[Tuple[str, str], Histogram] = {}
+
+    def _histogram(
+        self, histograms: Dict[Tuple[str, str], Histogram], key: Tuple
+    ) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    def record(self, sample: AttemptSample) -> None:
+        """Record one attempt of a request.
+
+        Args:
+            sample (AttemptSample): The attempt.
+        """
+        route, method = sample.route, sample.method
+        key = (route, method)
+        with self._lock:
+            status_key = (route, method, sample.status)
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            out, in_ = sample.bytes_out, sample.bytes_in
+            self.bytes_out[key] = self.bytes_out.get(key, 0) + out
+            self.bytes_in[key] = self.bytes_in.get(key, 0) + in_
+            if sample.attempt > 1:
+                self.retries[key] = self.retries.get(key, 0) + 1
+                self._histogram(
+                    self.phases, (route, Phase.RETRY_WAIT.value)
+                ).observe(sample.retry_wait)
+            for phase, seconds in (
+                (Phase.SERIALIZE, sample.serialize),
+                (Phase.SIGN, sample.sign),
+                (Phase.POOL_WAIT, sample.pool_wait),
+                (Phase.NETWORK, sample.network),
+            ):
+                if seconds is not None:
+                    self._histogram(self.phases, (route, phase.value)).observe(
+                        seconds
+                    )
+            self._histogram(self.latency, key).observe(sample.seconds)
+
+    def observe(self, route: str, phase: Phase, seconds: float) -> None:
+        """Record a phase timed outside of an attempt.
+
+        Args:
+            route (str): The endpoint route.
+            phase (Phase): The phase, e.g. DECODE.
+            seconds (float): Its duration.
+        """
+        with self._lock:
+            self._histogram(self.phases, (route, Phase(phase).value)).observe(
+                seconds
+            )
+
+    def histogram(self, route: str, phase: Phase) -> Optional[Histogram]:
+        """Get the histogram of a phase of a route.
+
+        Args:
+            route (str): The endpoint route, e.g. `/messages`.
+            phase (Phase): The phase.
+
+        Returns:
+            Histogram, optional: The histogram, or `None` before any value
+        """
+        return self.phases.get((route, Phase(phase).value))
+
+    def render_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, served with `PROMETHEUS_CONTENT_TYPE`
+        """
+        ns = self.namespace
+        lines: List[str] = []
+
+        def counter(
+            name: str, help_text: str, values: Iterable[Tuple[str, int]]
+        ) -> None:
+            lines.append(f'# HELP {ns}_{name} {help_text}')
+            lines.append(f'# TYPE {ns}_{name} counter')
+            for labels, value in values:
+                lines.append(f'{ns}_{name}{{{labels}}} {value}')
+
+        def histogram(
+            name: str,
+            help_text: str,
+            values: Iterable[Tuple[str, Histogram]],
+        ) -> None:
+            lines.append(f'# HELP {ns}_{name} {help_text}')
+            lines.append(f'# TYPE {ns}_{name} histogram')
+            for labels, hist in values:
+                for bound, count in hist.cumulative():
+                    le = _labels(le=_number(bound))
+                    lines.append(
+                        f'{ns}_{name}_bucket{{{labels},{le}}} {count}'
+                    )
+                lines.append(f'{ns}_{name}_sum{{{labels}}} {hist.sum!r}')
+                lines.append(f'{ns}_{name}_count{{{labels}}} {hist.count}')
+
+        with self._lock:
+            counter(
+                'requests_total',
+                'HTTP requests sent, by endpoint, method and status.',
+                (
+                    (
+                        _labels(
+                            endpoint=route,
+                            method=method,
+                            status=str(status) if status else 'error',
+                        ),
+                        count,
+                    )
+                    for (route, method, status), count in sorted(
+                        self.requests.items()
+                    )
+                ),
+            )
+            counter(
+                'retries_total',
+                'Requests sent again after a failed attempt.',
+                (
+                    (_labels(endpoint=route, method=method), count)
+                    for (route, method), count in sorted(self.retries.items())
+                ),
+            )
+            counter(
+                'request_bytes_total',
+                'Request body bytes sent.',
+                (
+                    (_labels(endpoint=route, method=method), count)
+                    for (route, method), count in sorted(
+                        self.bytes_out.items()
+                    )
+                ),
+            )
+            counter(
+                'response_bytes_total',
+                'Response body bytes received.',
+                (
+                    (_labels(endpoint=route, method=method), count)
+                    for (route, method), count in sorted(self.bytes_in.items())
+                ),
+            )
+            histogram(
+                'request_duration_seconds',
+                'Duration of each attempt, from serializing to the response.',
+                (
+                    (_labels(endpoint=route, method=method), hist)
+                    for (route, method), hist in sorted(self.latency.items())
+                ),
+            )
+            histogram(
+                'phase_duration_seconds',
+                'Duration of each phase of a request.',
+                (
+                    (_labels(endpoint=route, phase=phase), hist)
+                    for (route, phase), hist in sorted(self.phases.items())
+                ),
+            )
+        lines.append('')
+        return '\n'.join(lines)
+
+
+class CallbackCollector:
+    """Forward request metrics to callables, e.g. for StatsD or OpenTelemetry.
+
+    Args:
+        on_record (Callable[[AttemptSample], None]): Called with every
+            attempt.
+        on_observe (Callable[[str, Phase, float], None], optional): Called
+            with every phase timed outside of an attempt.
+    """
+
+    def __init__(
+        self,
+        on_record: Callable[[AttemptSample], None],
+        on_observe: Optional[Callable[[str, Phase, float], None]] = None,
+    ):
+        """Initialize the collector."""
+        self.on_record = on_record
+        self.on_observe = on_observe
+
+    def record(self, sample: AttemptSample) -> None:
+        """Forward one attempt."""
+        self.on_record(sample)
+
+    def observe(self, route: str, phase: Phase, seconds: float) -> None:
+        """Forward one phase."""
+        if self.on_observe is not None:
+            self.on_observe(route, phase, seconds)
+
+
+class PoolTrace:
+    """`trace` extension of httpx noting when a connection was acquired.
+
+    httpcore reports its first event once the pool handed the request a
+    connection, so the time until then is the pool wait.
+    """
+
+    __slots__ = ('acquired',)
+
+    def __init__(self):
+        """Initialize the trace."""
+        self.acquired: Optional[float] = None
+
+    def __call__(self, event: str, info: dict) -> None:
+        """Note the first event."""
+        if self.acquired is None:
+            self.acquired = time.perf_counter()
+
+
+class AsyncPoolTrace(PoolTrace):
+    """`trace` extension of httpx for async clients. See `PoolTrace`."""
+
+    __slots__ = ()
+
+    async def __call__(self, event: str, info: dict) -> None:
+        """Note the first event."""
+        if self.acquired is None:
+            self.acquired = time.perf_counter()
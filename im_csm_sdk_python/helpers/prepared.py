@@ -0,0 +1,188 @@
+import json
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+from ..schemas.request import ApiRequestType
+from .authentication import Signer
+
+API_PREFIX = '/api/rest'
+
+_BODY_TYPES = {ApiRequestType.POST.value, ApiRequestType.PUT.value}
+
+
+def encode_json(data: Any) -> Tuple[bytes, bytes]:
+    """Serialize a JSON body once for sending and for signing.
+
+    The body is encoded like `httpx` does for `json=`, i.e. compact and
+    with non-ASCII characters kept, while the signature covers the
+    ASCII-escaped form. For ASCII-only payloads both are the same bytes,
+    so the data is serialized a single time.
+
+    Args:
+        data (Any): The JSON body.
+
+    Returns:
+        Tuple[bytes, bytes]: The body to send and the body to sign
+    """
+    body = json.dumps(
+        data, ensure_ascii=False, separators=(',', ':'), allow_nan=False
+    )
+    if body.isascii():
+        encoded = body.encode('ascii')
+        return encoded, encoded
+    return (
+        body.encode('utf-8'),
+        json.dumps(data, separators=(',', ':')).encode('ascii'),
+    )
+
+
+class PreparedRequest:
+    """One call of a `PreparedEndpoint`.
+
+    It has the `type`, `endpoint`, `params` and `data` attributes of
+    `ApiRequest`, so retries, rate limits and request coalescing handle
+    both alike. The body is encoded once, on the first attempt, and every
+    attempt only signs and sends it. `route` is the endpoint without the
+    value of its path segment, e.g. `/contacts/{msisdn}`, which keeps
+    metrics labels few.
+    """
+
+    __slots__ = (
+        'type',
+        'endpoint',
+        'route',
+        'url',
+        'params',
+        'data',
+        'body',
+        'prepared',
+        '_canonical_data',
+    )
+
+    def __init__(
+        self,
+        prepared: 'PreparedEndpoint',
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        path: Optional[str] = None,
+    ):
+        """Initialize the request and encode its body."""
+        self.type = prepared.type
+        if path is None:
+            self.endpoint = self.route = prepared.endpoint
+            self.url = prepared.url
+        else:
+            self.endpoint = f'{prepared.endpoint}/{path}'
+            self.route = prepared.path_route
+            self.url = f'{prepared.url}/{path}'
+        self.params = params
+        self.data = data
+        self.prepared = prepared
+        self.body: Optional[bytes] = None
+        self._canonical_data: Optional[bytes] = None
+
+    def encode(self) -> None:
+        """Encode the JSON body, unless it is already encoded."""
+        if self.body is None and self.data is not None:
+            self.body, self._canonical_data = encode_json(self.data)
+
+    def build(self, signer: Signer) -> Dict[str, Any]:
+        """Sign the request and build the keyword arguments to send it.
+
+        Args:
+            signer (Signer): Signer of the account.
+
+        Returns:
+            Dict[str, Any]: Keyword arguments for `httpx.Client.request`
+        """
+        self.encode()
+        auth = signer.sign_encoded(
+            self.params, self._canonical_data if self.data else None
+        )
+        headers = dict(self.prepared.headers)
+        headers['Date'] = auth['Date']
+        headers['Authorization'] = auth['Authorization']
+        return {
+            'method': self.type,
+            'url': self.url,
+            'content': self.body,
+            'params': self.params,
+            'headers': headers,
+        }
+
+
+class PreparedEndpoint:
+    """An API endpoint compiled once for a base URL.
+
+    The method, the fully resolved URL, the static headers and the response
+    adapter are worked out up front, so a call only encodes its payload,
+    signs and sends.
+
+    Args:
+        base_url (str): The base URL of the API.
+        type (ApiRequestType): The HTTP method.
+        endpoint (str): The endpoint path, e.g. `messages/send_to_contact`.
+        adapter (Any, optional): TypeAdapter decoding the response.
+        record (type, optional): Record type of the response in RECORD mode.
+        path_name (str): Name of the path segment appended by a call, used
+            in its metrics route, e.g. `msisdn` for `/contacts/{msisdn}`.
+    """
+
+    __slots__ = (
+        'type',
+        'endpoint',
+        'path_route',
+        'url',
+        'headers',
+        'adapter',
+        'record',
+    )
+
+    def __init__(
+        self,
+        base_url: str,
+        type: ApiRequestType,
+        endpoint: str,
+        adapter: Any = None,
+        record: Optional[type] = None,
+        path_name: str = 'path',
+    ):
+        """Resolve the URL and headers of the endpoint."""
+        if not endpoint or endpoint.strip() == '':
+            raise ValueError('Endpoint cannot be empty')
+        self.type = ApiRequestType(type).value
+        self.endpoint = (
+            endpoint if endpoint.startswith('/') else f'/{endpoint}'
+        )
+        self.path_route = f'{self.endpoint}/{{{path_name}}}'
+        self.url = urljoin(base_url, f'{API_PREFIX}{self.endpoint}')
+        self.headers: Dict[str, str] = (
+            {'Content-Type': 'application/json'}
+            if self.type in _BODY_TYPES
+            else {}
+        )
+        self.adapter = adapter
+        self.record = record
+
+    def __repr__(self) -> str:
+        """Represent the endpoint with its method and URL."""
+        return f'PreparedEndpoint({self.type} {self.url})'
+
+    def request(
+        self,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        path: Optional[str] = None,
+    ) -> PreparedRequest:
+        """Prepare one call of the endpoint.
+
+        Args:
+            params (dict, optional): Query parameters.
+            data (dict, optional): JSON body.
+            path (str, optional): Path segment appended to the endpoint,
+                e.g. the msisdn of `contacts/<msisdn>`.
+
+        Returns:
+            PreparedRequest: The call, ready to sign and send
+        """
+        return PreparedRequest(self, params, data, path)
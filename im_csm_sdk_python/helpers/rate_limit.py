@@ -0,0 +1,343 @@
+import asyncio
+import os
+import re
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Protocol, Tuple, Union
+
+from loguru import logger
+
+from ..schemas.request import ApiRequest
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Bucket state in a shared file: tokens left and last refill (epoch seconds)
+_STATE = struct.Struct('<dd')
+
+
+class Bucket(Protocol):
+    """Token bucket used by `RateLimiter`."""
+
+    rate: float
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now and get the seconds to wait before using them."""
+        ...
+
+    def release(self, tokens: float = 1.0) -> None:
+        """Give back reserved tokens that will not be used."""
+        ...
+
+
+def _refill(
+    tokens: float, updated: float, now: float, rate: float, burst: float
+) -> float:
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+
+class TokenBucket:
+    """In-process token bucket shared by the threads of one process.
+
+    Tokens refill at `rate` per second up to `burst`. A caller that finds
+    the bucket empty still takes its token and waits until it would have
+    been refilled, so callers queue in order and leave at the allowed rate.
+
+    Args:
+        rate (float): Tokens added per second, i.e. the allowed requests
+            per second.
+        burst (float, optional): Bucket capacity. Defaults to `rate`, one
+            second of traffic.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """Initialize a full bucket."""
+        if rate <= 0:
+            raise ValueError('Rate must be positive')
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens and get the seconds to wait before using them.
+
+        Args:
+            tokens (float): Tokens to take.
+
+        Returns:
+            float: Seconds to wait, 0 if the tokens were available
+        """
+        return self._take(tokens)
+
+    def release(self, tokens: float = 1.0) -> None:
+        """Give back reserved tokens that will not be used.
+
+        Callers queued after the reservation keep their waits, but later
+        ones no longer wait for the given back tokens.
+
+        Args:
+            tokens (float): Tokens to give back.
+        """
+        self._take(-tokens)
+
+    def _take(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = _refill(
+                self._tokens, self._updated, now, self.rate, self.burst
+            )
+            self._updated = now
+            self._tokens = min(self.burst, self._tokens - tokens)
+            return max(0.0, -self._tokens / self.rate)
+
+
+class FileTokenBucket:
+    """Token bucket stored in a file, shared by the processes of one host.
+
+    The bucket state is two doubles read and written under an exclusive
+    `flock`, so every worker process pointing at the same file draws from
+    the same budget. Processes must use the same `rate` and `burst`.
+    Requires a POSIX system.
+
+    Args:
+        path (str): Path of the bucket file. Parent directories are
+            created.
+        rate (float): Tokens added per second.
+        burst (float, optional): Bucket capacity. Defaults to `rate`.
+
+    Raises:
+        RuntimeError: If file locking is not available
+    """
+
+    def __init__(self, path: str, rate: float, burst: Optional[float] = None):
+        """Initialize the bucket, creating the file full if missing."""
+        if fcntl is None:
+            raise RuntimeError('FileTokenBucket requires fcntl (POSIX)')
+        if rate <= 0:
+            raise ValueError('Rate must be positive')
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+
+    def _file(self) -> int:
+        # File locks belong to the open file, so a forked child reopens it
+        if self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens and get the seconds to wait before using them.
+
+        Args:
+            tokens (float): Tokens to take.
+
+        Returns:
+            float: Seconds to wait, 0 if the tokens were available
+        """
+        return self._take(tokens)
+
+    def release(self, tokens: float = 1.0) -> None:
+        """Give back reserved tokens that will not be used.
+
+        Args:
+            tokens (float): Tokens to give back.
+        """
+        self._take(-tokens)
+
+    def _take(self, tokens: float) -> float:
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                data = os.pread(fd, _STATE.size, 0)
+                if len(data) == _STATE.size:
+                    available, updated = _STATE.unpack(data)
+                    available = _refill(
+                        available, updated, now, self.rate, self.burst
+                    )
+                else:
+                    available = self.burst
+                available = min(self.burst, available - tokens)
+                os.pwrite(fd, _STATE.pack(available, now), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        return max(0.0, -available / self.rate)
+
+    def close(self) -> None:
+        """Close the bucket file."""
+        if self._fd is not None and self._pid == os.getpid():
+            os.close(self._fd)
+        self._fd = self._pid = None
+
+
+@dataclass
+class RateLimitStats:
+    """Counters for a `RateLimiter`.
+
+    Attributes:
+        acquired (int): Requests let through.
+        delayed (int): Requests that had to wait for a token.
+        wait_seconds (float): Total time spent waiting.
+        cancelled (int): Waits cancelled before the request was sent,
+            whose tokens were given back.
+    """
+
+    acquired: int = 0
+    delayed: int = 0
+    wait_seconds: float = 0.0
+    cancelled: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def add(self, **counts: float) -> None:
+        """Increment counters by name.
+
+        Args:
+            **counts: The increment of each counter.
+        """
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+
+def _endpoint_key(endpoint: str) -> str:
+    return endpoint.strip('/')
+
+
+class RateLimiter:
+    """Smooth requests to the allowed rate of each endpoint.
+
+    Every endpoint prefix has its own bucket: `contacts` limits
+    `/contacts` and `/contacts/{msisdn}`, `messages/send` limits only the
+    tag sends. The longest matching prefix wins, and requests to endpoints
+    without a bucket are not limited.
+
+    Args:
+        buckets (Mapping[str, Bucket]): Bucket of each endpoint prefix.
+    """
+
+    def __init__(self, buckets: Mapping[str, Bucket]):
+        """Initialize the limiter."""
+        self.buckets: Dict[str, Bucket] = {
+            _endpoint_key(endpoint): bucket
+            for endpoint, bucket in buckets.items()
+        }
+        self.stats = RateLimitStats()
+
+    @classmethod
+    def from_rates(
+        cls,
+        rates: Mapping[str, float],
+        burst: Optional[Mapping[str, float]] = None,
+        directory: Optional[str] = None,
+    ) -> 'RateLimiter':
+        """Build a limiter from requests per second by endpoint.
+
+        Args:
+            rates (Mapping[str, float]): Allowed requests per second of each
+                endpoint prefix, e.g. `{'messages/send_to_contact': 20}`.
+            burst (Mapping[str, float], optional): Bucket capacity of each
+                endpoint. Defaults to one second of traffic.
+            directory (str, optional): Directory of shared bucket files.
+                When set, every process using the same directory shares
+                the budget. Defaults to in-process buckets.
+
+        Returns:
+            RateLimiter: The limiter
+        """
+        burst = burst or {}
+        buckets: Dict[str, Bucket] = {}
+        for endpoint, rate in rates.items():
+            capacity = burst.get(endpoint)
+            if directory is None:
+                buckets[endpoint] = TokenBucket(rate, capacity)
+            else:
+                name = re.sub(r'[^\w.-]+', '_', _endpoint_key(endpoint))
+                buckets[endpoint] = FileTokenBucket(
+                    os.path.join(directory, f'{name}.bucket'), rate, capacity
+                )
+        return cls(buckets)
+
+    def bucket_for(self, endpoint: str) -> Optional[Bucket]:
+        """Find the bucket limiting an endpoint.
+
+        Args:
+            endpoint (str): The request endpoint.
+
+        Returns:
+            Bucket, optional: The bucket, or `None` if not limited
+        """
+        key = _endpoint_key(endpoint)
+        bucket = None
+        match = ''
+        for prefix, candidate in self.buckets.items():
+            if (key == prefix or key.startswith(f'{prefix}/')) and len(
+                prefix
+            ) > len(match):
+                bucket, match = candidate, prefix
+        return bucket
+
+    def _reserve(
+        self, api_request: Union[ApiRequest, str]
+    ) -> Tuple[Optional[Bucket], float]:
+        endpoint = getattr(api_request, 'endpoint', api_request)
+        bucket = self.bucket_for(endpoint)
+        if bucket is None:
+            return None, 0.0
+        wait = bucket.reserve()
+        self.stats.add(acquired=1, delayed=int(wait > 0), wait_seconds=wait)
+        if wait > 0:
+            logger.debug('Rate limit on {}: wait {:.3f}s', endpoint, wait)
+        return bucket, wait
+
+    def acquire(self, api_request: Union[ApiRequest, str]) -> float:
+        """Block until a request may be sent.
+
+        Args:
+            api_request (ApiRequest | str): The request or its endpoint.
+
+        Returns:
+            float: Seconds waited
+        """
+        _, wait = self._reserve(api_request)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, api_request: Union[ApiRequest, str]) -> float:
+        """Wait without blocking the event loop until a request may be sent.
+
+        A task cancelled while it waits gives its token back, so cancelled
+        sends do not push back the requests queued after them.
+
+        Args:
+            api_request (ApiRequest | str): The request or its endpoint.
+
+        Returns:
+            float: Seconds waited
+        """
+        bucket, wait = self._reserve(api_request)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                bucket.release()
+                self.stats.add(cancelled=1)
+                raise
+        return wait
@@ -0,0 +1,434 @@
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Awaitable, Callable, FrozenSet, Optional
+
+from httpx import HTTPStatusError, Response, TransportError
+from loguru import logger
+
+from ..core.errors import CircuitOpenError
+from ..schemas.request import ApiRequest, ApiRequestType
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_BASE = 0.2
+DEFAULT_BACKOFF_MAX = 10.0
+DEFAULT_MAX_RETRY_AFTER = 60.0
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIME = 30.0
+
+
+def parse_retry_after(response: Response) -> Optional[float]:
+    """Read the `Retry-After` header of a response.
+
+    Args:
+        response (httpx.Response): The response.
+
+    Returns:
+        float, optional: Seconds to wait, or `None` without a valid header
+    """
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isascii() and value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request.
+
+    GET requests are retried on transport errors and on `retry_statuses`.
+    POST requests are retried only when their payload carries an `id`, so
+    the API can deduplicate a send that reached it before the failure.
+    Waits grow exponentially with full jitter, and a `Retry-After` header
+    on 429/503 responses takes precedence.
+
+    Attributes:
+        max_attempts (int): Attempts per request, including the first one.
+            Use 1 to disable retries.
+        backoff_base (float): Upper bound of the first wait, in seconds.
+        backoff_max (float): Upper bound of any backoff wait, in seconds.
+        max_retry_after (float): Longest `Retry-After` honored, in seconds.
+        retry_statuses (FrozenSet[int]): HTTP statuses worth a retry.
+    """
+
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    backoff_base: float = DEFAULT_BACKOFF_BASE
+    backoff_max: float = DEFAULT_BACKOFF_MAX
+    max_retry_after: float = DEFAULT_MAX_RETRY_AFTER
+    retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES
+
+    def is_retryable_request(self, api_request: ApiRequest) -> bool:
+        """Whether a request may be sent more than once.
+
+        Args:
+            api_request (ApiRequest): The request.
+
+        Returns:
+            bool: True for GETs and for POSTs with a caller supplied `id`
+        """
+        if api_request.type == ApiRequestType.GET:
+            return True
+        if api_request.type == ApiRequestType.POST:
+            return bool((api_request.data or {}).get('id'))
+        return False
+
+    def is_retryable_error(self, error: Exception) -> bool:
+        """Whether an error is transient.
+
+        Args:
+            error (Exception): The error raised by an attempt.
+
+        Returns:
+            bool: True for transport errors and retryable statuses
+        """
+        if isinstance(error, HTTPStatusError):
+            return error.response.status_code in self.retry_statuses
+        return isinstance(error, TransportError)
+
+    def retry_after(self, error: Exception) -> Optional[float]:
+        """The `Retry-After` wait honored for an error.
+
+        Args:
+            error (Exception): The error raised by an attempt.
+
+        Returns:
+            float, optional: The wait in seconds, capped at
+            `max_retry_after`, or `None` when the error is not a 429 or 503
+            with a valid header
+        """
+        if isinstance(error, HTTPStatusError) and (
+            error.response.status_code in (429, 503)
+        ):
+            retry_after = parse_retry_after(error.response)
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        return None
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        """Seconds to wait before the next attempt.
+
+        Args:
+            attempt (int): Number of the attempt that failed, from 1.
+            error (Exception): The error raised by that attempt.
+
+        Returns:
+            float: The wait in seconds
+        """
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            return retry_after
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+class CircuitState(str, Enum):
+    """Enum for circuit breaker states."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Fail fast while the API keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are rejected with `CircuitOpenError` without being sent. After
+    `recovery_time` seconds one probe request is let through: its success
+    closes the circuit and its failure opens it again.
+
+    Only transient failures count: transport errors and retryable
+    statuses. Other client errors mean the API is healthy.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        recovery_time (float): Seconds the circuit stays open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_time: float = DEFAULT_RECOVERY_TIME,
+    ):
+        """Initialize a closed circuit."""
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.failures = 0
+        self.opened = 0
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving to half-open once the recovery time ends."""
+        with self._lock:
+            return self._current_state()
+
+    def before_request(self) -> None:
+        """Check that a request may be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with its
+                probe already in flight
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                return
+            if state == CircuitState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            retry_in = self._opened_at + self.recovery_time - time.monotonic()
+        raise CircuitOpenError(max(0.0, retry_in))
+
+    def record_success(self) -> None:
+        """Record a request that reached a healthy API."""
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                logger.info('Circuit breaker closed')
+            self._state = CircuitState.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """Give back a probe that failed before reaching the API."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a transient failure."""
+        with self._lock:
+            self.failures += 1
+            probe_failed = self._probing
+            self._probing = False
+            if probe_failed or (
+                self._state == CircuitState.CLOSED
+                and self.failures >= self.failure_threshold
+            ):
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self.opened += 1
+                logger.warning(
+                    'Circuit breaker opened after {} failures', self.failures
+                )
+
+    def _current_state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_time
+        ):
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+
+@dataclass
+class RetryStats:
+    """Counters for a `Retrier`.
+
+    Attributes:
+        requests (int): Requests sent through the retrier.
+        attempts (int): Attempts made, including retries.
+        retries (int): Attempts after the first one.
+        retry_after_waits (int): Retries that waited for `Retry-After`.
+        exhausted (int): Requests that failed after their last attempt.
+        rejected (int): Requests rejected by an open circuit.
+        backoff_seconds (float): Total time spent waiting between attempts.
+    """
+
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    retry_after_waits: int = 0
+    exhausted: int = 0
+    rejected: int = 0
+    backoff_seconds: float = 0.0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def add(self, **counts: float) -> None:
+        """Increment counters by name.
+
+        Args:
+            **counts: The increment of each counter.
+        """
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+
+class Retrier:
+    """Retry policy, circuit breaker and their metrics for one client.
+
+    Args:
+        policy (RetryPolicy, optional): When to retry. Defaults to
+            `RetryPolicy()`.
+        breaker (CircuitBreaker, optional): Shared circuit breaker. Pass
+            `None` to disable it.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """Initialize the retrier."""
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker
+        self.stats = RetryStats()
+
+    def metrics(self) -> dict:
+        """Snapshot of the retry counters and the circuit state.
+
+        Returns:
+            dict: Counter values, plus `circuit_state`, `circuit_failures`
+            and `circuit_opened` when a breaker is set
+        """
+        metrics = {
+            name: getattr(self.stats, name)
+            for name in self.stats.__dataclass_fields__
+            if not name.startswith('_')
+        }
+        if self.breaker is not None:
+            metrics['circuit_state'] = self.breaker.state.value
+            metrics['circuit_failures'] = self.breaker.failures
+            metrics['circuit_opened'] = self.breaker.opened
+        return metrics
+
+    def call(
+        self,
+        api_request: ApiRequest,
+        send: Callable[[], Response],
+    ) -> Response:
+        """Send a request, retrying transient failures.
+
+        Args:
+            api_request (ApiRequest): The request, used to decide whether
+                it may be retried.
+            send (Callable[[], Response]): Sends one attempt and raises on
+                HTTP errors.
+
+        Returns:
+            httpx.Response: The first successful response
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open, including
+                when it opens between two attempts
+            HTTPStatusError: If the last attempt failed with an HTTP error
+        """
+        self.stats.add(requests=1)
+        attempt = 1
+        error: Optional[Exception] = None
+        while True:
+            self._before_attempt(attempt, error)
+            try:
+                response = send()
+            except Exception as e:
+                wait = self._after_failure(api_request, attempt, e)
+                if wait is None:
+                    raise
+                error = e
+                time.sleep(wait)
+                attempt += 1
+                continue
+            self._after_success()
+            return response
+
+    async def acall(
+        self,
+        api_request: ApiRequest,
+        send: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """Send a request without blocking the event loop, retrying failures.
+
+        See `call`.
+
+        Args:
+            api_request (ApiRequest): The request.
+            send (Callable[[], Awaitable[Response]]): Sends one attempt.
+
+        Returns:
+            httpx.Response: The first successful response
+        """
+        self.stats.add(requests=1)
+        attempt = 1
+        error: Optional[Exception] = None
+        while True:
+            self._before_attempt(attempt, error)
+            try:
+                response = await send()
+            except Exception as e:
+                wait = self._after_failure(api_request, attempt, e)
+                if wait is None:
+                    raise
+                error = e
+                await asyncio.sleep(wait)
+                attempt += 1
+                continue
+            self._after_success()
+            return response
+
+    def _before_attempt(
+        self, attempt: int, error: Optional[Exception]
+    ) -> None:
+        if self.breaker is not None:
+            try:
+                self.breaker.before_request()
+            except CircuitOpenError as e:
+                self.stats.add(rejected=1)
+                # Keep the upstream failure of an interrupted retry visible
+                raise e from error
+        self.stats.add(attempts=1, retries=int(attempt > 1))
+
+    def _after_success(self) -> None:
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def _after_failure(
+        self, api_request: ApiRequest, attempt: int, error: Exception
+    ) -> Optional[float]:
+        transient = self.policy.is_retryable_error(error)
+        if self.breaker is not None:
+            if transient:
+                self.breaker.record_failure()
+            elif isinstance(error, HTTPStatusError):
+                self.breaker.record_success()
+            else:
+                self.breaker.release()
+
+        if not transient or not self.policy.is_retryable_request(api_request):
+            return None
+        if attempt >= self.policy.max_attempts:
+            self.stats.add(exhausted=1)
+            return None
+
+        wait = self.policy.delay(attempt, error)
+        # An unparseable header falls back to backoff and is not counted
+        honored = self.policy.retry_after(error) is not None
+        self.stats.add(backoff_seconds=wait, retry_after_waits=int(honored))
+        logger.warning(
+            'Retrying {} {} in {:.2f}s after attempt {} failed: {}',
+            api_request.type,
+            api_request.endpoint,
+            wait,
+            attempt,
+            error,
+        )
+        return wait
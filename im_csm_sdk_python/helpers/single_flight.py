@@ -0,0 +1,168 @@
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from ..helpers.authentication import canonical_params
+from ..schemas.request import ApiRequest, ApiRequestType
+
+T = TypeVar('T')
+
+
+def request_key(api_request: ApiRequest) -> Optional[str]:
+    """Identify a read request by endpoint and canonical parameters.
+
+    Args:
+        api_request (ApiRequest): The request.
+
+    Returns:
+        str, optional: The key, or `None` for requests that must not be
+        shared, i.e. anything but GET
+    """
+    if api_request.type != ApiRequestType.GET:
+        return None
+    params = canonical_params(api_request.params or {}).decode()
+    return f'{api_request.endpoint}?{params}'
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for a `SingleFlight`.
+
+    Attributes:
+        calls (int): Calls made through the group.
+        upstream (int): Calls that actually ran.
+        saved (int): Calls that joined one already in flight.
+    """
+
+    calls: int = 0
+    upstream: int = 0
+    saved: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def add(self, **counts: int) -> None:
+        """Increment counters by name.
+
+        Args:
+            **counts: The increment of each counter.
+        """
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    # Each waiter raises its own exception object, so tracebacks, notes and
+    # context added while it propagates do not leak into the other callers.
+    # `__init__` is skipped since subclasses like `httpx.HTTPStatusError`
+    # take keyword-only arguments that are not in `args`
+    copy = type(error).__new__(type(error), *error.args)
+    copy.args = error.args
+    copy.__dict__.update(error.__dict__)
+    return copy
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run identical concurrent calls once and share the outcome.
+
+    The first caller of a key runs the function; callers arriving while it
+    is in flight wait for it and get the same return value, or a copy of
+    its exception raised from the original. The copy is shallow: objects it
+    refers to, such as the `response` of an `httpx.HTTPStatusError`, are
+    shared with the other callers, as is the return value. Nothing is
+    cached once the call completes.
+    """
+
+    def __init__(self):
+        """Initialize an empty group."""
+        self.stats = SingleFlightStats()
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run `fn`, or join the call already running for `key`.
+
+        Args:
+            key (str): Identity of the call.
+            fn (Callable[[], T]): The call.
+
+        Returns:
+            T: The return value of the shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        self.stats.add(calls=1, upstream=int(leader), saved=int(not leader))
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise _copy_error(call.error) from call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Async version of `SingleFlight` for one event loop.
+
+    The shared call runs as a task, so a waiter that is cancelled does not
+    cancel it for the others. As with `SingleFlight`, callers that joined
+    get a copy of the exception of the call.
+    """
+
+    def __init__(self):
+        """Initialize an empty group."""
+        self.stats = SingleFlightStats()
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await `fn`, or join the call already running for `key`.
+
+        Args:
+            key (str): Identity of the call.
+            fn (Callable[[], Awaitable[T]]): The call.
+
+        Returns:
+            T: The return value of the shared call
+        """
+        task = self._calls.get(key)
+        leader = task is None
+        if leader:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._forget(key, task))
+        self.stats.add(calls=1, upstream=int(leader), saved=int(not leader))
+        try:
+            return await asyncio.shield(task)
+        except BaseException as e:
+            if leader or not task.done() or task.cancelled():
+                raise
+            if task.exception() is not e:
+                raise
+            raise _copy_error(e) from e
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
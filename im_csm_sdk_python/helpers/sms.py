@@ -0,0 +1,96 @@
+import math
+import re
+from dataclasses import dataclass
+from enum import Enum
+
+# GSM 03.38 default alphabet, without the escape character
+GSM7_BASIC = (
+    '@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !"#¤%&\'()*+,-./0123456789:;<=>?'
+    '¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà'
+)
+# Extension table characters, sent as an escape plus one septet
+GSM7_EXTENDED = '\f^{}\\[~]|€'
+
+GSM7_SINGLE = 160
+GSM7_MULTIPART = 153
+UCS2_SINGLE = 70
+UCS2_MULTIPART = 67
+
+_NOT_GSM7 = re.compile(f'[^{re.escape(GSM7_BASIC + GSM7_EXTENDED)}]')
+_GSM7_EXTENDED = re.compile(f'[{re.escape(GSM7_EXTENDED)}]')
+_ASTRAL = re.compile('[\U00010000-\U0010ffff]')
+
+
+class SmsEncoding(str, Enum):
+    """Enum for SMS character encodings."""
+
+    GSM7 = 'GSM-7'
+    UCS2 = 'UCS-2'
+
+
+@dataclass(frozen=True)
+class SmsInfo:
+    """Encoding and size of an SMS text.
+
+    Attributes:
+        encoding (SmsEncoding): GSM-7 if every character is in the GSM
+            alphabet, UCS-2 otherwise.
+        length (int): Septets for GSM-7, UTF-16 code units for UCS-2.
+        segments (int): Messages the text is split into.
+    """
+
+    encoding: SmsEncoding
+    length: int
+    segments: int
+
+
+def _count_segments(sizes, per_segment: int) -> int:
+    # Multi-unit characters are never split across two segments
+    segments, used = 1, 0
+    for size in sizes:
+        if used + size > per_segment:
+            segments += 1
+            used = 0
+        used += size
+    return segments
+
+
+def sms_info(text: str) -> SmsInfo:
+    """Work out the encoding and segment count of an SMS text.
+
+    Characters outside the GSM-7 alphabet, such as `á`, `í`, `ó` or emoji,
+    switch the whole text to UCS-2, which fits 70 characters per SMS
+    instead of 160.
+
+    Args:
+        text (str): The message text.
+
+    Returns:
+        SmsInfo: Encoding, length and segments
+    """
+    if _NOT_GSM7.search(text) is None:
+        extended = len(_GSM7_EXTENDED.findall(text))
+        length = len(text) + extended
+        if length <= GSM7_SINGLE:
+            return SmsInfo(SmsEncoding.GSM7, length, 1)
+        if not extended:
+            segments = math.ceil(length / GSM7_MULTIPART)
+        else:
+            segments = _count_segments(
+                (2 if char in GSM7_EXTENDED else 1 for char in text),
+                GSM7_MULTIPART,
+            )
+        return SmsInfo(SmsEncoding.GSM7, length, segments)
+
+    astral = len(_ASTRAL.findall(text))
+    length = len(text) + astral
+    if length <= UCS2_SINGLE:
+        return SmsInfo(SmsEncoding.UCS2, length, 1)
+    if not astral:
+        segments = math.ceil(length / UCS2_MULTIPART)
+    else:
+        segments = _count_segments(
+            (2 if ord(char) > 0xFFFF else 1 for char in text),
+            UCS2_MULTIPART,
+        )
+    return SmsInfo(SmsEncoding.UCS2, length, segments)
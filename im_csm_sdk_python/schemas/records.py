@@ -0,0 +1,53 @@
+from typing import Any, Dict, Tuple
+
+from .contacts import Contact
+from .messages import Message
+
+
+class Record:
+    """Lightweight slotted record built from a decoded JSON object.
+
+    Records skip validation and keep the raw JSON values. Missing fields
+    are set to `None` and unknown fields are dropped.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+
+    def __init__(self, data: Dict[str, Any]):
+        """Initialize the record from a decoded JSON object."""
+        get = data.get
+        for name in self.__slots__:
+            object.__setattr__(self, name, get(name))
+
+    def __repr__(self) -> str:
+        """Represent the record with its field values."""
+        values = ', '.join(
+            f'{name}={getattr(self, name)!r}' for name in self.__slots__
+        )
+        return f'{type(self).__name__}({values})'
+
+    def __eq__(self, other: object) -> bool:
+        """Compare records of the same type field by field."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Get the field values in declaration order."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the fields as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ContactRecord(Record):
+    """Slotted record with the fields of `Contact`."""
+
+    __slots__ = tuple(Contact.model_fields)
+
+
+class MessageRecord(Record):
+    """Slotted record with the fields of `Message`."""
+
+    __slots__ = tuple(Message.model_fields)
@@ -58,3 +58,17 @@ class ApiRequest(BaseModel):
             v = f'/{v}'
 
         return v
+
+
+class ResultMode(str, Enum):
+    """Enum for the shape of list and lookup results.
+
+    MODEL returns validated pydantic models, DICT returns the decoded JSON
+    as plain dicts and RECORD returns lightweight slotted records. DICT and
+    RECORD skip model validation and keep raw JSON values (e.g. dates stay
+    ISO strings).
+    """
+
+    MODEL = 'model'
+    DICT = 'dict'
+    RECORD = 'record'
@@ -0,0 +1,464 @@
+import bz2
+import gzip
+import json
+import lzma
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from functools import partial
+from typing import IO, Any, Dict, Iterable, List, Optional, Protocol, Union
+
+from loguru import logger
+
+from ..core.adaptive import Concurrency
+from ..core.client import CSMClient
+from ..core.pagination import iter_messages
+from ..schemas.messages import ListMessagesParams, Message
+from ..schemas.records import MessageRecord
+from ..schemas.request import ResultMode
+
+# pyarrow is imported by `_require_pyarrow` on first use
+pa: Any = None
+pq: Any = None
+
+DEFAULT_ROW_GROUP_SIZE = 20000
+
+MessageRow = Union[Message, MessageRecord, Dict[str, Any]]
+
+# gzip defaults to level 9, several times slower for little gain
+_OPENERS = {
+    'gzip': partial(gzip.open, compresslevel=6),
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
+_COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+
+class ExportFormat(str, Enum):
+    """Enum for message export file formats."""
+
+    PARQUET = 'parquet'
+    ARROW = 'arrow'
+    NDJSON = 'ndjson'
+
+    @classmethod
+    def detect(cls, path: str) -> 'ExportFormat':
+        """Guess the format from the file extension.
+
+        A compression extension such as `.gz` is skipped, so
+        `messages.ndjson.gz` is NDJSON.
+
+        Args:
+            path (str): The output file path.
+
+        Returns:
+            ExportFormat: The format
+
+        Raises:
+            ValueError: If the extension is not known
+        """
+        root, extension = os.path.splitext(path.lower())
+        if extension in _COMPRESSION_EXTENSIONS:
+            extension = os.path.splitext(root)[1]
+        if extension == '.parquet':
+            return cls.PARQUET
+        if extension in ('.arrow', '.feather', '.ipc'):
+            return cls.ARROW
+        if extension in ('.ndjson', '.jsonl'):
+            return cls.NDJSON
+        raise ValueError(f'Unknown export format for {path}')
+
+
+def _require_pyarrow() -> None:
+    global pa, pq
+    if pa is not None:
+        return
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            'Parquet and Arrow exports need pyarrow; install '
+            'im-csm-sdk-python[export]'
+        ) from e
+    pa, pq = pyarrow, pyarrow.parquet
+
+
+def _arrow_type(annotation: Any) -> 'pa.DataType':
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return pa.dictionary(pa.int32(), pa.string())
+    types = {
+        bool: pa.bool_(),
+        int: pa.int64(),
+        float: pa.float64(),
+        str: pa.string(),
+        datetime: pa.timestamp('us'),
+    }
+    if annotation not in types:
+        raise TypeError(f'No Arrow type for {annotation!r}')
+    return types[annotation]
+
+
+def message_schema() -> 'pa.Schema':
+    """Arrow schema of exported messages, derived from `Message`.
+
+    Enum fields such as `direction` are dictionary-encoded strings and
+    `created_on` is a timestamp in microseconds.
+
+    Returns:
+        pa.Schema: The schema
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    _require_pyarrow()
+    return pa.schema(
+        [
+            pa.field(name, _arrow_type(field.annotation))
+            for name, field in Message.model_fields.items()
+        ]
+    )
+
+
+def _column(rows: List[MessageRow], name: str) -> List[Any]:
+    if type(rows[0]) is dict:
+        return [row.get(name) for row in rows]
+    return [getattr(row, name, None) for row in rows]
+
+
+def _timestamps(values: List[Any], type_: 'pa.DataType') -> 'pa.Array':
+    if not any(isinstance(value, str) for value in values):
+        return pa.array(values, type_)
+    try:
+        # ISO strings without offset are parsed by Arrow in one pass
+        return pa.array(values, pa.string()).cast(type_)
+    except pa.ArrowInvalid:
+        parsed = []
+        for value in values:
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if value is not None and value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            parsed.append(value)
+        return pa.array(parsed, type_)
+
+
+def _dictionary_array(values: List[Any], known: Dict[str, int]) -> 'pa.Array':
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(None)
+            continue
+        value = getattr(value, 'value', value)
+        code = known.get(value)
+        if code is None:
+            code = known[value] = len(known)
+        codes.append(code)
+    return pa.DictionaryArray.from_arrays(
+        pa.array(codes, pa.int32()), pa.array(list(known), pa.string())
+    )
+
+
+def _to_table(
+    rows: List[MessageRow],
+    schema: 'pa.Schema',
+    dictionaries: Dict[str, Dict[str, int]],
+) -> 'pa.Table':
+    arrays = []
+    for field in schema:
+        values = _column(rows, field.name)
+        if pa.types.is_timestamp(field.type):
+            arrays.append(_timestamps(values, field.type))
+        elif pa.types.is_dictionary(field.type):
+            # Arrow IPC files allow a dictionary to grow between batches
+            # but not to be replaced, so every batch extends the last one
+            known = dictionaries.setdefault(field.name, {})
+            arrays.append(_dictionary_array(values, known))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+# A reused compact encoder is about twice as fast as `json.dumps(row)`
+_encode = json.JSONEncoder(separators=(',', ':'), default=_json_default).encode
+
+
+def _json_line(row: MessageRow) -> str:
+    if type(row) is dict:
+        return _encode(row)
+    if isinstance(row, Message):
+        return row.model_dump_json()
+    if isinstance(row, MessageRecord):
+        row = row.as_dict()
+    return _encode(row)
+
+
+class _Sink(Protocol):
+    """Writes row groups to an open file."""
+
+    def write(self, rows: List[MessageRow]) -> None:
+        """Write one row group."""
+        ...
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        ...
+
+
+class _ArrowSink:
+    def __init__(
+        self,
+        path: str,
+        export_format: ExportFormat,
+        compression: Optional[str],
+    ):
+        _require_pyarrow()
+        self.schema = message_schema()
+        self.dictionaries: Dict[str, Dict[str, int]] = {}
+        if export_format == ExportFormat.PARQUET:
+            self.writer = pq.ParquetWriter(
+                path, self.schema, compression=compression or 'snappy'
+            )
+        else:
+            self.writer = pa.ipc.new_file(
+                path,
+                self.schema,
+                options=pa.ipc.IpcWriteOptions(
+                    compression=compression, emit_dictionary_deltas=True
+                ),
+            )
+
+    def write(self, rows: List[MessageRow]) -> None:
+        self.writer.write_table(
+            _to_table(rows, self.schema, self.dictionaries)
+        )
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _NdjsonSink:
+    def __init__(self, path: str, compression: Optional[str]):
+        if compression is not None and compression not in _OPENERS:
+            raise ValueError(f'Unknown NDJSON compression {compression!r}')
+        opener = _OPENERS.get(compression, open)
+        self.file: IO[bytes] = opener(path, 'wb')
+
+    def write(self, rows: List[MessageRow]) -> None:
+        text = '\n'.join(_json_line(row) for row in rows)
+        self.file.write(text.encode() + b'\n')
+
+    def close(self) -> None:
+        self.file.close()
+
+
+@dataclass
+class ExportResult:
+    """Summary of an export.
+
+    Attributes:
+        path (str): The written file.
+        format (ExportFormat): Its format.
+        rows (int): Messages written.
+        row_groups (int): Row groups written.
+        bytes (int): Size of the file.
+        elapsed (float): Seconds spent.
+    """
+
+    path: str
+    format: ExportFormat
+    rows: int
+    row_groups: int
+    bytes: int
+    elapsed: float
+
+
+class MessageExporter:
+    """Stream messages to a Parquet, Arrow IPC or NDJSON file.
+
+    Rows are buffered until `row_group_size` are collected, then converted
+    and written as one row group, so memory is bounded by one row group
+    whatever the number of messages. The file is written under a temporary
+    name and moved into place by `close`, so readers never see a partial
+    export.
+
+    Parquet and Arrow need pyarrow. Their schema is derived from `Message`,
+    see `message_schema`. NDJSON lines carry the message fields as returned
+    by the API, optionally compressed with gzip, bz2 or xz.
+
+    Args:
+        path (str): The output file.
+        export_format (ExportFormat, optional): Defaults to detecting it
+            from the extension.
+        row_group_size (int): Rows per row group.
+        compression (str, optional): Parquet codec (default `snappy`),
+            Arrow IPC codec (`lz4` or `zstd`, default none) or NDJSON
+            compression (`gzip`, `bz2` or `xz`, default from the
+            extension).
+
+    Raises:
+        ImportError: If pyarrow is needed and not installed
+        ValueError: If the format or compression is not known
+    """
+
+    def __init__(
+        self,
+        path: str,
+        export_format: Optional[ExportFormat] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: Optional[str] = None,
+    ):
+        """Open the temporary output file."""
+        if row_group_size < 1:
+            raise ValueError('row_group_size must be at least 1')
+        self.path = path
+        self.format = export_format or ExportFormat.detect(path)
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self.row_groups = 0
+        self.result: Optional[ExportResult] = None
+        self._buffer: List[MessageRow] = []
+        self._started = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._temporary = f'{path}.tmp'
+        if self.format == ExportFormat.NDJSON:
+            if compression is None:
+                extension = os.path.splitext(path.lower())[1]
+                compression = _COMPRESSION_EXTENSIONS.get(extension)
+            self._sink: _Sink = _NdjsonSink(self._temporary, compression)
+        else:
+            self._sink = _ArrowSink(self._temporary, self.format, compression)
+
+    def __enter__(self) -> 'MessageExporter':
+        """Enter the exporter context."""
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        """Finish the export, or discard it on error."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, row: MessageRow) -> None:
+        """Add one message.
+
+        Args:
+            row (Message | MessageRecord | dict): The message.
+        """
+        self._buffer.append(row)
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def write_many(self, rows: Iterable[MessageRow]) -> None:
+        """Add a stream of messages.
+
+        Args:
+            rows (Iterable[Message | MessageRecord | dict]): The messages.
+        """
+        for row in rows:
+            self.write(row)
+
+    def flush(self) -> None:
+        """Write the buffered messages as one row group."""
+        if not self._buffer:
+            return
+        self._sink.write(self._buffer)
+        self.rows += len(self._buffer)
+        self.row_groups += 1
+        self._buffer = []
+        logger.debug('Exported {} messages to {}', self.rows, self.path)
+
+    def close(self) -> ExportResult:
+        """Write the last row group and move the file into place.
+
+        Returns:
+            ExportResult: Summary of the export
+        """
+        if self.result is not None:
+            return self.result
+        self.flush()
+        self._sink.close()
+        os.replace(self._temporary, self.path)
+        self.result = ExportResult(
+            path=self.path,
+            format=self.format,
+            rows=self.rows,
+            row_groups=self.row_groups,
+            bytes=os.path.getsize(self.path),
+            elapsed=time.monotonic() - self._started,
+        )
+        return self.result
+
+    def abort(self) -> None:
+        """Discard the export and its temporary file."""
+        self._buffer = []
+        try:
+            self._sink.close()
+        finally:
+            if os.path.exists(self._temporary):
+                os.remove(self._temporary)
+
+
+def export_messages(
+    path: str,
+    params: ListMessagesParams,
+    export_format: Optional[ExportFormat] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    compression: Optional[str] = None,
+    page_size: Optional[int] = None,
+    client: Optional[CSMClient] = None,
+    concurrency: Optional[Concurrency] = None,
+) -> ExportResult:
+    """Export the messages matching the parameters to a file.
+
+    Pages are fetched as plain dicts, skipping model validation, and
+    prefetched in the background while the previous row group is written.
+
+    Args:
+        path (str): The output file. See `MessageExporter`.
+        params (ListMessagesParams): Filters for the listing.
+        export_format (ExportFormat, optional): Defaults to detecting it
+            from the extension.
+        row_group_size (int): Rows per row group.
+        compression (str, optional): See `MessageExporter`.
+        page_size (int, optional): Number of messages per request.
+        client (CSMClient, optional): The client to use. Defaults to the
+            shared default client.
+        concurrency (int | AdaptiveLimiter, optional): Fetch up to this many
+            pages at once.
+
+    Returns:
+        ExportResult: Summary of the export
+    """
+    with MessageExporter(
+        path, export_format, row_group_size, compression
+    ) as exporter:
+        exporter.write_many(
+            iter_messages(
+                params,
+                page_size,
+                client,
+                mode=ResultMode.DICT,
+                concurrency=concurrency,
+            )
+        )
+    result = exporter.close()
+    logger.info(
+        'Exported {} messages to {} in {:.1f}s',
+        result.rows,
+        path,
+        result.elapsed,
+    )
+    return result
@@ -0,0 +1,359 @@
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+from loguru import logger
+
+from ..core.client import CSMClient, get_default_client
+from ..core.pagination import iter_messages
+from ..schemas.messages import ListMessagesParams, Message, MessageDirection
+
+DEFAULT_OVERLAP = timedelta(hours=1)
+DEFAULT_WINDOW = timedelta(days=1)
+DEFAULT_CHECKPOINT = 'default'
+
+MESSAGE_COLUMNS = tuple(Message.model_fields)
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS messages ('
+    ' message_id TEXT PRIMARY KEY,'
+    ' short_code TEXT NOT NULL,'
+    ' type INTEGER NOT NULL,'
+    ' direction TEXT NOT NULL,'
+    ' status TEXT NOT NULL,'
+    ' message TEXT NOT NULL,'
+    ' sent_count INTEGER NOT NULL,'
+    ' error_count INTEGER NOT NULL,'
+    ' total_recipients INTEGER NOT NULL,'
+    ' msisdn TEXT NOT NULL,'
+    ' country TEXT NOT NULL,'
+    ' is_billable INTEGER NOT NULL,'
+    ' is_scheduled INTEGER NOT NULL,'
+    ' created_on TEXT NOT NULL,'
+    ' created_by TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS messages_msisdn_created_on'
+    ' ON messages (msisdn, created_on)',
+    'CREATE INDEX IF NOT EXISTS messages_direction_created_on'
+    ' ON messages (direction, created_on)',
+    'CREATE INDEX IF NOT EXISTS messages_created_on ON messages (created_on)',
+    'CREATE TABLE IF NOT EXISTS checkpoints ('
+    ' name TEXT PRIMARY KEY,'
+    ' synced_until TEXT NOT NULL,'
+    ' updated_on TEXT NOT NULL)',
+)
+
+_UPSERT = (
+    f'INSERT INTO messages ({", ".join(MESSAGE_COLUMNS)})'
+    f' VALUES ({", ".join("?" for _ in MESSAGE_COLUMNS)})'
+    ' ON CONFLICT (message_id) DO UPDATE SET '
+    + ', '.join(
+        f'{column} = excluded.{column}'
+        for column in MESSAGE_COLUMNS
+        if column != 'message_id'
+    )
+    + ' WHERE '
+    + ' OR '.join(
+        f'{column} IS NOT excluded.{column}'
+        for column in MESSAGE_COLUMNS
+        if column != 'message_id'
+    )
+)
+
+
+def _utc(value: datetime) -> datetime:
+    # Checkpoints and sync bounds are naive UTC, so aware and naive dates
+    # from callers and the API can be compared
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _now() -> datetime:
+    return _utc(datetime.now(timezone.utc))
+
+
+def _row(message: Message) -> tuple:
+    values = []
+    for column in MESSAGE_COLUMNS:
+        value = getattr(message, column)
+        if isinstance(value, datetime):
+            value = _utc(value).isoformat()
+        elif isinstance(value, MessageDirection):
+            value = value.value
+        values.append(value)
+    return tuple(values)
+
+
+class MessageStore:
+    """Local SQLite mirror of the message log, keyed by `message_id`.
+
+    The database uses a WAL journal, so readers are not blocked while a
+    sync writes. Messages are indexed by msisdn, direction and
+    `created_on`. Message dates and checkpoints are stored as ISO 8601 text
+    in naive UTC, so they sort and compare in time order; naive dates are
+    taken as UTC.
+
+    Args:
+        path (str): Path of the SQLite database file.
+    """
+
+    def __init__(self, path: str):
+        """Open the database and create its tables."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not be used across a fork, so a forked child
+        # leaves the inherited one alone and opens its own
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def close(self) -> None:
+        """Close the connection of the calling thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            # A forked child drops the inherited connection without closing
+            # it, as the parent still uses it
+            if self._local.pid == os.getpid():
+                connection.close()
+            self._local.connection = None
+
+    def upsert(
+        self,
+        messages: Iterable[Message],
+        checkpoint: Optional[datetime] = None,
+        name: str = DEFAULT_CHECKPOINT,
+    ) -> int:
+        """Insert new messages and update the ones that changed.
+
+        The write and the optional checkpoint are committed together.
+
+        Args:
+            messages (Iterable[Message]): The messages to store.
+            checkpoint (datetime, optional): New high-water mark to save,
+                converted to naive UTC.
+            name (str): Name of the checkpoint.
+
+        Returns:
+            int: Number of rows inserted or updated
+        """
+        connection = self._connection()
+        with connection:
+            before = connection.total_changes
+            connection.executemany(_UPSERT, (_row(m) for m in messages))
+            written = connection.total_changes - before
+            if checkpoint is not None:
+                connection.execute(
+                    'INSERT OR REPLACE INTO checkpoints'
+                    ' (name, synced_until, updated_on) VALUES (?, ?, ?)',
+                    (
+                        name,
+                        _utc(checkpoint).isoformat(),
+                        _now().isoformat(),
+                    ),
+                )
+        return written
+
+    def get_checkpoint(
+        self, name: str = DEFAULT_CHECKPOINT
+    ) -> Optional[datetime]:
+        """Get the saved high-water mark.
+
+        Args:
+            name (str): Name of the checkpoint.
+
+        Returns:
+            datetime, optional: Messages are synced up to this naive UTC
+            date
+        """
+        row = (
+            self._connection()
+            .execute(
+                'SELECT synced_until FROM checkpoints WHERE name = ?', (name,)
+            )
+            .fetchone()
+        )
+        return _utc(datetime.fromisoformat(row[0])) if row else None
+
+    def count(self) -> int:
+        """Number of stored messages."""
+        (count,) = (
+            self._connection()
+            .execute('SELECT COUNT(*) FROM messages')
+            .fetchone()
+        )
+        return count
+
+    def query(
+        self,
+        msisdn: Optional[str] = None,
+        direction: Optional[MessageDirection] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Message]:
+        """Query stored messages through the indexes.
+
+        Args:
+            msisdn (str, optional): Only messages of this phone number.
+            direction (MessageDirection, optional): Only MT or MO messages.
+            since (datetime, optional): Messages created at or after. Naive
+                dates are taken as UTC.
+            until (datetime, optional): Messages created before.
+            limit (int, optional): Maximum number of messages.
+
+        Returns:
+            List[Message]: The messages, ordered by `created_on`
+        """
+        conditions = []
+        values = []
+        if msisdn is not None:
+            conditions.append('msisdn = ?')
+            values.append(msisdn)
+        if direction is not None and direction != MessageDirection.ALL:
+            conditions.append('direction = ?')
+            values.append(MessageDirection(direction).value)
+        if since is not None:
+            conditions.append('created_on >= ?')
+            values.append(_utc(since).isoformat())
+        if until is not None:
+            conditions.append('created_on < ?')
+            values.append(_utc(until).isoformat())
+
+        sql = f'SELECT {", ".join(MESSAGE_COLUMNS)} FROM messages'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY created_on'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            values.append(limit)
+
+        rows = self._connection().execute(sql, values).fetchall()
+        return [
+            Message.model_validate(dict(zip(MESSAGE_COLUMNS, row)))
+            for row in rows
+        ]
+
+
+@dataclass
+class SyncResult:
+    """Outcome of a `sync_messages` run.
+
+    Attributes:
+        fetched (int): Messages downloaded from the API.
+        written (int): Rows inserted or updated in the store.
+        windows (int): Time windows completed and checkpointed.
+        synced_until (datetime, optional): The saved high-water mark, the
+            newest `created_on` synced, in naive UTC.
+    """
+
+    fetched: int = 0
+    written: int = 0
+    windows: int = 0
+    synced_until: Optional[datetime] = None
+
+
+def sync_messages(
+    store: MessageStore,
+    params: Optional[ListMessagesParams] = None,
+    until: Optional[datetime] = None,
+    overlap: timedelta = DEFAULT_OVERLAP,
+    window: timedelta = DEFAULT_WINDOW,
+    page_size: Optional[int] = None,
+    name: str = DEFAULT_CHECKPOINT,
+    client: Optional[CSMClient] = None,
+) -> SyncResult:
+    """Mirror new and updated messages into a local store.
+
+    The run starts `overlap` before the saved checkpoint, to pick up late
+    delivery-status updates, and walks to `until` in time windows. Each
+    window is upserted and checkpointed in one transaction, so an
+    interrupted run resumes from the last completed window.
+
+    The checkpoint is the newest `created_on` stored, not the end of the
+    window, so messages the API has not listed yet for the last window
+    are fetched again by the next run. Aware dates are converted to naive
+    UTC; naive dates are taken as UTC.
+
+    Args:
+        store (MessageStore): The local store.
+        params (ListMessagesParams, optional): Filters for the listing. Its
+            `start_date` is where the first run starts; it is required when
+            the store has no checkpoint yet.
+        until (datetime, optional): End of the sync. Defaults to now, in
+            UTC.
+        overlap (timedelta): How far before the checkpoint to re-fetch.
+        window (timedelta): Length of each checkpointed window.
+        page_size (int, optional): Number of messages per request.
+        name (str): Name of the checkpoint, to keep several syncs apart.
+        client (CSMClient, optional): The client to use. Defaults to the
+            shared default client.
+
+    Returns:
+        SyncResult: Counters and the new high-water mark
+
+    Raises:
+        ValueError: If there is no checkpoint and no start_date
+    """
+    params = params or ListMessagesParams()
+    client = client or get_default_client()
+    until = _utc(until) if until is not None else _now()
+    start_date = _utc(params.start_date) if params.start_date else None
+
+    checkpoint = store.get_checkpoint(name)
+    if checkpoint is not None:
+        start = checkpoint - overlap
+        if start_date is not None:
+            start = max(start, start_date)
+    elif start_date is not None:
+        start = start_date
+    else:
+        raise ValueError('start_date is required for the first sync')
+
+    result = SyncResult(synced_until=checkpoint)
+    logger.info('Sync messages {} from {} to {}', name, start, until)
+
+    while start < until:
+        end = min(start + window, until)
+        messages = list(
+            iter_messages(
+                params.model_copy(
+                    update={'start_date': start, 'end_date': end, 'start': 0}
+                ),
+                page_size=page_size,
+                client=client,
+            )
+        )
+        newest = max(
+            (_utc(message.created_on) for message in messages), default=start
+        )
+        # Never move the high-water mark back while re-fetching the overlap
+        synced_until = result.synced_until
+        if synced_until is None or newest > synced_until:
+            synced_until = newest
+        result.fetched += len(messages)
+        result.written += store.upsert(
+            messages, checkpoint=synced_until, name=name
+        )
+        result.windows += 1
+        result.synced_until = synced_until
+        logger.debug('Synced {} messages up to {}', len(messages), end)
+        start = end
+
+    return result
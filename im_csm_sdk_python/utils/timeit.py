@@ -1,20 +1,550 @@
+import asyncio
+import contextvars
+import importlib
+import inspect
+import random
+import sys
+import threading
 import time
-from datetime import timedelta
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from functools import wraps
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-from humanize import precisedelta
-from loguru import logger
+DEFAULT_MAX_SAMPLES = 10000
 
+# The SDK functions instrumented by `Profiler.start`, as `module:attribute`
+HOT_PATHS = (
+    'im_csm_sdk_python.helpers.authentication:authorization',
+    'im_csm_sdk_python.helpers.authentication:Signer.sign',
+    'im_csm_sdk_python.helpers.authentication:Signer.sign_encoded',
+    'im_csm_sdk_python.helpers.prepared:encode_json',
+    'im_csm_sdk_python.helpers.api_request:build_request',
+    'im_csm_sdk_python.helpers.api_request:send_request',
+    'im_csm_sdk_python.helpers.api_request:async_send_request',
+    'im_csm_sdk_python.core.adapters:decode_response',
+    'im_csm_sdk_python.core.adapters:ta_contacts.validate_json',
+    'im_csm_sdk_python.core.adapters:ta_contact.validate_json',
+    'im_csm_sdk_python.core.adapters:ta_messages.validate_json',
+    'im_csm_sdk_python.core.adapters:ta_message.validate_json',
+    'im_csm_sdk_python.core.adapters:'
+    'ta_send_to_contact_response.validate_json',
+    'im_csm_sdk_python.core.adapters:ta_send_to_tags_response.validate_json',
+    'im_csm_sdk_python.core.endpoints:decode',
+    'im_csm_sdk_python.core.pagination:iter_pages',
+    'im_csm_sdk_python.core.pagination:aiter_pages',
+)
 
-def timeit(func):  # noqa: D103
-    @wraps(func)
-    def timeit_wrapper(*args, **kwargs):
-        start_time = time.perf_counter()
-        result = func(*args, **kwargs)
-        end_time = time.perf_counter()
-        total_time = end_time - start_time
-        human_time = precisedelta(timedelta(seconds=total_time))
-        logger.debug(f'Function {func.__name__} Took {human_time}')
-        return result
+_PACKAGE = __name__.split('.')[0]
 
-    return timeit_wrapper
+
+def _owner() -> Any:
+    # The task or thread a call runs in. Only a call's own time can be taken
+    # out of its caller's self time, not that of work it left running in a
+    # pool thread or another task
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return threading.get_ident()
+
+
+class _Frame:
+    __slots__ = ('name', 'child', 'owner')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.child = 0.0
+        self.owner = _owner()
+
+
+# Profiled calls in progress in the current thread or task, as a tuple of
+# frames, or None outside of them
+_stack = contextvars.ContextVar('profile_stack', default=None)
+
+
+@dataclass
+class FunctionStats:
+    """Calls and timings of one profiled function.
+
+    Attributes:
+        name (str): The function name.
+        calls (int): Calls made while profiling.
+        sampled (int): Calls that were timed.
+        total (float): Seconds spent in the timed calls.
+        max (float): Longest timed call, in seconds.
+        samples (List[float]): Durations of up to `max_samples` timed
+            calls, a uniform sample of all of them.
+    """
+
+    name: str
+    calls: int = 0
+    sampled: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    samples: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def mean(self) -> float:
+        """Mean duration of the timed calls, in seconds."""
+        return self.total / self.sampled if self.sampled else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Duration below which a share of the timed calls finished.
+
+        Args:
+            q (float): The share, between 0 and 100.
+
+        Returns:
+            float: The duration in seconds, or 0.0 without samples
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+
+class Profiler:
+    """Low-overhead sampling profiler for the SDK's hot paths.
+
+    `start` wraps the functions of `HOT_PATHS`, replacing them in every
+    SDK module that imported them, and `stop` puts the originals back, so
+    the SDK pays nothing while it is not profiling. Every call is counted
+    and one in `sample_every` top-level calls is timed, together with the
+    profiled calls nested in it. Generators are timed over their whole
+    iteration, leaving out the time spent by the consumer.
+
+    Calls made in threads or tasks started with a copy of the caller's
+    context, like the page prefetching of `iter_pages`, are stacked under
+    the profiled call that started them. Their time is not taken out of
+    that call's self time, which is wall-clock time and includes waiting
+    for them. Threads started without the context, e.g. the workers of
+    `send_many`, show their calls as roots.
+
+    Args:
+        sample_every (int): Time one in this many top-level calls.
+        max_samples (int): Durations kept per function for percentiles.
+    """
+
+    def __init__(
+        self,
+        sample_every: int = 1,
+        max_samples: int = DEFAULT_MAX_SAMPLES,
+    ):
+        """Initialize a stopped profiler."""
+        if sample_every < 1:
+            raise ValueError('sample_every must be at least 1')
+        self.sample_every = sample_every
+        self.max_samples = max_samples
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._patches: List[Tuple[Any, str, Any, bool]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop every measurement."""
+        with self._lock:
+            self.stats: Dict[str, FunctionStats] = {}
+            self._stacks: Dict[str, float] = {}
+
+    def _stats(self, name: str) -> FunctionStats:
+        stats = self.stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.stats.setdefault(name, FunctionStats(name))
+        return stats
+
+    def _sampled(self, stats: FunctionStats) -> bool:
+        with self._lock:
+            stats.calls += 1
+            calls = stats.calls
+        return _stack.get() is not None or calls % self.sample_every == 0
+
+    def _record(
+        self,
+        stats: Optional[FunctionStats],
+        stack: Tuple[_Frame, ...],
+        elapsed: float,
+    ) -> None:
+        # Self time of the stack, and the call duration unless it is one
+        # step of a generator
+        frame = stack[-1]
+        key = ';'.join(f.name for f in stack)
+        with self._lock:
+            self._stacks[key] = (
+                self._stacks.get(key, 0.0) + elapsed - frame.child
+            )
+            if stats is not None:
+                self._sample(stats, elapsed)
+
+    def _sample(self, stats: FunctionStats, elapsed: float) -> None:
+        stats.sampled += 1
+        stats.total += elapsed
+        if elapsed > stats.max:
+            stats.max = elapsed
+        if len(stats.samples) < self.max_samples:
+            stats.samples.append(elapsed)
+        else:
+            index = random.randrange(stats.sampled)
+            if index < self.max_samples:
+                stats.samples[index] = elapsed
+
+    def _push(self, name: str) -> Tuple[Tuple[_Frame, ...], Any]:
+        stack = (_stack.get() or ()) + (_Frame(name),)
+        return stack, _stack.set(stack)
+
+    def _pop(self, stack: Tuple[_Frame, ...], token: Any, elapsed: float):
+        _stack.reset(token)
+        if len(stack) > 1 and stack[-2].owner == stack[-1].owner:
+            stack[-2].child += elapsed
+
+    def wrap(self, func: Callable, name: Optional[str] = None) -> Callable:
+        """Wrap a function to profile its calls while enabled.
+
+        Functions, coroutine functions, generators and async generators
+        are supported.
+
+        Args:
+            func (Callable): The function.
+            name (str, optional): Name in the report. Defaults to the
+                function's qualified name.
+
+        Returns:
+            Callable: The wrapper
+        """
+        name = name or getattr(func, '__qualname__', repr(func))
+        profiler = self
+
+        if inspect.isasyncgenfunction(func):
+
+            @wraps(func)
+            def agen_wrapper(*args, **kwargs):
+                iterator = func(*args, **kwargs)
+                if not profiler.enabled:
+                    return iterator
+                stats = profiler._stats(name)
+                if not profiler._sampled(stats):
+                    return iterator
+                return _ProfiledAsyncIterator(profiler, stats, iterator)
+
+            return agen_wrapper
+
+        if inspect.isgeneratorfunction(func):
+
+            @wraps(func)
+            def gen_wrapper(*args, **kwargs):
+                iterator = func(*args, **kwargs)
+                if not profiler.enabled:
+                    return iterator
+                stats = profiler._stats(name)
+                if not profiler._sampled(stats):
+                    return iterator
+                return _ProfiledIterator(profiler, stats, iterator)
+
+            return gen_wrapper
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not profiler.enabled:
+                    return await func(*args, **kwargs)
+                stats = profiler._stats(name)
+                if not profiler._sampled(stats):
+                    return await func(*args, **kwargs)
+                stack, token = profiler._push(name)
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    elapsed = time.perf_counter() - start
+                    profiler._pop(stack, token, elapsed)
+                    profiler._record(stats, stack, elapsed)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            stats = profiler._stats(name)
+            if not profiler._sampled(stats):
+                return func(*args, **kwargs)
+            stack, token = profiler._push(name)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                profiler._pop(stack, token, elapsed)
+                profiler._record(stats, stack, elapsed)
+
+        return wrapper
+
+    def instrument(self, targets: Iterable[str] = HOT_PATHS) -> None:
+        """Wrap functions in place, where they are defined and imported.
+
+        Args:
+            targets (Iterable[str]): The functions, as `module:attribute`,
+                e.g. `im_csm_sdk_python.helpers.authentication:Signer.sign`.
+        """
+        for target in targets:
+            module_name, _, path = target.partition(':')
+            owner: Any = importlib.import_module(module_name)
+            *parents, attr = path.split('.')
+            for parent in parents:
+                owner = getattr(owner, parent)
+            original = getattr(owner, attr)
+            if getattr(original, '__profiled__', None) is self:
+                continue
+
+            wrapper = self.wrap(original, path)
+            wrapper.__profiled__ = self
+            self._patch(owner, attr, wrapper)
+            if not parents:
+                # Modules that imported the function hold their own reference
+                for name, module in list(sys.modules.items()):
+                    if (
+                        name.partition('.')[0] == _PACKAGE
+                        and module is not owner
+                        and vars(module).get(attr) is original
+                    ):
+                        self._patch(module, attr, wrapper)
+
+    def _patch(self, owner: Any, attr: str, wrapper: Callable) -> None:
+        own = attr in vars(owner)
+        self._patches.append((owner, attr, vars(owner).get(attr), own))
+        setattr(owner, attr, wrapper)
+
+    def uninstrument(self) -> None:
+        """Put back every function replaced by `instrument`."""
+        while self._patches:
+            owner, attr, original, own = self._patches.pop()
+            if own:
+                setattr(owner, attr, original)
+            else:
+                delattr(owner, attr)
+
+    def start(
+        self,
+        sample_every: Optional[int] = None,
+        targets: Iterable[str] = HOT_PATHS,
+    ) -> None:
+        """Instrument the hot paths and start profiling.
+
+        Args:
+            sample_every (int, optional): Time one in this many top-level
+                calls. Defaults to the current setting.
+            targets (Iterable[str]): The functions to instrument.
+        """
+        if sample_every is not None:
+            if sample_every < 1:
+                raise ValueError('sample_every must be at least 1')
+            self.sample_every = sample_every
+        self.instrument(targets)
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stop profiling and restore the instrumented functions."""
+        self.enabled = False
+        self.uninstrument()
+
+    @contextmanager
+    def profile(
+        self,
+        sample_every: Optional[int] = None,
+        targets: Iterable[str] = HOT_PATHS,
+    ) -> Iterator['Profiler']:
+        """Profile the hot paths inside a `with` block.
+
+        Args:
+            sample_every (int, optional): Time one in this many top-level
+                calls.
+            targets (Iterable[str]): The functions to instrument.
+
+        Yields:
+            Profiler: This profiler
+        """
+        self.start(sample_every, targets)
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def report(self, percentiles: Tuple[float, ...] = (50, 90, 99)) -> str:
+        """Format the call counts and timings, slowest total first.
+
+        Args:
+            percentiles (Tuple[float, ...]): Percentiles to show.
+
+        Returns:
+            str: A text table, with durations in microseconds
+        """
+        with self._lock:
+            rows = sorted(
+                self.stats.values(), key=lambda s: s.total, reverse=True
+            )
+            width = max([len(s.name) for s in rows] + [8])
+            header = (
+                f'{"function":<{width}}{"calls":>10}{"sampled":>10}'
+                f'{"total ms":>12}{"mean us":>10}'
+                + ''.join(f'{f"p{q:g} us":>10}' for q in percentiles)
+                + f'{"max us":>10}'
+            )
+            lines = [header]
+            for s in rows:
+                lines.append(
+                    f'{s.name:<{width}}{s.calls:>10}{s.sampled:>10}'
+                    f'{s.total * 1e3:>12.2f}{s.mean * 1e6:>10.1f}'
+                    + ''.join(
+                        f'{s.percentile(q) * 1e6:>10.1f}' for q in percentiles
+                    )
+                    + f'{s.max * 1e6:>10.1f}'
+                )
+        return '\n'.join(lines)
+
+    def collapsed(self) -> str:
+        """Format the self time of each stack for flame graph tools.
+
+        Each line is a `;` separated stack of profiled functions and its
+        self time in microseconds, the input of `flamegraph.pl` and
+        speedscope.
+
+        Returns:
+            str: The collapsed stacks
+        """
+        with self._lock:
+            items = sorted(self._stacks.items())
+        return ''.join(
+            f'{stack} {round(seconds * 1e6)}\n' for stack, seconds in items
+        )
+
+    def write_collapsed(self, path: str) -> None:
+        """Write the collapsed stacks to a file.
+
+        Args:
+            path (str): The file path.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.collapsed())
+
+
+class _ProfiledIterator:
+    """Times the steps of a generator, excluding the consumer's time."""
+
+    def __init__(
+        self, profiler: Profiler, stats: FunctionStats, iterator: Iterator
+    ):
+        self.profiler = profiler
+        self.name = stats.name
+        self.stats: Optional[FunctionStats] = stats
+        self.iterator = iterator
+        self.elapsed = 0.0
+        self.done = False
+
+    def __iter__(self) -> '_ProfiledIterator':
+        return self
+
+    def __next__(self) -> Any:
+        stack, token = self.profiler._push(self.name)
+        start = time.perf_counter()
+        try:
+            return next(self.iterator)
+        except StopIteration:
+            self.done = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.elapsed += elapsed
+            self.profiler._pop(stack, token, elapsed)
+            self.profiler._record(None, stack, elapsed)
+            if self.done:
+                self._finish()
+
+    def _finish(self) -> None:
+        if self.stats is not None:
+            with self.profiler._lock:
+                self.profiler._sample(self.stats, self.elapsed)
+            self.stats = None
+
+    def close(self) -> None:
+        self.iterator.close()
+        self._finish()
+
+    def __del__(self) -> None:
+        # A loop left early still counts the steps it took
+        self._finish()
+
+
+class _ProfiledAsyncIterator:
+    """Times the steps of an async generator. See `_ProfiledIterator`."""
+
+    def __init__(
+        self,
+        profiler: Profiler,
+        stats: FunctionStats,
+        iterator: AsyncIterator,
+    ):
+        self.profiler = profiler
+        self.name = stats.name
+        self.stats: Optional[FunctionStats] = stats
+        self.iterator = iterator
+        self.elapsed = 0.0
+        self.done = False
+
+    def __aiter__(self) -> '_ProfiledAsyncIterator':
+        return self
+
+    async def __anext__(self) -> Any:
+        stack, token = self.profiler._push(self.name)
+        start = time.perf_counter()
+        try:
+            return await self.iterator.__anext__()
+        except StopAsyncIteration:
+            self.done = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.elapsed += elapsed
+            self.profiler._pop(stack, token, elapsed)
+            self.profiler._record(None, stack, elapsed)
+            if self.done:
+                self._finish()
+
+    _finish = _ProfiledIterator._finish
+
+    async def aclose(self) -> None:
+        await self.iterator.aclose()
+        self._finish()
+
+    def __del__(self) -> None:
+        self._finish()
+
+
+profiler = Profiler()
+
+
+def timeit(func: Callable) -> Callable:
+    """Profile a function with the SDK `profiler` while it is enabled.
+
+    Calls are aggregated into `profiler.stats` instead of being logged one
+    by one. While the profiler is stopped the decorated function runs as
+    is, behind a single flag check.
+
+    Args:
+        func (Callable): The function, coroutine function or generator.
+
+    Returns:
+        Callable: The wrapper
+    """
+    return profiler.wrap(func)
@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Settings are read on first use, and the logger adds its file sink on
+# import, so both are pointed away from the working tree before the SDK
+# is imported by any test module.
+os.environ.setdefault(
+    'LOG_PATH', os.path.join(tempfile.gettempdir(), 'csm-sdk-tests.log')
+)
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('API_KEY', 'test_api_key')
+os.environ.setdefault('API_SECRET', 'test_api_secret')
+os.environ.setdefault('URL', 'https://csm.mock/')
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from benchmarks.mock_server import (  # noqa: E402
+    BASE_URL,
+    MockCSMServer,
+    message_payload,
+)
+from im_csm_sdk_python import AsyncCSMClient, CSMClient  # noqa: E402
+
+API_KEY = os.environ['API_KEY']
+API_SECRET = os.environ['API_SECRET']
+
+TOTAL = 120  # dated messages, one every 30 seconds: one hour in all
+
+
+@pytest.fixture
+def server() -> MockCSMServer:
+    """An in-memory CSM API with 250 contacts and messages."""
+    return MockCSMServer(total=250)
+
+
+@pytest.fixture
+def client(server: MockCSMServer):
+    """A client of the mock server, without retries."""
+    with CSMClient(
+        API_KEY, API_SECRET, BASE_URL, transport=server.transport()
+    ) as client:
+        yield client
+
+
+def make_client(handler, **options) -> CSMClient:
+    """Build a client answering every request with `handler`."""
+    return CSMClient(
+        API_KEY,
+        API_SECRET,
+        BASE_URL,
+        transport=httpx.MockTransport(handler),
+        **options,
+    )
+
+
+def make_async_client(handler, **options) -> AsyncCSMClient:
+    """Build an async client answering every request with `handler`."""
+    return AsyncCSMClient(
+        API_KEY,
+        API_SECRET,
+        BASE_URL,
+        transport=httpx.MockTransport(handler),
+        **options,
+    )
+
+
+class DatedServer:
+    """Serve the mock message log filtered by `start_date`/`end_date`.
+
+    Both bounds are inclusive, like the API, so a message on a window
+    boundary is listed by both windows.
+    """
+
+    def __init__(self, slow_start=None, delay=0.0):
+        """Delay the window starting at `slow_start` by `delay` seconds."""
+        self.rows = [message_payload(i) for i in range(TOTAL)]
+        self.slow_start = slow_start
+        self.delay = delay
+        self.windows = set()
+        self.seen_while_slow = None
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        """Answer one listing request."""
+        params = request.url.params
+        start_date = datetime.fromisoformat(params['start_date'])
+        end_date = datetime.fromisoformat(params['end_date'])
+        with self.lock:
+            self.windows.add(start_date)
+        if start_date == self.slow_start:
+            time.sleep(self.delay)
+            with self.lock:
+                self.seen_while_slow = len(self.windows)
+        rows = [
+            row
+            for row in self.rows
+            if start_date
+            <= datetime.fromisoformat(row['created_on'])
+            <= end_date
+        ]
+        start = max(int(params['start']), 0)
+        page = rows[start : start + int(params['limit'])]
+        return httpx.Response(200, content=json.dumps(page).encode())
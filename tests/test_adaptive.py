@@ -0,0 +1,208 @@
+import asyncio
+
+import httpx
+import pytest
+
+from im_csm_sdk_python import (
+    AdaptiveLimiter,
+    AdaptiveLimiters,
+    BulkStats,
+    CircuitOpenError,
+    asend_many,
+)
+from im_csm_sdk_python.core.adaptive import (
+    MIN_WINDOW_SAMPLES,
+    as_limiter,
+    is_overload,
+)
+from im_csm_sdk_python.schemas.messages import (
+    SendToContactData,
+    SendToContactResponse,
+)
+
+
+class SlowAsyncClient:
+    """Stands in for `AsyncCSMClient`, answering sends after a delay.
+
+    The first payload, `50231240000`, is answered at once.
+    """
+
+    def __init__(self, delay: float):
+        """Initialize the client."""
+        self.delay = delay
+
+    async def send_to_contact(self, data: SendToContactData):
+        """Answer a send after the delay."""
+        if data.msisdn != '50231240000':
+            await asyncio.sleep(self.delay)
+        return SendToContactResponse.model_construct(msisdn=data.msisdn)
+
+
+def payloads(count: int):
+    """Build `count` distinct payloads."""
+    return [
+        SendToContactData(msisdn=f'5023124{i:04d}', message='hola')
+        for i in range(count)
+    ]
+
+
+def test_asend_many_returns_slots_when_closed_early():
+    """Closing the stream gives back the slots of the cancelled sends."""
+    limiter = AdaptiveLimiter(initial=8)
+
+    async def main():
+        stream = asend_many(
+            payloads(20),
+            client=SlowAsyncClient(1.0),
+            concurrency=limiter,
+        )
+        await stream.__anext__()
+        assert limiter.in_flight == 7
+        await stream.aclose()
+
+    asyncio.run(main())
+    assert limiter.in_flight == 0
+
+
+def test_asend_many_returns_slots_when_consumer_is_cancelled():
+    """Cancelling the consuming task gives back every slot."""
+    limiter = AdaptiveLimiter(initial=8)
+
+    async def consume():
+        async for _ in asend_many(
+            payloads(20), client=SlowAsyncClient(1.0), concurrency=limiter
+        ):
+            pass
+
+    async def main():
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.05)
+        assert limiter.in_flight == 8
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+    assert limiter.in_flight == 0
+
+
+def test_asend_many_sends_everything_with_a_shared_limiter():
+    """A limiter reused after an early close still runs a full send."""
+    limiter = AdaptiveLimiter(initial=4, max_limit=4)
+    client = SlowAsyncClient(0.001)
+
+    async def main():
+        stream = asend_many(payloads(10), client=client, concurrency=limiter)
+        await stream.__anext__()
+        await stream.aclose()
+
+        stats = BulkStats()
+        results = [
+            result
+            async for result in asend_many(
+                payloads(30), client=client, concurrency=limiter, stats=stats
+            )
+        ]
+        return results, stats
+
+    results, stats = asyncio.run(main())
+    assert len(results) == 30
+    assert stats.succeeded == 30
+    assert limiter.in_flight == 0
+
+
+def run_window(limiter, latency=0.01, overloads=0, in_flight=None):
+    """Complete one window of requests, `in_flight` at a time."""
+    in_flight = in_flight or limiter.limit
+    samples = max(limiter.limit, MIN_WINDOW_SAMPLES)
+    done = 0
+    while done < samples:
+        batch = min(in_flight, samples - done)
+        for _ in range(batch):
+            assert limiter.try_acquire()
+        for _ in range(batch):
+            limiter.release(latency, overloaded=done < overloads)
+            done += 1
+
+
+def test_healthy_saturated_windows_raise_the_limit():
+    """The limit grows additively while the whole limit is in use."""
+    limiter = AdaptiveLimiter(initial=10, max_limit=12)
+    for _ in range(4):
+        run_window(limiter)
+
+    assert limiter.limit == 12
+    assert [a.reason for a in limiter.history] == ['increase'] * 2
+
+
+def test_unsaturated_windows_keep_the_limit():
+    """A window that never used the whole limit does not raise it."""
+    limiter = AdaptiveLimiter(initial=10)
+    run_window(limiter, in_flight=5)
+    assert limiter.limit == 10
+
+
+def test_overloads_cut_the_limit():
+    """Too many 429/5xx responses shrink the limit multiplicatively."""
+    limiter = AdaptiveLimiter(initial=20, min_limit=5)
+    run_window(limiter, overloads=2)
+    assert limiter.limit == 14
+    run_window(limiter, overloads=20)
+    run_window(limiter, overloads=20)
+    run_window(limiter, overloads=20)
+
+    assert limiter.limit == 5
+    assert limiter.history[0].error_rate == pytest.approx(0.1)
+
+
+def test_latency_spikes_cut_the_limit():
+    """A p90 above the tolerated ratio of the baseline shrinks the limit."""
+    limiter = AdaptiveLimiter(initial=10)
+    run_window(limiter, latency=0.01)
+    run_window(limiter, latency=0.05)
+
+    assert limiter.limit == 7
+    assert limiter.history[-1].reason == 'latency'
+    assert limiter.baseline == pytest.approx(0.01 + 0.04 * 0.05)
+
+
+def test_fixed_limiters_never_adapt():
+    """A fixed limiter blocks at its limit whatever the responses."""
+    limiter = AdaptiveLimiter.fixed(3)
+    run_window(limiter, overloads=20)
+    run_window(limiter)
+
+    assert limiter.limit == 3
+    assert [limiter.try_acquire() for _ in range(4)] == [True] * 3 + [False]
+    assert not limiter.acquire(timeout=0.01)
+    limiter.cancel()
+    assert limiter.acquire(timeout=0.01)
+
+
+def test_overload_signals():
+    """Only 429, 5xx, timeouts and an open circuit are overloads."""
+    request = httpx.Request('GET', 'https://csm.mock/status')
+
+    def status(code):
+        response = httpx.Response(code, request=request)
+        return httpx.HTTPStatusError('', request=request, response=response)
+
+    assert is_overload(status(429))
+    assert is_overload(status(503))
+    assert not is_overload(status(404))
+    assert is_overload(httpx.ReadTimeout('', request=request))
+    assert is_overload(CircuitOpenError(1.0))
+    assert not is_overload(None)
+
+
+def test_each_endpoint_gets_its_own_limiter():
+    """Limiters are created per endpoint with the shared defaults."""
+    limiters = AdaptiveLimiters(initial=4)
+    send = limiters.get('/messages/send_to_contact')
+
+    assert limiters.get('messages/send_to_contact') is send
+    assert limiters.get('contacts') is not send
+    assert limiters.limits() == {'messages/send_to_contact': 4, 'contacts': 4}
+    assert as_limiter(send) is send
+    assert as_limiter(5).limit == 5
+    with pytest.raises(ValueError):
+        as_limiter(0)
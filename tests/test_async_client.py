@@ -0,0 +1,91 @@
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import contact_payload
+from im_csm_sdk_python import CSMClient
+from im_csm_sdk_python.schemas.contacts import ListContactsParams
+from im_csm_sdk_python.schemas.messages import (
+    ListMessagesParams,
+    SendToContactData,
+    SendToTagsData,
+)
+
+from .conftest import make_async_client
+
+
+def test_async_results_match_the_sync_client(server):
+    """Every operation decodes the same models as `CSMClient`."""
+    contacts = ListContactsParams(start=3, limit=4)
+    messages = ListMessagesParams(start=5, limit=6)
+    to_contact = SendToContactData(msisdn='50212345678', message='Hola')
+    to_tags = SendToTagsData(tags=['vip'], message='Hola')
+
+    async def main():
+        async with make_async_client(server.respond) as client:
+            return await asyncio.gather(
+                client.get_status(),
+                client.list_contacts(contacts),
+                client.get_contact(contact_payload(0)['msisdn']),
+                client.list_messages(messages),
+                client.send_to_contact(to_contact),
+                client.send_to_tags(to_tags),
+            )
+
+    results = asyncio.run(main())
+
+    with CSMClient(transport=httpx.MockTransport(server.respond)) as client:
+        assert results == [
+            client.get_status(),
+            client.list_contacts(contacts),
+            client.get_contact(contact_payload(0)['msisdn']),
+            client.list_messages(messages),
+            client.send_to_contact(to_contact),
+            client.send_to_tags(to_tags),
+        ]
+
+
+def test_requests_run_concurrently_on_one_loop(server):
+    """Requests awaiting the network do not block each other."""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return server.respond(request)
+
+    async def main():
+        async with make_async_client(handler) as client:
+            return await asyncio.gather(
+                *(
+                    client.list_contacts(ListContactsParams(start=i, limit=1))
+                    for i in range(20)
+                )
+            )
+
+    pages = asyncio.run(main())
+
+    assert [page[0].msisdn for page in pages] == [
+        contact_payload(i)['msisdn'] for i in range(20)
+    ]
+    assert peak == 20
+
+
+def test_errors_are_raised_from_the_coroutine():
+    """HTTP errors surface as `httpx.HTTPStatusError`."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, json={'error': 'boom'})
+
+    async def main():
+        async with make_async_client(handler) as client:
+            await client.get_status()
+
+    with pytest.raises(httpx.HTTPStatusError) as info:
+        asyncio.run(main())
+    assert info.value.response.status_code == 500
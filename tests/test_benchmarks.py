@@ -0,0 +1,93 @@
+import json
+
+import httpx
+import pytest
+
+from benchmarks import bench_client
+from benchmarks.mock_server import (
+    BASE_URL,
+    MockCSMServer,
+    contact_payload,
+    send_payload,
+)
+
+
+def test_mock_server_requires_signed_requests():
+    """Requests without `Date` and `Authorization` get a 401."""
+    server = MockCSMServer(total=10)
+    with httpx.Client(transport=server.transport()) as http:
+        response = http.get(f'{BASE_URL}api/rest/status')
+    assert response.status_code == 401
+
+
+def test_mock_server_routes(server):
+    """Pages honour `start`/`limit` and unknown routes are 404."""
+    headers = {'Date': 'now', 'Authorization': 'IM key:signature'}
+    with httpx.Client(transport=server.transport(), headers=headers) as http:
+        page = http.get(
+            f'{BASE_URL}api/rest/contacts', params={'start': 248, 'limit': 5}
+        )
+        missing = http.get(f'{BASE_URL}api/rest/unknown')
+
+    assert page.json() == [contact_payload(248), contact_payload(249)]
+    assert missing.status_code == 404
+    assert send_payload({'id': 'x'}, tags=True)['id'] == 'x'
+    assert 'msisdn' not in send_payload({}, tags=True)
+
+
+def test_every_case_runs_against_the_mock_server(client):
+    """The benchmark cases are valid calls of the client."""
+    for name, case in bench_client.CASES.items():
+        assert case(client) is not None, name
+
+    metrics = bench_client.measure_latency(
+        client, bench_client.CASES['get_status'], 20
+    )
+    assert set(metrics) == {'rps', 'p50_us', 'p99_us'}
+    assert metrics['p50_us'] <= metrics['p99_us']
+    assert (
+        bench_client.measure_allocations(
+            client, bench_client.CASES['get_contact'], 5
+        )
+        > 0
+    )
+
+
+def test_best_keeps_the_best_value_of_each_metric():
+    """`rps` is maximised and latencies are minimised."""
+    rounds = [
+        {'rps': 100.0, 'p50_us': 12.0},
+        {'rps': 120.0, 'p50_us': 15.0},
+    ]
+    assert bench_client.best(rounds) == {'rps': 120.0, 'p50_us': 12.0}
+    assert bench_client.percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+
+
+def test_regressions_are_flagged_past_the_tolerance(capsys):
+    """Worse-than-tolerance metrics are reported in either direction."""
+    results = {
+        name: {'rps': 100.0, 'p50_us': 10.0, 'p99_us': 20.0, 'alloc_kib': 1}
+        for name in bench_client.CASES
+    }
+    results['get_status'] = {
+        'rps': 70.0,
+        'p50_us': 13.0,
+        'p99_us': 21.0,
+        'alloc_kib': 1.0,
+    }
+    results['import'] = {'import_ms': 200.0}
+    baselines = json.loads(json.dumps(results))
+    baselines['get_status'] = {'rps': 100.0, 'p50_us': 10.0, 'p99_us': 20.0}
+    baselines['import'] = {'import_ms': 100.0}
+
+    changes = bench_client.compare(results, baselines)
+    regressions = bench_client.report(results, changes, tolerance=0.25)
+
+    assert changes['get_status']['rps'] == pytest.approx(-0.3)
+    assert changes['get_status']['alloc_kib'] is None
+    assert regressions == [
+        'get_status.rps',
+        'get_status.p50_us',
+        'import.import_ms',
+    ]
+    assert '-30%!' in capsys.readouterr().out
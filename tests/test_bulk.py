@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import send_payload
+from im_csm_sdk_python import BulkStats, asend_many, send_many
+from im_csm_sdk_python.schemas.messages import (
+    SendToContactData,
+    SendToContactResponse,
+)
+
+from .conftest import make_async_client, make_client
+
+FAILING = '50231249999'
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    """Send every payload but reject `FAILING` as invalid."""
+    data = json.loads(request.content)
+    if data['msisdn'] == FAILING:
+        return httpx.Response(400, json={'error': 'Invalid msisdn'})
+    return httpx.Response(200, json=send_payload(data, tags=False))
+
+
+def payloads(count: int):
+    """Payloads for `count` distinct contacts."""
+    return [
+        SendToContactData(msisdn=f'5023124{i:04d}', message=f'Hola {i}')
+        for i in range(count)
+    ]
+
+
+def test_send_many_yields_every_payload_with_its_result():
+    """Each input comes back once, paired with its own response."""
+    items = payloads(25)
+    stats = BulkStats()
+    with make_client(handler) as client:
+        results = list(
+            send_many(items, client=client, concurrency=4, stats=stats)
+        )
+
+    assert sorted(data.msisdn for data, _ in results) == sorted(
+        data.msisdn for data in items
+    )
+    for data, result in results:
+        assert isinstance(result, SendToContactResponse)
+        assert result.msisdn == data.msisdn
+    assert (stats.submitted, stats.succeeded, stats.failed) == (25, 25, 0)
+    assert stats.in_flight == 0
+    assert stats.throughput > 0
+
+
+def test_send_many_yields_failures_without_stopping():
+    """A failed payload is yielded as its exception and counted."""
+    items = payloads(5)
+    items.insert(2, SendToContactData(msisdn=FAILING, message='Hola'))
+    stats = BulkStats()
+    with make_client(handler) as client:
+        results = {
+            data.msisdn: result
+            for data, result in send_many(items, client=client, stats=stats)
+        }
+
+    assert isinstance(results[FAILING], httpx.HTTPStatusError)
+    assert len(results) == 6
+    assert (stats.succeeded, stats.failed) == (5, 1)
+    assert stats.errors == {'HTTPStatusError': 1}
+
+
+def test_send_many_does_not_stop_at_a_none_item():
+    """A None item is a failed payload, not the end of the stream."""
+    items = [*payloads(2), None, *payloads(4)[2:]]
+    with make_client(handler) as client:
+        results = list(send_many(items, client=client, concurrency=1))
+
+    assert len(results) == 5
+    failures = [
+        data for data, result in results if isinstance(result, Exception)
+    ]
+    assert failures == [None]
+
+
+def test_asend_many_matches_send_many():
+    """The async version sends everything with the same stats."""
+    stats = BulkStats()
+
+    async def main():
+        async with make_async_client(handler) as client:
+            return [
+                result
+                async for result in asend_many(
+                    payloads(12), client=client, concurrency=3, stats=stats
+                )
+            ]
+
+    results = asyncio.run(main())
+    assert len(results) == 12
+    assert all(
+        isinstance(result, SendToContactResponse) for _, result in results
+    )
+    assert (stats.submitted, stats.succeeded) == (12, 12)
+
+
+@pytest.mark.parametrize('concurrency', [0, -1])
+def test_send_many_rejects_invalid_concurrency(concurrency):
+    """A fixed concurrency below one raises ValueError."""
+    with pytest.raises(ValueError), make_client(handler) as client:
+        list(send_many(payloads(1), client=client, concurrency=concurrency))
+
+
+def test_client_and_concurrency_are_keyword_only():
+    """Both functions reject client and concurrency as positionals."""
+    with make_client(handler) as client, pytest.raises(TypeError):
+        send_many(payloads(1), 2, client)
+    with pytest.raises(TypeError):
+        asend_many(payloads(1), make_async_client(handler), 2)
@@ -0,0 +1,161 @@
+import os
+import time
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import contact_payload
+from im_csm_sdk_python import (
+    ContactCache,
+    ContactNotFoundError,
+    MemoryCacheBackend,
+    SqliteCacheBackend,
+)
+from im_csm_sdk_python.schemas.contacts import Contact
+
+from .conftest import make_client
+
+KNOWN = contact_payload(3)
+
+
+class ContactServer:
+    """Answer contact lookups for `KNOWN` and 404 for anything else."""
+
+    def __init__(self):
+        """Initialize the request counter."""
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        """Answer one lookup."""
+        self.calls += 1
+        if request.url.path.endswith(KNOWN['msisdn']):
+            return httpx.Response(200, json=KNOWN)
+        return httpx.Response(404, json={'error': 'Not found'})
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    """Each cache backend."""
+    if request.param == 'memory':
+        return MemoryCacheBackend(max_size=3)
+    return SqliteCacheBackend(str(tmp_path / 'cache.db'), max_size=3)
+
+
+def contact(index: int) -> Contact:
+    """A mock contact."""
+    return Contact.model_validate(contact_payload(index))
+
+
+def test_hits_skip_the_api():
+    """The second lookup is answered from the cache."""
+    server = ContactServer()
+    with make_client(server) as client:
+        cache = ContactCache(client)
+        first = cache.get_contact(KNOWN['msisdn'])
+        second = cache.get_contact(KNOWN['msisdn'])
+
+    assert first == second == contact(3)
+    assert server.calls == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert cache.stats.hit_ratio == 0.5
+
+
+def test_missing_contacts_are_cached_negatively():
+    """A 404 is remembered for `negative_ttl` seconds."""
+    server = ContactServer()
+    with make_client(server) as client:
+        cache = ContactCache(client, negative_ttl=60)
+        for _ in range(3):
+            with pytest.raises(ContactNotFoundError):
+                cache.get_contact('50299999999')
+
+        disabled = ContactCache(client, negative_ttl=0)
+        for _ in range(2):
+            with pytest.raises(ContactNotFoundError):
+                disabled.get_contact('50299999999')
+
+    assert server.calls == 1 + 2
+    assert cache.stats.negative_hits == 2
+
+
+def test_entries_expire(backend):
+    """An entry past its TTL is a miss and is dropped."""
+    backend.set('a', contact(0), ttl=0.05)
+    assert backend.get('a') == (True, contact(0))
+    time.sleep(0.06)
+    assert backend.get('a') == (False, None)
+
+
+def test_least_recently_used_entries_are_evicted(backend):
+    """Beyond `max_size`, the entry used longest ago goes first."""
+    for key in 'abc':
+        backend.set(key, contact(ord(key)), ttl=60)
+        time.sleep(0.001)
+    backend.get('a')
+    time.sleep(0.001)
+    assert backend.set('d', None, ttl=60) == 1
+    assert backend.get('b') == (False, None)
+    assert backend.get('a')[0]
+    assert backend.get('d') == (True, None)
+
+
+def test_delete_and_clear(backend):
+    """Entries can be dropped one by one or all at once."""
+    backend.set('a', contact(0), ttl=60)
+    backend.set('b', contact(1), ttl=60)
+    backend.delete('a')
+    assert backend.get('a') == (False, None)
+    backend.clear()
+    assert backend.get('b') == (False, None)
+
+
+def test_callers_do_not_share_cached_contacts(backend):
+    """Mutating a returned or stored contact leaves the cache intact."""
+    stored = contact(0)
+    backend.set('a', stored, ttl=60)
+    stored.tags.append('changed')
+
+    _, first = backend.get('a')
+    first.first_name = 'Changed'
+    first.tags.append('changed')
+    _, second = backend.get('a')
+
+    assert second == contact(0)
+    assert second is not first
+
+
+def test_put_and_invalidate():
+    """Listed contacts can be cached and invalidated by MSISDN."""
+    server = ContactServer()
+    with make_client(server) as client:
+        cache = ContactCache(client)
+        cache.put(contact(3))
+        assert cache.get_contact(KNOWN['msisdn']) == contact(3)
+        cache.invalidate_many([KNOWN['msisdn']])
+        cache.get_contact(KNOWN['msisdn'])
+
+    assert server.calls == 1
+    assert cache.stats.invalidations == 1
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+def test_sqlite_backend_reconnects_after_fork(tmp_path):
+    """A forked child opens its own connection to the shared file."""
+    backend = SqliteCacheBackend(str(tmp_path / 'cache.db'))
+    backend.set('parent', contact(0), ttl=60)
+    inherited = backend._connection()
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - runs in the child
+        status = 1
+        try:
+            if backend._connection() is not inherited:
+                backend.set('child', contact(1), ttl=60)
+                status = 0 if backend.get('parent')[0] else 2
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert backend._connection() is inherited
+    assert backend.get('child') == (True, contact(1))
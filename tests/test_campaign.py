@@ -0,0 +1,215 @@
+import json
+import threading
+import uuid
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import BASE_URL, MockCSMServer
+from im_csm_sdk_python import CSMClient, InputFormat, run_campaign
+from im_csm_sdk_python.core.campaign import CampaignCheckpoint
+
+from .conftest import API_KEY, API_SECRET
+
+ROWS = 50
+
+
+class Crash(BaseException):
+    """Stands in for the runner being killed mid-campaign."""
+
+
+class Recorder:
+    """Client factory recording the payloads sent through its clients."""
+
+    def __init__(self, crash_after=None):
+        """Crash the run after `crash_after` sends, if set."""
+        self.crash_after = crash_after
+        self.sent = []
+        self.server = MockCSMServer(total=1)
+        self.lock = threading.Lock()
+
+    def __call__(self) -> CSMClient:
+        """Build a client of the mock server."""
+        return CSMClient(
+            API_KEY,
+            API_SECRET,
+            BASE_URL,
+            transport=httpx.MockTransport(self.respond),
+        )
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        """Record a send and answer it."""
+        with self.lock:
+            if self.crash_after is not None and (
+                len(self.sent) >= self.crash_after
+            ):
+                raise Crash()
+            self.sent.append(json.loads(request.content))
+        return self.server.respond(request)
+
+
+def mock_client() -> CSMClient:
+    """Picklable client factory for worker processes."""
+    return CSMClient(
+        API_KEY,
+        API_SECRET,
+        BASE_URL,
+        transport=MockCSMServer(total=1).transport(),
+    )
+
+
+def write_ndjson(path, count: int = ROWS) -> None:
+    """Write `count` valid rows."""
+    with open(path, 'w') as file:
+        for i in range(count):
+            row = {'msisdn': f'5023124{i:04d}', 'message': f'Hola {i}'}
+            file.write(json.dumps(row) + '\n')
+
+
+def read_results(path) -> list:
+    """Read the outcome lines."""
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+def test_csv_rows_are_sent_or_reported_invalid(tmp_path):
+    """Valid rows are sent once; broken ones get an INVALID outcome."""
+    source = tmp_path / 'campaign.csv'
+    source.write_text(
+        'msisdn,message,id\n'
+        '50231240001,Hola,own-id\n'
+        '50231240002,"Dos\nlíneas",\n'
+        '50231240003\n'
+        '\n'
+        '50231240004,"Con, coma",\n'
+    )
+    results = tmp_path / 'out' / 'results.ndjson'
+    factory = Recorder()
+
+    result = run_campaign(
+        str(source), str(results), workers=0, client_factory=factory
+    )
+
+    assert (result.succeeded, result.failed, result.invalid) == (3, 0, 1)
+    assert result.skipped == 0
+    outcomes = sorted(read_results(results), key=lambda row: row['offset'])
+    assert [row['status'] for row in outcomes] == [
+        'SENT',
+        'SENT',
+        'INVALID',
+        'SENT',
+    ]
+    assert 'message' in outcomes[2]['error']
+    messages = {data['msisdn']: data for data in factory.sent}
+    assert messages['50231240002']['message'] == 'Dos\nlíneas'
+    assert messages['50231240004']['message'] == 'Con, coma'
+    assert messages['50231240001']['id'] == 'own-id'
+    namespace = uuid.UUID(result.campaign_id)
+    assert messages['50231240002']['id'] == str(
+        uuid.uuid5(namespace, str(outcomes[1]['offset']))
+    )
+    assert CampaignCheckpoint.load(result.checkpoint_path).finished
+
+
+def test_ndjson_lines_that_are_not_objects_are_invalid(tmp_path):
+    """Malformed JSON and non-object lines do not stop the campaign."""
+    source = tmp_path / 'campaign.jsonl'
+    source.write_text(
+        '{"msisdn": "50231240001", "message": "Hola"}\n'
+        '{"msisdn": \n'
+        '[1, 2]\n'
+        '{"phone": 50231240002, "text": "Hola"}\n'
+    )
+    assert InputFormat.detect(str(source)) == InputFormat.NDJSON
+
+    result = run_campaign(
+        str(source),
+        str(tmp_path / 'results.ndjson'),
+        workers=0,
+        msisdn_column='phone',
+        message_column='text',
+        client_factory=Recorder(),
+    )
+
+    assert (result.succeeded, result.invalid) == (1, 3)
+
+
+def test_a_crashed_campaign_resumes_without_duplicates(tmp_path):
+    """Rows with an outcome are skipped; the others keep their ids."""
+    source = tmp_path / 'campaign.ndjson'
+    results = tmp_path / 'results.ndjson'
+    write_ndjson(source)
+    options = dict(workers=0, chunk_size=5, checkpoint_interval=0)
+
+    crashing = Recorder(crash_after=23)
+    with pytest.raises(Crash):
+        run_campaign(
+            str(source), str(results), client_factory=crashing, **options
+        )
+    done = len(read_results(results))
+    assert 0 < done <= 23
+
+    factory = Recorder()
+    result = run_campaign(
+        str(source), str(results), client_factory=factory, **options
+    )
+
+    offsets = [row['offset'] for row in read_results(results)]
+    assert len(offsets) == len(set(offsets)) == ROWS
+    assert result.succeeded == ROWS
+    assert result.skipped == done
+    assert len(factory.sent) == ROWS - done
+    first_ids = {data['msisdn']: data['id'] for data in crashing.sent}
+    for data in factory.sent:
+        assert first_ids.get(data['msisdn'], data['id']) == data['id']
+
+    again = run_campaign(
+        str(source), str(results), client_factory=Recorder(), **options
+    )
+    assert again.skipped == ROWS and again.campaign_id == result.campaign_id
+
+
+def test_a_changed_input_needs_a_restart(tmp_path):
+    """Resuming against a different input is refused."""
+    source = tmp_path / 'campaign.ndjson'
+    results = str(tmp_path / 'results.ndjson')
+    write_ndjson(source, 3)
+    first = run_campaign(
+        str(source), results, workers=0, client_factory=Recorder()
+    )
+    write_ndjson(source, 4)
+
+    with pytest.raises(ValueError):
+        run_campaign(
+            str(source), results, workers=0, client_factory=Recorder()
+        )
+    result = run_campaign(
+        str(source),
+        results,
+        workers=0,
+        client_factory=Recorder(),
+        restart=True,
+    )
+    assert result.campaign_id != first.campaign_id
+    assert (result.succeeded, result.skipped) == (4, 0)
+    assert len(read_results(results)) == 4
+
+
+def test_worker_processes_send_every_row(tmp_path):
+    """Chunks are spread over a process pool."""
+    source = tmp_path / 'campaign.ndjson'
+    results = tmp_path / 'results.ndjson'
+    write_ndjson(source)
+
+    result = run_campaign(
+        str(source),
+        str(results),
+        workers=2,
+        chunk_size=7,
+        client_factory=mock_client,
+    )
+
+    assert result.succeeded == ROWS
+    assert sorted(row['msisdn'] for row in read_results(results)) == [
+        f'5023124{i:04d}' for i in range(ROWS)
+    ]
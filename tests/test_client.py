@@ -0,0 +1,129 @@
+import threading
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import MockCSMServer, contact_payload
+from im_csm_sdk_python import (
+    CSMClient,
+    get_contact,
+    get_default_client,
+    get_status,
+    list_contacts,
+    set_default_client,
+)
+from im_csm_sdk_python.core.client import http_client_options
+from im_csm_sdk_python.schemas.contacts import ListContactsParams
+
+from .conftest import API_KEY, API_SECRET, BASE_URL
+
+
+@pytest.fixture
+def default_client(server):
+    """Install a mock-server client as the default client."""
+    client = CSMClient(
+        API_KEY, API_SECRET, BASE_URL, transport=server.transport()
+    )
+    set_default_client(client)
+    yield client
+    set_default_client(None)
+
+
+def test_module_functions_use_the_default_client(server, default_client):
+    """The module-level API sends through the shared pooled client."""
+    assert get_status() == {'status': 'OK', 'version': '1.0'}
+    contacts = list_contacts(ListContactsParams(start=10, limit=5))
+    contact = get_contact(contact_payload(0)['msisdn'])
+
+    assert [c.msisdn for c in contacts] == [
+        contact_payload(i)['msisdn'] for i in range(10, 15)
+    ]
+    assert contact.msisdn == contact_payload(0)['msisdn']
+    assert server.requests == 3
+    assert get_default_client() is default_client
+
+
+def test_default_client_is_created_once():
+    """Threads racing for the default client all get the same one."""
+    set_default_client(None)
+    clients = []
+    started = threading.Barrier(8)
+
+    def worker():
+        started.wait()
+        clients.append(get_default_client())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(client) for client in clients}) == 1
+    set_default_client(None)
+
+
+def test_replacing_the_default_client_closes_it(server):
+    """`set_default_client` closes the client it replaces."""
+    previous = CSMClient(transport=server.transport())
+    set_default_client(previous)
+    set_default_client(CSMClient(transport=server.transport()))
+
+    with pytest.raises(RuntimeError):
+        previous.get_status()
+    set_default_client(None)
+
+
+def test_one_client_is_shared_by_threads():
+    """Concurrent calls on one client all reach the server."""
+    server = MockCSMServer(total=50)
+    with CSMClient(
+        API_KEY,
+        API_SECRET,
+        BASE_URL,
+        transport=server.transport(),
+        coalesce=False,
+    ) as client:
+
+        def worker():
+            for _ in range(20):
+                assert client.get_status()['status'] == 'OK'
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert server.requests == 8 * 20
+
+
+def test_requests_are_signed(server):
+    """Every request carries the `Date` and `Authorization` headers."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return server.respond(request)
+
+    with CSMClient(
+        API_KEY, API_SECRET, BASE_URL, transport=httpx.MockTransport(handler)
+    ) as client:
+        client.get_status()
+
+    (request,) = seen
+    assert request.headers['Authorization'].startswith(f'IM {API_KEY}:')
+    assert 'Date' in request.headers
+
+
+def test_pool_options():
+    """Limits and timeouts are built from the client options."""
+    options = http_client_options(
+        max_connections=10, keepalive_expiry=5.0, connect_timeout=1.0
+    )
+
+    limits = options['limits']
+    assert (limits.max_connections, limits.keepalive_expiry) == (10, 5.0)
+    assert options['timeout'].connect == 1.0
+    assert options['timeout'].read == 5.0
+    assert options['http2'] is False
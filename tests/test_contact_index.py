@@ -0,0 +1,118 @@
+import pytest
+
+from benchmarks.mock_server import MockCSMServer, contact_payload
+from im_csm_sdk_python import ContactIndex, ContactStatus, CSMClient
+from im_csm_sdk_python.analytics.contact_index import from_bitmap, to_bitmap
+from im_csm_sdk_python.schemas.messages import SendToTagsData
+
+from .conftest import API_KEY, API_SECRET, BASE_URL
+
+CONTACTS = [contact_payload(i) for i in range(250)]
+
+
+def expected(predicate) -> int:
+    """Count the mock contacts matching a predicate, the slow way."""
+    return sum(1 for contact in CONTACTS if predicate(contact))
+
+
+@pytest.fixture
+def index(client) -> ContactIndex:
+    """An index built from the 250 contacts of the mock server."""
+    return ContactIndex.build(page_size=100, client=client)
+
+
+def test_build_indexes_every_contact(index):
+    """Tags and statuses are counted from one pass over the listing."""
+    assert len(index) == 250
+    assert CONTACTS[3]['profile_uid'] in index
+    assert index.tags == ['python', 'vip']
+    assert index.tag_counts() == {
+        'python': 250,
+        'vip': expected(lambda c: 'vip' in c['tags']),
+    }
+    assert index.status_counts() == {
+        'ACTIVE': expected(lambda c: c['status'] == 'ACTIVE'),
+        'BLOCKED': expected(lambda c: c['status'] == 'BLOCKED'),
+    }
+
+
+def test_queries_match_a_scan(index):
+    """Unions, intersections, differences and status filters."""
+    vip = expected(lambda c: 'vip' in c['tags'])
+    active_vip = expected(
+        lambda c: 'vip' in c['tags'] and c['status'] == 'ACTIVE'
+    )
+
+    assert index.count(any_of=['vip', 'missing']) == vip
+    assert index.intersection_count('python', 'vip') == vip
+    assert index.difference_count('python', 'vip') == 250 - vip
+    assert index.count(none_of=['vip'], status='BLOCKED') == expected(
+        lambda c: 'vip' not in c['tags'] and c['status'] == 'BLOCKED'
+    )
+    assert index.overlap(['python', 'vip']) == {('python', 'vip'): vip}
+    assert index.audience_size(SendToTagsData(tags=['vip'], message='x')) == (
+        active_vip
+    )
+    assert index.msisdns(index.select(all_of=['vip']))[:2] == [
+        CONTACTS[0]['msisdn'],
+        CONTACTS[5]['msisdn'],
+    ]
+
+
+def test_updates_only_touch_changed_contacts():
+    """Re-indexing moves a contact between tags and statuses."""
+    index = ContactIndex(CONTACTS[:10])
+    changed = dict(CONTACTS[1], tags=['vip'], status=ContactStatus.BLOCKED)
+
+    stats = index.update([CONTACTS[0], changed, contact_payload(10)])
+
+    assert (stats.added, stats.updated, stats.unchanged) == (1, 1, 1)
+    assert index.count(all_of=['vip'], status='BLOCKED') == 2
+    assert index.count(any_of=['python']) == 10
+    assert index.remove(CONTACTS[0]['profile_uid'])
+    assert not index.remove(CONTACTS[0]['profile_uid'])
+    assert index.count(all_of=['vip']) == 3
+
+
+def test_refresh_prunes_contacts_no_longer_listed(index):
+    """A refresh against a smaller listing removes the missing contacts."""
+    server = MockCSMServer(total=200)
+    with CSMClient(
+        API_KEY, API_SECRET, BASE_URL, transport=server.transport()
+    ) as client:
+        stats = index.refresh(page_size=100, client=client)
+
+    assert (stats.unchanged, stats.removed) == (200, 50)
+    assert len(index) == 200
+    assert index.count() == 200
+
+
+def test_saved_index_loads_without_rebuilding(index, tmp_path):
+    """A loaded index answers queries and can still be updated."""
+    path = str(tmp_path / 'index' / 'contacts.idx')
+    index.remove(CONTACTS[5]['profile_uid'])
+    index.save(path)
+
+    loaded = ContactIndex.load(path)
+    assert len(loaded) == 249
+    assert loaded.tag_counts() == index.tag_counts()
+    assert loaded.count(all_of=['vip']) == index.count(all_of=['vip'])
+
+    loaded.add(dict(CONTACTS[6], tags=['vip']))
+    assert loaded.count(all_of=['vip']) == index.count(all_of=['vip']) + 1
+    assert loaded.count(none_of=['python']) == 1
+
+
+def test_load_rejects_other_files(tmp_path):
+    """Files without the index magic are refused."""
+    path = tmp_path / 'other.idx'
+    path.write_bytes(b'not an index')
+    with pytest.raises(ValueError):
+        ContactIndex.load(str(path))
+
+
+def test_bitmaps_round_trip():
+    """Ids survive the conversion to and from bitmaps."""
+    ids = [0, 3, 64, 65, 1000]
+    assert from_bitmap(to_bitmap(ids)) == ids
+    assert from_bitmap(0) == []
@@ -0,0 +1,120 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.mock_server import message_payload
+from im_csm_sdk_python import ExportFormat, MessageExporter, export_messages
+from im_csm_sdk_python.schemas.messages import ListMessagesParams, Message
+from im_csm_sdk_python.storage import export
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+@pytest.mark.parametrize(
+    'path, expected',
+    [
+        ('out/messages.parquet', ExportFormat.PARQUET),
+        ('messages.feather', ExportFormat.ARROW),
+        ('messages.ndjson.gz', ExportFormat.NDJSON),
+        ('MESSAGES.JSONL', ExportFormat.NDJSON),
+    ],
+)
+def test_format_is_detected_from_the_extension(path, expected):
+    """Compression extensions are skipped when detecting the format."""
+    assert ExportFormat.detect(path) == expected
+
+
+def test_unknown_extension_is_rejected():
+    """Unknown extensions raise ValueError."""
+    with pytest.raises(ValueError):
+        ExportFormat.detect('messages.csv')
+
+
+def test_parquet_export_of_the_listing(client, tmp_path):
+    """Every listed message lands in its own row group sized file."""
+    path = str(tmp_path / 'messages.parquet')
+    result = export_messages(
+        path, ListMessagesParams(), row_group_size=100, client=client
+    )
+
+    assert (result.rows, result.row_groups) == (250, 3)
+    assert result.bytes == os.path.getsize(path)
+    assert not os.path.exists(path + '.tmp')
+    table = pq.read_table(path)
+    assert table.num_rows == 250
+    assert table.schema == export.message_schema()
+    first = table.slice(0, 1).to_pylist()[0]
+    assert Message.model_validate(first) == Message.model_validate(
+        message_payload(0)
+    )
+
+
+def test_arrow_export_accepts_models_and_dicts(tmp_path):
+    """Batches of models and dicts share growing dictionaries."""
+    path = str(tmp_path / 'messages.arrow')
+    with MessageExporter(path, row_group_size=1) as exporter:
+        exporter.write(Message.model_validate(message_payload(0)))
+        exporter.write(message_payload(1))
+        exporter.write(dict(message_payload(2), created_on='2025-01-01Z'))
+
+    with pa.ipc.open_file(path) as reader:
+        table = reader.read_all()
+    assert table.column('message_id').to_pylist() == [
+        message_payload(i)['message_id'] for i in range(3)
+    ]
+    assert table.column('direction').to_pylist() == ['MO', 'MT', 'MT']
+    assert table.column('status').to_pylist() == [
+        'FAILED',
+        'DELIVERED',
+        'DELIVERED',
+    ]
+    assert str(table.column('created_on')[2]) == '2025-01-01 00:00:00'
+
+
+def test_ndjson_export_is_compressed_from_the_extension(client, tmp_path):
+    """A `.gz` NDJSON file holds one API message per line."""
+    path = str(tmp_path / 'messages.ndjson.gz')
+    result = export_messages(path, ListMessagesParams(), client=client)
+
+    with gzip.open(path, 'rt') as file:
+        lines = [json.loads(line) for line in file]
+    assert result.rows == len(lines) == 250
+    assert lines[7] == message_payload(7)
+
+
+def test_failed_export_leaves_no_file(tmp_path):
+    """An error inside the context removes the temporary file."""
+    path = str(tmp_path / 'messages.ndjson')
+    with pytest.raises(RuntimeError), MessageExporter(path) as exporter:
+        exporter.write(message_payload(0))
+        exporter.flush()
+        raise RuntimeError('stop')
+    assert os.listdir(tmp_path) == []
+
+
+def test_sinks_follow_the_sink_protocol():
+    """Both sinks implement write and close."""
+    for sink in (export._ArrowSink, export._NdjsonSink):
+        assert callable(sink.write)
+        assert callable(sink.close)
+
+
+def test_optional_dependencies_are_imported_on_first_use():
+    """Importing the SDK imports neither pyarrow nor NumPy."""
+    code = (
+        'import sys, im_csm_sdk_python; '
+        'print("pyarrow" in sys.modules, "numpy" in sys.modules)'
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert output.split() == ['False', 'False']
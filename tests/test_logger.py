@@ -0,0 +1,75 @@
+import importlib
+import os
+import subprocess
+import sys
+
+from im_csm_sdk_python.configs import logger as logger_config
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+
+def sink_options(monkeypatch, **environ) -> dict:
+    """The options the logger config passes to `logger.add`."""
+    calls = []
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(
+        logger_config.logger,
+        'add',
+        lambda sink, **options: calls.append((sink, options)),
+    )
+    importlib.reload(logger_config)
+    ((sink, options),) = calls
+    assert sink == logger_config.log_path
+    return options
+
+
+def test_queued_sink_keeps_rotation(monkeypatch):
+    """LOG_QUEUED adds `enqueue` and a write buffer to the rotating sink."""
+    options = sink_options(
+        monkeypatch, LOG_QUEUED='true', LOG_BUFFER_SIZE='4096'
+    )
+
+    assert options['enqueue'] is True
+    assert options['buffering'] == 4096
+    assert options['rotation'] == '00:00'
+    assert options['retention'] == '1 month'
+    assert options['compression'] == 'gz'
+
+
+def test_default_sink_is_line_buffered(monkeypatch):
+    """Without LOG_QUEUED each record is written as it is logged."""
+    options = sink_options(monkeypatch, LOG_QUEUED='false')
+
+    assert options['enqueue'] is False
+    assert 'buffering' not in options
+
+
+def test_queued_records_are_batched_until_exit(tmp_path):
+    """Queued records stay in the buffer and are written at exit."""
+    path = tmp_path / 'sdk.log'
+    code = (
+        'import pathlib; '
+        'from im_csm_sdk_python import logger; '
+        'logger.info("hello"); '
+        'logger.complete(); '
+        f'print(pathlib.Path({str(path)!r}).read_text().count("hello"))'
+    )
+    written = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=ROOT,
+        env=dict(
+            os.environ,
+            LOG_PATH=str(path),
+            LOG_LEVEL='DEBUG',
+            LOG_QUEUED='true',
+        ),
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    assert written.stdout.strip() == '0'
+    lines = path.read_text().splitlines()
+    assert 'log_queued=True' in lines[0]
+    assert lines[-1].endswith('hello')
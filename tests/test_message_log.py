@@ -0,0 +1,148 @@
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.mock_server import EPOCH, message_payload
+from im_csm_sdk_python import MessageLog
+from im_csm_sdk_python.analytics import message_log
+from im_csm_sdk_python.schemas.messages import Message
+from im_csm_sdk_python.schemas.records import MessageRecord
+
+ROWS = 90  # one message every 30 seconds, from EPOCH
+
+
+@pytest.fixture(params=['model', 'dict', 'record'])
+def log(request) -> MessageLog:
+    """A log of the mock messages, loaded in each result mode."""
+    payloads = [message_payload(i) for i in range(ROWS)]
+    if request.param == 'model':
+        rows = [Message.model_validate(data) for data in payloads]
+    elif request.param == 'dict':
+        rows = payloads
+    else:
+        rows = [MessageRecord(data) for data in payloads]
+    return MessageLog(rows)
+
+
+@pytest.fixture
+def without_numpy(monkeypatch):
+    """Run the pure Python fallbacks."""
+    monkeypatch.setattr(message_log, '_numpy', lambda: None)
+
+
+def expected_statuses():
+    """Message counts by status of the mock log."""
+    failed = len(range(0, ROWS, 9))
+    return {'FAILED': failed, 'DELIVERED': ROWS - failed}
+
+
+def test_aggregations(log):
+    """Counts, sums and ratios match the generated payloads."""
+    assert len(log) == ROWS
+    assert log.count_by('status') == expected_statuses()
+    assert log.sum('error_count') == len(range(0, ROWS, 9))
+    assert log.sum('sent_count') == ROWS
+    assert log.sum_by('direction', 'sent_count') == {
+        'MO': len(range(0, ROWS, 4)),
+        'MT': ROWS - len(range(0, ROWS, 4)),
+    }
+    assert log.ratio_by('country') == {'GT': 1.0}
+    assert log.categories('country') == ['GT']
+
+
+def test_aggregations_without_numpy(log, without_numpy):
+    """The fallbacks give the same results as NumPy."""
+    assert log.count_by('status') == expected_statuses()
+    assert log.sum('error_count') == len(range(0, ROWS, 9))
+    assert log.sum_by('status', 'error_count')['FAILED'] == len(
+        range(0, ROWS, 9)
+    )
+    with pytest.raises(ImportError):
+        log.to_numpy('sent_count')
+
+
+def test_sum_of_an_empty_log():
+    """An empty column sums to zero."""
+    assert MessageLog().sum('sent_count') == 0
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_where_filters_by_time_and_value(log, monkeypatch, numpy):
+    """Time bounds are half-open and values match exactly."""
+    if not numpy:
+        monkeypatch.setattr(message_log, '_numpy', lambda: None)
+    since = EPOCH + timedelta(minutes=10)
+    until = EPOCH + timedelta(minutes=20)
+    window = log.where(since=since, until=until)
+    assert len(window) == 20
+    assert min(row['created_on'] for row in window.rows()) == since
+
+    failed = log.where(status='FAILED', direction='MO')
+    assert len(failed) == len(range(0, ROWS, 36))
+    assert len(log.where(status='QUEUED')) == 0
+
+
+def test_buckets(log):
+    """Messages are counted per time bucket, in order."""
+    counts = log.count_by_bucket(timedelta(minutes=15))
+    assert list(counts) == [
+        EPOCH + timedelta(minutes=15 * i) for i in range(3)
+    ]
+    assert list(counts.values()) == [30, 30, 30]
+    sums = log.sum_by_bucket(timedelta(minutes=15), 'sent_count')
+    assert sums == counts
+
+
+def test_to_numpy_copies_the_column(log):
+    """The log can still grow while a NumPy array of it is held."""
+    sent = log.to_numpy('sent_count')
+    codes = log.to_numpy('status')
+    assert sent.sum() == ROWS
+    assert len(codes) == ROWS
+
+    log.append(message_payload(ROWS))
+    log.extend(message_payload(ROWS + i) for i in range(1, 3))
+
+    assert len(log) == ROWS + 3
+    assert len(sent) == len(codes) == ROWS
+    assert log.to_numpy('sent_count').sum() == ROWS + 3
+
+
+def test_round_trip_to_messages(log):
+    """Rows come back as equal `Message` models."""
+    messages = log.to_messages()
+    assert messages[5] == Message.model_validate(message_payload(5))
+    assert messages[5].created_on.tzinfo is None
+
+
+@pytest.mark.parametrize(
+    'created_on',
+    ['2025-01-01T10:00:00+02:00', '2025-01-01T08:00:00Z'],
+)
+def test_offsets_in_strings_are_kept(created_on):
+    """ISO strings with an offset give aware UTC dates back."""
+    row = dict(message_payload(0), created_on=created_on)
+    log = MessageLog([row, MessageRecord(row)])
+    expected = datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc)
+    assert [data['created_on'] for data in log.rows()] == [expected] * 2
+    assert len(log.where(since=expected)) == 2
+
+
+def test_numpy_is_imported_on_first_use():
+    """Importing the SDK does not import NumPy."""
+    # pyarrow imports NumPy itself, so keep it out of the way
+    code = (
+        'import sys; sys.modules["pyarrow"] = None; '
+        'import im_csm_sdk_python; print("numpy" in sys.modules)'
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert output.strip() == 'False'
@@ -0,0 +1,205 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import EPOCH, message_payload
+from im_csm_sdk_python import MessageStore, sync_messages
+from im_csm_sdk_python.schemas.messages import (
+    ListMessagesParams,
+    Message,
+    MessageDirection,
+)
+
+from .conftest import TOTAL, DatedServer, make_client
+
+LAST = EPOCH + timedelta(seconds=30 * (TOTAL - 1))
+WINDOW = timedelta(minutes=20)
+
+
+@pytest.fixture
+def store(tmp_path) -> MessageStore:
+    """An empty store in a temporary file."""
+    store = MessageStore(str(tmp_path / 'messages.db'))
+    yield store
+    store.close()
+
+
+def sync(store, server, **options):
+    """Run `sync_messages` from EPOCH against a dated server."""
+    options.setdefault('until', EPOCH + timedelta(hours=1))
+    options.setdefault('window', WINDOW)
+    with make_client(server) as client:
+        return sync_messages(
+            store,
+            ListMessagesParams(start_date=EPOCH),
+            overlap=timedelta(minutes=10),
+            page_size=25,
+            client=client,
+            **options,
+        )
+
+
+def test_first_sync_stores_everything(store):
+    """Every message is stored once, whatever the window overlaps."""
+    result = sync(store, DatedServer())
+
+    assert store.count() == TOTAL
+    assert result.windows == 3
+    assert result.fetched >= TOTAL
+    assert result.written == TOTAL
+    assert result.synced_until == store.get_checkpoint() == LAST
+
+
+def test_checkpoint_is_never_a_window_end(store):
+    """A window saves its newest message, or its start when empty."""
+    server = DatedServer()
+    result = sync(store, server, until=EPOCH + timedelta(minutes=70))
+    assert result.windows == 4
+    assert store.get_checkpoint() == EPOCH + 3 * WINDOW
+
+    server.rows = server.rows[:10]
+    store.upsert([], checkpoint=EPOCH, name='short')
+    result = sync(store, server, name='short', until=EPOCH + WINDOW)
+    assert result.synced_until == EPOCH + timedelta(seconds=30 * 9)
+
+
+def test_second_sync_refetches_only_the_overlap(store):
+    """A rerun starts `overlap` before the checkpoint and writes changes."""
+    server = DatedServer()
+    sync(store, server)
+    server.rows[-1] = dict(server.rows[-1], status='FAILED')
+    server.rows.append(message_payload(TOTAL))
+
+    result = sync(store, server, until=EPOCH + timedelta(minutes=65))
+
+    # 21 messages from LAST - 10 minutes to LAST, plus the new one
+    assert result.fetched == 21 + 1
+    assert result.written == 2
+    assert store.count() == TOTAL + 1
+    assert store.get_checkpoint() == LAST + timedelta(seconds=30)
+    assert store.query(since=LAST)[0].status == 'FAILED'
+
+
+def test_interrupted_sync_resumes_from_the_last_window(store):
+    """Completed windows stay checkpointed when a later one fails."""
+    server = DatedServer()
+    windows = []
+
+    def failing(request: httpx.Request) -> httpx.Response:
+        windows.append(request.url.params['start_date'])
+        if len(set(windows)) == 3:
+            return httpx.Response(500, json={'error': 'boom'})
+        return server(request)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        sync(store, failing)
+    checkpoint = store.get_checkpoint()
+    assert checkpoint == EPOCH + 2 * WINDOW
+
+    result = sync(store, server)
+    assert store.count() == TOTAL
+    assert result.synced_until == LAST
+
+
+def test_aware_and_naive_dates_can_be_mixed(store):
+    """Aware bounds are converted to naive UTC instead of failing."""
+    server = DatedServer()
+    sync(store, server, until=EPOCH + timedelta(minutes=30))
+    local = timezone(timedelta(hours=-6))
+    until = (EPOCH + timedelta(hours=1)).replace(tzinfo=timezone.utc)
+
+    result = sync(store, server, until=until.astimezone(local))
+
+    assert result.synced_until == LAST
+    assert result.synced_until.tzinfo is None
+    store.upsert([], checkpoint=until, name='aware')
+    assert store.get_checkpoint('aware') == until.replace(tzinfo=None)
+
+
+def test_first_sync_needs_a_start_date(store):
+    """Without a checkpoint there is nowhere to start."""
+    with pytest.raises(ValueError):
+        sync_messages(store, ListMessagesParams(), client=object())
+
+
+def test_upsert_skips_unchanged_rows(store):
+    """Only new or changed messages count as written."""
+    messages = [Message.model_validate(message_payload(i)) for i in range(5)]
+    assert store.upsert(messages) == 5
+    assert store.upsert(messages) == 0
+    changed = messages[2].model_copy(update={'status': 'READ'})
+    assert store.upsert([changed]) == 1
+
+
+def test_query_uses_every_filter(store):
+    """Queries filter by msisdn, direction and time, in date order."""
+    store.upsert(
+        Message.model_validate(message_payload(i)) for i in range(TOTAL)
+    )
+
+    mo = store.query(direction=MessageDirection.MO)
+    assert len(mo) == TOTAL // 4
+    assert all(message.direction == MessageDirection.MO for message in mo)
+
+    msisdn = message_payload(7)['msisdn']
+    assert [m.msisdn for m in store.query(msisdn=msisdn)] == [msisdn]
+
+    window = store.query(
+        since=EPOCH + timedelta(minutes=5),
+        until=EPOCH + timedelta(minutes=10),
+        limit=4,
+    )
+    assert [m.created_on for m in window] == [
+        EPOCH + timedelta(seconds=300 + 30 * i) for i in range(4)
+    ]
+    assert store.query(since=datetime(2030, 1, 1)) == []
+
+
+def test_dates_with_mixed_offsets_sort_and_filter_in_utc(store):
+    """Aware and naive dates are compared as instants, not as text."""
+    plus_five = timezone(timedelta(hours=5))
+    dates = {
+        'naive': datetime(2025, 1, 1, 6, 0),
+        'plus_five': datetime(2025, 1, 1, 10, 0, tzinfo=plus_five),
+        'utc': datetime(2025, 1, 1, 5, 30, tzinfo=timezone.utc),
+    }
+    store.upsert(
+        Message.model_validate(
+            dict(message_payload(i), message_id=name, created_on=created_on)
+        )
+        for i, (name, created_on) in enumerate(dates.items())
+    )
+
+    ordered = store.query()
+    assert [m.message_id for m in ordered] == ['plus_five', 'utc', 'naive']
+    assert ordered[0].created_on == datetime(2025, 1, 1, 5, 0)
+
+    since = datetime(2025, 1, 1, 10, 31, tzinfo=plus_five)
+    assert [m.message_id for m in store.query(since=since)] == ['naive']
+    until = datetime(2025, 1, 1, 5, 30)
+    assert [m.message_id for m in store.query(until=until)] == ['plus_five']
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+def test_store_reconnects_after_fork(store):
+    """A forked child opens its own connection to the shared file."""
+    store.upsert([Message.model_validate(message_payload(0))])
+    inherited = store._connection()
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - runs in the child
+        status = 1
+        try:
+            if store._connection() is not inherited:
+                store.upsert([Message.model_validate(message_payload(1))])
+                store.close()
+                status = 0
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert store._connection() is inherited
+    assert store.count() == 2
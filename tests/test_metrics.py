@@ -0,0 +1,177 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from im_csm_sdk_python import (
+    CallbackCollector,
+    Metrics,
+    Retrier,
+    RetryPolicy,
+)
+from im_csm_sdk_python.helpers.metrics import AttemptSample, Histogram, Phase
+
+from .conftest import make_async_client, make_client
+
+ROUTE = '/contacts/{msisdn}'
+MSISDN = '50212345678'
+
+
+def flaky(server, failures: int = 1):
+    """Answer the first `failures` requests with 503, then like `server`."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) <= failures:
+            return httpx.Response(503, json={'error': 'busy'})
+        return server.respond(request)
+
+    return handler
+
+
+def test_client_records_every_attempt(server):
+    """Each attempt counts by status; retries, sizes and phases are kept."""
+    metrics = Metrics()
+    retrier = Retrier(RetryPolicy(backoff_base=0))
+    with make_client(
+        flaky(server), metrics=metrics, retrier=retrier
+    ) as client:
+        client.get_contact(MSISDN)
+
+    assert metrics.requests == {(ROUTE, 'GET', 503): 1, (ROUTE, 'GET', 200): 1}
+    assert metrics.retries == {(ROUTE, 'GET'): 1}
+    assert metrics.bytes_out == {(ROUTE, 'GET'): 0}
+    assert metrics.bytes_in[(ROUTE, 'GET')] > 0
+    assert metrics.latency[(ROUTE, 'GET')].count == 2
+    for phase, count in (
+        (Phase.SERIALIZE, 2),
+        (Phase.SIGN, 2),
+        (Phase.NETWORK, 2),
+        (Phase.RETRY_WAIT, 1),
+        (Phase.DECODE, 1),
+    ):
+        assert metrics.histogram(ROUTE, phase).count == count
+    # MockTransport opens no connections, so there is no pool wait
+    assert metrics.histogram(ROUTE, Phase.POOL_WAIT) is None
+
+
+def test_async_client_records_attempts(server):
+    """The async client reports the same samples."""
+    metrics = Metrics()
+
+    async def run():
+        async with make_async_client(
+            server.respond, metrics=metrics
+        ) as client:
+            await client.get_contact(MSISDN)
+            await client.get_status()
+
+    asyncio.run(run())
+
+    assert metrics.requests == {
+        (ROUTE, 'GET', 200): 1,
+        ('/status', 'GET', 200): 1,
+    }
+    assert metrics.histogram(ROUTE, Phase.DECODE).count == 1
+    # The status is returned as raw JSON, without a decode
+    assert metrics.histogram('/status', Phase.DECODE) is None
+
+
+def test_render_prometheus():
+    """Counters and histograms follow the text exposition format."""
+    metrics = Metrics(buckets=(0.1, 1.0), namespace='sms')
+    metrics.record(
+        AttemptSample(ROUTE, 'GET', status=200, bytes_in=10, network=0.5)
+    )
+    metrics.record(AttemptSample('/a"b', 'POST', status=0, bytes_out=3))
+
+    text = metrics.render_prometheus()
+    lines = text.splitlines()
+
+    assert text.endswith('\n')
+    assert '# TYPE sms_requests_total counter' in lines
+    assert '# TYPE sms_request_duration_seconds histogram' in lines
+    assert (
+        'sms_requests_total{endpoint="/contacts/{msisdn}",method="GET",'
+        'status="200"} 1'
+    ) in lines
+    assert (
+        'sms_requests_total{endpoint="/a\\"b",method="POST",status="error"} 1'
+    ) in lines
+    assert (
+        'sms_request_bytes_total{endpoint="/a\\"b",method="POST"} 3'
+    ) in lines
+    labels = 'endpoint="/contacts/{msisdn}",method="GET"'
+    assert [
+        line
+        for line in lines
+        if line.startswith(f'sms_request_duration_seconds_bucket{{{labels}')
+    ] == [
+        f'sms_request_duration_seconds_bucket{{{labels},le="0.1"}} 0',
+        f'sms_request_duration_seconds_bucket{{{labels},le="1.0"}} 1',
+        f'sms_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1',
+    ]
+    assert f'sms_request_duration_seconds_sum{{{labels}}} 0.5' in lines
+    assert not any(line.startswith('sms_retries_total{') for line in lines)
+
+    metrics.reset()
+    assert 'sms_requests_total{' not in metrics.render_prometheus()
+
+
+def test_histogram_buckets_and_quantiles():
+    """Bounds are inclusive and quantiles interpolate inside a bucket."""
+    histogram = Histogram((1.0, 2.0, 4.0))
+    assert histogram.quantile(0.5) == 0.0
+    for value in (0.5, 1.0, 1.5, 3.0, 10.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [
+        (1.0, 2),
+        (2.0, 3),
+        (4.0, 4),
+        (float('inf'), 5),
+    ]
+    assert histogram.sum == pytest.approx(16.0)
+    assert histogram.quantile(0.2) == pytest.approx(0.5)
+    assert histogram.quantile(0.6) == pytest.approx(2.0)
+    assert histogram.quantile(1.0) == 4.0
+
+
+def test_metrics_can_be_shared_between_threads():
+    """Concurrent records are all counted."""
+    metrics = Metrics()
+
+    def record():
+        for _ in range(500):
+            metrics.record(AttemptSample('/status', 'GET', status=200))
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.requests[('/status', 'GET', 200)] == 8 * 500
+    assert metrics.latency[('/status', 'GET')].count == 8 * 500
+
+
+def test_callback_collector_forwards(server):
+    """Samples and phases reach the callables; `on_observe` is optional."""
+    samples = []
+    phases = []
+    collector = CallbackCollector(
+        samples.append, lambda *phase: phases.append(phase)
+    )
+    with make_client(server.respond, metrics=collector) as client:
+        client.get_contact(MSISDN)
+
+    assert [(s.route, s.status) for s in samples] == [(ROUTE, 200)]
+    assert [phase[:2] for phase in phases] == [(ROUTE, Phase.DECODE)]
+
+    with make_client(
+        server.respond, metrics=CallbackCollector(samples.append)
+    ) as client:
+        client.get_contact(MSISDN)
+    assert len(samples) == 2
@@ -0,0 +1,142 @@
+import pytest
+
+from im_csm_sdk_python.core.msisdn import (
+    MsisdnNormalizer,
+    MsisdnRejection,
+    normalize_msisdns,
+)
+from im_csm_sdk_python.schemas.messages import SendToContactData
+
+
+@pytest.mark.parametrize(
+    'number, msisdn',
+    [
+        ('3124 1024', '50231241024'),
+        ('50231241024', '50231241024'),
+        ('+502 3124-1024', '50231241024'),
+        ('00502 3124 1024', '50231241024'),
+        ('(502) 3124.1024', '50231241024'),
+        (50231241024, '50231241024'),
+        ('+52 55 1234 5678', '525512345678'),
+        ('+1 (212) 555-0123', '12125550123'),
+        ('+507 234 5678', '5072345678'),
+    ],
+)
+def test_accepted_numbers_are_normalized(number, msisdn):
+    """National, MSISDN and E.164 spellings give the same MSISDN."""
+    batch = normalize_msisdns([number])
+    assert list(batch.accepted) == [msisdn]
+    assert not batch.rejected
+
+
+@pytest.mark.parametrize(
+    'number, reason',
+    [
+        ('', MsisdnRejection.EMPTY),
+        ('3124-10x4', MsisdnRejection.INVALID_CHARACTERS),
+        ('+999 1234 5678', MsisdnRejection.UNKNOWN_COUNTRY),
+        ('3124 102', MsisdnRejection.INVALID_LENGTH),
+        ('+502 3124 10245', MsisdnRejection.INVALID_LENGTH),
+        ('1124 1024', MsisdnRejection.INVALID_PREFIX),
+        ('+57 1234 567 890', MsisdnRejection.INVALID_PREFIX),
+    ],
+)
+def test_invalid_numbers_are_rejected_with_a_reason(number, reason):
+    """Each broken rule is reported with its own reason."""
+    batch = normalize_msisdns([number])
+    assert not batch.accepted
+    assert batch.rejected == [number]
+    assert batch.rejected_reason == [reason]
+
+
+@pytest.mark.parametrize(
+    'number',
+    [
+        '3123456²',
+        '502312345²',
+        '+50231234５6',
+        '003123456٣',
+        '٣١٢٣٤٥٦٧',
+    ],
+)
+def test_non_ascii_digits_are_rejected(number):
+    """Digits outside ASCII fail every path, fast or not."""
+    batch = normalize_msisdns([number])
+    assert not batch.accepted
+    assert batch.rejected_reason == [MsisdnRejection.INVALID_CHARACTERS]
+
+
+def test_duplicates_are_rejected_across_calls():
+    """A normalizer remembers accepted numbers and input positions."""
+    normalizer = MsisdnNormalizer()
+    first = normalizer.normalize(['31241024', '+502 3124 1025'])
+    second = normalizer.normalize(['50231241024', 'bad', '31241026'])
+
+    assert list(first.accepted_index) == [0, 1]
+    assert second.accepted == ['50231241026']
+    assert list(second.accepted_index) == [4]
+    assert list(second.rejected_index) == [2, 3]
+    assert second.rejected_reason == [
+        MsisdnRejection.DUPLICATE,
+        MsisdnRejection.INVALID_CHARACTERS,
+    ]
+
+
+def test_dedupe_can_be_disabled():
+    """Without dedupe the same number is accepted every time."""
+    batch = normalize_msisdns(['31241024', '31241024'], dedupe=False)
+    assert batch.accepted == ['50231241024', '50231241024']
+
+
+def test_batches_keep_input_positions():
+    """Small batches give the same columns as one large batch."""
+    numbers = ['31241024', 'x', '31241025', '', '31241024'] * 3
+    whole = normalize_msisdns(numbers)
+    batched = MsisdnNormalizer().normalize(numbers, batch_size=2)
+    assert batched == whole
+    assert len(batched) == len(numbers)
+
+
+def test_separator_inside_a_number_does_not_shift_positions():
+    """A newline in a raw number is not mistaken for the batch separator."""
+    batch = normalize_msisdns(['3124\n1024', '31241025'])
+    assert batch.accepted == ['50231241025']
+    assert list(batch.accepted_index) == [1]
+
+
+def test_other_default_country():
+    """National numbers are read in the default country."""
+    batch = normalize_msisdns(['(212) 555-0123', '1 212 555 0124'], '1')
+    assert batch.accepted == ['12125550123', '12125550124']
+    with pytest.raises(ValueError):
+        MsisdnNormalizer('999')
+
+
+def test_payloads_are_screened_in_order():
+    """Valid payloads are normalized; rejected ones are reported."""
+    items = [
+        SendToContactData(msisdn='3124 1024', message='a'),
+        SendToContactData(msisdn='nope', message='b'),
+        SendToContactData(msisdn='50231241025', message='c'),
+        SendToContactData(msisdn='+502 3124 1024', message='d'),
+    ]
+    skipped = []
+    sent = list(
+        MsisdnNormalizer().payloads(
+            items,
+            batch_size=3,
+            on_reject=lambda data, reason: skipped.append(
+                (data.message, reason)
+            ),
+        )
+    )
+
+    assert [(data.msisdn, data.message) for data in sent] == [
+        ('50231241024', 'a'),
+        ('50231241025', 'c'),
+    ]
+    assert sent[1] is items[2]
+    assert skipped == [
+        ('b', MsisdnRejection.INVALID_CHARACTERS),
+        ('d', MsisdnRejection.DUPLICATE),
+    ]
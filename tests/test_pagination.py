@@ -0,0 +1,97 @@
+import asyncio
+from itertools import islice
+
+import pytest
+
+from benchmarks.mock_server import contact_payload, message_payload
+from im_csm_sdk_python import (
+    aiter_contacts,
+    aiter_messages,
+    iter_contacts,
+    iter_messages,
+)
+from im_csm_sdk_python.schemas.contacts import ListContactsParams
+from im_csm_sdk_python.schemas.messages import ListMessagesParams
+from im_csm_sdk_python.schemas.request import ResultMode
+
+from .conftest import make_async_client
+
+WALKS = [
+    pytest.param({'prefetch': False}, id='sequential'),
+    pytest.param({}, id='prefetch'),
+    pytest.param({'concurrency': 4}, id='concurrent'),
+]
+
+
+@pytest.mark.parametrize('options', WALKS)
+def test_every_contact_is_yielded_in_order(server, client, options):
+    """All 250 contacts come back once, in API order."""
+    contacts = list(iter_contacts(page_size=100, client=client, **options))
+
+    assert [c.msisdn for c in contacts] == [
+        contact_payload(i)['msisdn'] for i in range(250)
+    ]
+    if 'concurrency' not in options:
+        assert server.requests == 3
+
+
+def test_a_full_last_page_needs_one_more_request(server, client):
+    """The walk only ends on a page shorter than the page size."""
+    contacts = list(iter_contacts(page_size=50, client=client))
+
+    assert len(contacts) == 250
+    assert server.requests == 6
+
+
+def test_params_set_the_offset_and_page_size(server, client):
+    """`start` is the first offset and `limit` the page size."""
+    params = ListMessagesParams(start=200, limit=20)
+    messages = list(iter_messages(params, client=client, mode=ResultMode.DICT))
+
+    assert messages == [message_payload(i) for i in range(200, 250)]
+    assert server.requests == 3
+
+
+def test_pages_are_fetched_as_they_are_consumed(server, client):
+    """Taking the first items fetches at most one page ahead."""
+    list(islice(iter_contacts(page_size=10, client=client), 5))
+    assert server.requests <= 2
+
+    server.requests = 0
+    list(islice(iter_contacts(page_size=10, client=client, prefetch=False), 5))
+    assert server.requests == 1
+
+
+def test_page_size_must_be_positive(client):
+    """A page size below 1 is rejected."""
+    with pytest.raises(ValueError):
+        next(iter_contacts(page_size=0, client=client))
+
+
+@pytest.mark.parametrize('options', WALKS)
+def test_async_iterators_walk_every_page(server, options):
+    """The async iterators yield the same rows as the sync ones."""
+
+    async def main():
+        async with make_async_client(server.respond) as client:
+            contacts = [
+                c.msisdn
+                async for c in aiter_contacts(
+                    client,
+                    ListContactsParams(start=10),
+                    page_size=60,
+                    **options,
+                )
+            ]
+            messages = [
+                m.message_id
+                async for m in aiter_messages(
+                    client, ListMessagesParams(), page_size=100, **options
+                )
+            ]
+            return contacts, messages
+
+    contacts, messages = asyncio.run(main())
+
+    assert contacts == [contact_payload(i)['msisdn'] for i in range(10, 250)]
+    assert messages == [message_payload(i)['message_id'] for i in range(250)]
@@ -0,0 +1,114 @@
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from im_csm_sdk_python.core.endpoints import Endpoints
+from im_csm_sdk_python.helpers import authentication
+from im_csm_sdk_python.helpers.api_request import build_request
+from im_csm_sdk_python.helpers.authentication import Signer
+from im_csm_sdk_python.helpers.prepared import PreparedEndpoint, encode_json
+from im_csm_sdk_python.schemas.request import ApiRequest, ApiRequestType
+
+from .conftest import API_KEY, API_SECRET, BASE_URL
+
+PAYLOADS = [
+    pytest.param({'msisdn': '50212345678', 'message': 'Hola'}, id='ascii'),
+    pytest.param({'msisdn': '50212345678', 'message': 'Señor 😀'}, id='utf8'),
+]
+
+
+@pytest.fixture(autouse=True)
+def frozen_date(monkeypatch):
+    """Sign every request with the same date."""
+    monkeypatch.setattr(
+        authentication,
+        'time',
+        SimpleNamespace(
+            time=lambda: 1735718400.0,
+            strftime=time.strftime,
+            gmtime=time.gmtime,
+        ),
+    )
+
+
+def wire(kwargs) -> httpx.Request:
+    """The request httpx would send for `build_request` arguments."""
+    return httpx.Request(**kwargs)
+
+
+@pytest.mark.parametrize('data', PAYLOADS)
+def test_prepared_requests_match_the_generic_path(data):
+    """A prepared call sends the bytes and headers of an `ApiRequest`."""
+    signer = Signer(API_KEY, API_SECRET)
+    config = {'apiKey': API_KEY, 'apiSecret': API_SECRET, 'url': BASE_URL}
+    endpoints = Endpoints(BASE_URL)
+    generic = ApiRequest(
+        type=ApiRequestType.POST,
+        endpoint='/messages/send_to_contact',
+        data=data,
+    )
+
+    expected = wire(build_request(generic, config, signer))
+    prepared = wire(
+        build_request(
+            endpoints.send_to_contact.request(data=data), signer=signer
+        )
+    )
+
+    assert prepared.method == expected.method == 'POST'
+    assert prepared.url == expected.url
+    assert prepared.content == expected.content
+    assert json.loads(prepared.content) == data
+    for header in ('Authorization', 'Date', 'Content-Type'):
+        assert prepared.headers[header] == expected.headers[header]
+
+
+def test_get_requests_carry_their_params_and_path():
+    """Path segments and query parameters end up in the URL."""
+    endpoints = Endpoints(BASE_URL)
+    request = endpoints.contact.request(
+        params={'msisdn': '50212345678'}, path='50212345678'
+    )
+    sent = wire(request.build(Signer(API_KEY, API_SECRET)))
+
+    assert str(sent.url) == (
+        'https://csm.mock/api/rest/contacts/50212345678?msisdn=50212345678'
+    )
+    assert request.endpoint == '/contacts/50212345678'
+    assert request.route == '/contacts/{msisdn}'
+    assert 'Content-Type' not in sent.headers
+    assert endpoints.messages.request().route == '/messages'
+
+
+def test_body_is_encoded_once_across_attempts():
+    """Retries re-sign the same body bytes."""
+    request = Endpoints(BASE_URL).send_to_tags.request(
+        data={'tags': ['vip'], 'message': 'Hola'}
+    )
+    signer = Signer(API_KEY, API_SECRET)
+    first = request.build(signer)
+    second = request.build(signer)
+
+    assert first['content'] is second['content']
+    assert first['headers'] == second['headers']
+
+
+def test_encode_json_signs_the_escaped_form():
+    """Non-ASCII bodies are sent as UTF-8 and signed ASCII-escaped."""
+    body, signed = encode_json({'message': 'ñ'})
+    assert body == '{"message":"ñ"}'.encode()
+    assert signed == b'{"message":"\\u00f1"}'
+    ascii_body, ascii_signed = encode_json({'message': 'n'})
+    assert ascii_body is ascii_signed
+
+
+def test_endpoints_must_not_be_empty():
+    """An endpoint needs a path."""
+    with pytest.raises(ValueError):
+        PreparedEndpoint(BASE_URL, ApiRequestType.GET, ' ')
+    assert repr(Endpoints(BASE_URL).status) == (
+        'PreparedEndpoint(GET https://csm.mock/api/rest/status)'
+    )
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from im_csm_sdk_python.core.pagination import iter_contacts
+from im_csm_sdk_python.helpers import api_request
+from im_csm_sdk_python.utils.timeit import Profiler
+
+SEND = 'im_csm_sdk_python.helpers.api_request:send_request'
+PAGES = 'im_csm_sdk_python.core.pagination:iter_pages'
+
+
+def stacks(profiler: Profiler) -> dict:
+    """The collapsed stacks as a dict of self times in microseconds."""
+    lines = profiler.collapsed().splitlines()
+    return {
+        stack: int(value)
+        for stack, value in (line.rsplit(' ', 1) for line in lines)
+    }
+
+
+def test_calls_are_counted_from_every_thread():
+    """Concurrent calls are all counted and sampled as configured."""
+    profiler = Profiler(sample_every=7)
+    noop = profiler.wrap(lambda: None, 'noop')
+    profiler.enabled = True
+
+    def worker():
+        for _ in range(5000):
+            noop()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = profiler.stats['noop']
+    assert stats.calls == 8 * 5000
+    assert stats.sampled == 8 * 5000 // 7
+
+
+def test_stop_restores_the_hot_paths():
+    """`stop` puts the original functions back in every module."""
+    original = api_request.send_request
+    profiler = Profiler()
+    with profiler.profile(targets=[SEND]):
+        assert api_request.send_request is not original
+    assert api_request.send_request is original
+
+
+def test_prefetched_pages_are_stacked_under_the_loop(client):
+    """Requests sent by the prefetch thread nest under `iter_pages`."""
+    profiler = Profiler()
+    with profiler.profile(targets=[SEND, PAGES]):
+        for _ in iter_contacts(page_size=50, client=client):
+            time.sleep(0.001)
+
+    collapsed = stacks(profiler)
+    assert set(collapsed) == {'iter_pages', 'iter_pages;send_request'}
+    assert all(value >= 0 for value in collapsed.values())
+    assert profiler.stats['send_request'].calls == 6
+    assert profiler.stats['iter_pages'].sampled == 1
+
+
+def test_nested_calls_are_taken_out_of_self_time():
+    """A call made in the same thread only counts as its caller's child."""
+    profiler = Profiler()
+    inner = profiler.wrap(lambda: time.sleep(0.02), 'inner')
+    outer = profiler.wrap(lambda: inner(), 'outer')
+    profiler.enabled = True
+    outer()
+
+    collapsed = stacks(profiler)
+    assert collapsed['outer;inner'] >= 20000
+    assert collapsed['outer'] < 10000
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from im_csm_sdk_python import FileTokenBucket, RateLimiter, TokenBucket
+from im_csm_sdk_python.helpers import rate_limit
+
+from .conftest import make_client
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the clocks seen by the buckets; advance them by hand."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(
+        rate_limit,
+        'time',
+        SimpleNamespace(
+            monotonic=lambda: now.value,
+            time=lambda: now.value,
+            sleep=time.sleep,
+        ),
+    )
+    return now
+
+
+def test_bucket_allows_a_burst_then_queues_callers(clock):
+    """Empty buckets go into debt, so waits grow by 1/rate per caller."""
+    bucket = TokenBucket(rate=10, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0] * 3
+    assert [round(bucket.reserve(), 3) for _ in range(3)] == [0.1, 0.2, 0.3]
+
+    clock.value += 1.0
+    assert bucket.reserve() == 0.0
+
+
+def test_bucket_refills_up_to_its_burst(clock):
+    """An idle bucket never holds more than `burst` tokens."""
+    bucket = TokenBucket(rate=2)
+    clock.value += 60
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_file_buckets_share_one_budget(clock, tmp_path):
+    """Buckets on the same file draw from the same tokens."""
+    path = str(tmp_path / 'buckets' / 'send.bucket')
+    first = FileTokenBucket(path, rate=10, burst=2)
+    second = FileTokenBucket(path, rate=10, burst=2)
+
+    assert first.reserve() == second.reserve() == 0.0
+    assert first.reserve() == pytest.approx(0.1)
+    assert second.reserve() == pytest.approx(0.2)
+    clock.value += 0.5
+    assert first.reserve() == 0.0
+    first.close()
+    second.close()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+def test_forked_processes_share_the_file_bucket(clock, tmp_path):
+    """A child process takes tokens from the parent's budget."""
+    bucket = FileTokenBucket(str(tmp_path / 'send.bucket'), rate=1, burst=3)
+    bucket.reserve()
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - runs in the child
+        status = 1
+        try:
+            status = 0 if bucket.reserve() == 0.0 else 2
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize('shared', [False, True])
+def test_released_tokens_shorten_later_waits(clock, tmp_path, shared):
+    """Given back tokens are reused, but never beyond `burst`."""
+    if shared:
+        bucket = FileTokenBucket(str(tmp_path / 'b'), rate=10, burst=2)
+    else:
+        bucket = TokenBucket(rate=10, burst=2)
+
+    bucket.release()
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1)
+    bucket.release()
+    assert bucket.reserve() == pytest.approx(0.1)
+
+
+def test_cancelled_waits_give_their_token_back(clock):
+    """A task cancelled while it waits does not delay the next caller."""
+    bucket = TokenBucket(rate=10, burst=1)
+    limiter = RateLimiter({'messages': bucket})
+
+    async def cancel_a_waiter():
+        await limiter.aacquire('messages')
+        waiter = asyncio.ensure_future(limiter.aacquire('messages'))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(cancel_a_waiter())
+
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert (limiter.stats.acquired, limiter.stats.cancelled) == (2, 1)
+
+
+def test_longest_prefix_selects_the_bucket():
+    """Endpoints are limited by their most specific prefix."""
+    limiter = RateLimiter.from_rates(
+        {'messages': 5, 'messages/send_to_contact': 50, '/contacts/': 20}
+    )
+
+    assert limiter.bucket_for('messages/send_to_contact').rate == 50
+    assert limiter.bucket_for('messages/send').rate == 5
+    assert limiter.bucket_for('/contacts/50212345678').rate == 20
+    assert limiter.bucket_for('contactsx') is None
+    assert limiter.bucket_for('status') is None
+
+
+def test_from_rates_uses_files_in_a_directory(tmp_path):
+    """With a directory, every endpoint gets its own bucket file."""
+    limiter = RateLimiter.from_rates(
+        {'messages/send': 5}, directory=str(tmp_path)
+    )
+    bucket = limiter.bucket_for('messages/send')
+
+    assert isinstance(bucket, FileTokenBucket)
+    assert bucket.path == str(tmp_path / 'messages_send.bucket')
+
+
+def test_acquire_waits_and_counts(clock):
+    """The limiter sleeps for the reserved wait and records it."""
+    limiter = RateLimiter({'contacts': TokenBucket(rate=100, burst=1)})
+
+    waits = [limiter.acquire('contacts') for _ in range(3)]
+    waits.append(limiter.acquire('status'))
+    waits.append(asyncio.run(limiter.aacquire('contacts')))
+
+    assert waits == pytest.approx([0.0, 0.01, 0.02, 0.0, 0.03])
+    stats = limiter.stats
+    assert (stats.acquired, stats.delayed) == (4, 3)
+    assert stats.wait_seconds == pytest.approx(0.06)
+
+
+def test_client_requests_are_paced(server):
+    """Every request of a limited client takes a token first."""
+    limiter = RateLimiter.from_rates({'status': 100}, burst={'status': 1})
+    with make_client(server.respond, rate_limiter=limiter) as client:
+        started = time.monotonic()
+        for _ in range(6):
+            client.get_status()
+        elapsed = time.monotonic() - started
+
+    assert limiter.stats.acquired == 6
+    assert elapsed >= 0.045
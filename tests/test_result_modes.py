@@ -0,0 +1,66 @@
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from benchmarks.mock_server import contact_payload, message_payload
+from im_csm_sdk_python import ResultMode
+from im_csm_sdk_python.schemas.contacts import Contact, ListContactsParams
+from im_csm_sdk_python.schemas.messages import ListMessagesParams, Message
+from im_csm_sdk_python.schemas.records import ContactRecord, MessageRecord
+
+from .conftest import make_client
+
+CONTACTS = ListContactsParams(start=0, limit=5)
+MESSAGES = ListMessagesParams(start=0, limit=5)
+
+
+def test_models_are_validated_from_the_raw_body(client):
+    """MODEL mode gives the same models as validating the dicts."""
+    assert client.list_contacts(CONTACTS) == [
+        Contact.model_validate(contact_payload(i)) for i in range(5)
+    ]
+    assert client.list_messages(MESSAGES) == [
+        Message.model_validate(message_payload(i)) for i in range(5)
+    ]
+
+
+def test_dict_mode_returns_the_decoded_json(client):
+    """DICT mode skips validation and keeps ISO date strings."""
+    messages = client.list_messages(MESSAGES, ResultMode.DICT)
+    contact = client.get_contact('50231240000', ResultMode.DICT)
+
+    assert messages == [message_payload(i) for i in range(5)]
+    assert isinstance(messages[0]['created_on'], str)
+    assert contact == contact_payload(0)
+
+
+def test_record_mode_returns_slotted_records(client):
+    """RECORD mode builds one slotted record per JSON object."""
+    contacts = client.list_contacts(CONTACTS, ResultMode.RECORD)
+    message = client.list_messages(MESSAGES, ResultMode.RECORD)[0]
+
+    assert all(type(contact) is ContactRecord for contact in contacts)
+    assert contacts[2].as_dict() == contact_payload(2)
+    assert message.created_on == message_payload(0)['created_on']
+    assert message == MessageRecord(message_payload(0))
+    assert not hasattr(message, '__dict__')
+
+
+def test_records_fill_missing_and_drop_unknown_fields():
+    """Records tolerate partial and extended JSON objects."""
+    record = ContactRecord({'msisdn': '50212345678', 'unknown': 1})
+
+    assert record.msisdn == '50212345678'
+    assert record.email is None
+    assert 'unknown' not in record.as_dict()
+    assert len(record.as_tuple()) == len(Contact.model_fields)
+
+
+def test_invalid_bodies_fail_validation_only_in_model_mode():
+    """A malformed object is rejected by MODEL and passed on by DICT."""
+    body = [dict(contact_payload(0), monitoring='often')]
+
+    with make_client(lambda _: httpx.Response(200, json=body)) as client:
+        with pytest.raises(ValidationError):
+            client.list_contacts(CONTACTS)
+        assert client.list_contacts(CONTACTS, ResultMode.DICT) == body
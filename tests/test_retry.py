@@ -0,0 +1,229 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import send_payload
+from im_csm_sdk_python import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Retrier,
+    RetryPolicy,
+)
+from im_csm_sdk_python.helpers.retry import CircuitState, parse_retry_after
+from im_csm_sdk_python.schemas.messages import SendToContactData
+
+from .conftest import make_async_client, make_client
+
+URL = 'https://csm.mock/api/rest/status'
+
+
+def status_error(status: int, **headers: str) -> httpx.HTTPStatusError:
+    """An HTTP error as raised by `raise_for_status`."""
+    request = httpx.Request('GET', URL)
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError('error', request=request, response=response)
+
+
+class Flaky:
+    """Fail the first `failures` requests with `status`, then succeed."""
+
+    def __init__(self, failures: int, status: int = 503):
+        """Initialize the handler."""
+        self.failures = failures
+        self.status = status
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        """Answer one request."""
+        self.calls += 1
+        if self.calls <= self.failures:
+            return httpx.Response(self.status, json={'error': 'busy'})
+        if request.method == 'POST':
+            return httpx.Response(200, json=send_payload({}, tags=False))
+        return httpx.Response(200, json={'status': 'OK'})
+
+
+def fast_retrier(**options) -> Retrier:
+    """A retrier without backoff waits."""
+    return Retrier(RetryPolicy(backoff_base=0, **options))
+
+
+def test_parse_retry_after():
+    """Seconds and HTTP dates are read; anything else is ignored."""
+    assert parse_retry_after(httpx.Response(429)) is None
+    response = httpx.Response(429, headers={'Retry-After': ' 7 '})
+    assert parse_retry_after(response) == 7.0
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    response = httpx.Response(
+        503, headers={'Retry-After': format_datetime(later, usegmt=True)}
+    )
+    assert 28 <= parse_retry_after(response) <= 30
+    for value in (b'soon', b'-1', '²'.encode('latin-1')):
+        response = httpx.Response(429, headers=[(b'Retry-After', value)])
+        assert parse_retry_after(response) is None
+
+
+def test_delay_prefers_retry_after_and_caps_backoff():
+    """Retry-After wins on 429/503; backoff stays under its ceiling."""
+    policy = RetryPolicy(backoff_base=1, backoff_max=4, max_retry_after=5)
+    assert policy.delay(1, status_error(429, **{'Retry-After': '3'})) == 3
+    assert policy.delay(1, status_error(503, **{'Retry-After': '90'})) == 5
+    for attempt in range(1, 8):
+        wait = policy.delay(attempt, status_error(500))
+        assert 0 <= wait <= min(4, 2 ** (attempt - 1))
+
+
+def test_only_honored_retry_after_waits_are_counted():
+    """An unparseable Retry-After falls back to backoff and is not counted."""
+    headers = iter(['soon', '0'])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        value = next(headers, None)
+        if value is None:
+            return httpx.Response(200, json={'status': 'OK'})
+        return httpx.Response(429, headers={'Retry-After': value})
+
+    retrier = fast_retrier()
+    assert (
+        retrier.policy.retry_after(
+            status_error(429, **{'Retry-After': 'soon'})
+        )
+        is None
+    )
+    with make_client(handler, retrier=retrier) as client:
+        assert client.get_status() == {'status': 'OK'}
+    assert retrier.stats.retries == 2
+    assert retrier.stats.retry_after_waits == 1
+
+
+def test_policy_retries_only_idempotent_transient_failures():
+    """Transient errors are retryable; client errors are not."""
+    policy = RetryPolicy()
+    assert policy.is_retryable_error(status_error(503))
+    assert policy.is_retryable_error(httpx.ConnectError('refused'))
+    assert not policy.is_retryable_error(status_error(404))
+    assert not policy.is_retryable_error(ValueError('bad'))
+
+
+def test_breaker_opens_probes_and_closes():
+    """Closed -> open after the threshold -> half-open -> closed."""
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=0.05)
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.before_request()
+    assert 0 < info.value.retry_in <= 0.05
+
+    time.sleep(0.06)
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.before_request()
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert (breaker.failures, breaker.opened) == (0, 1)
+
+
+def test_breaker_reopens_when_the_probe_fails():
+    """A failed probe opens the circuit again at once."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.opened == 2
+
+
+def test_clients_send_once_without_a_retrier():
+    """Retries are opt-in: by default a 503 fails on the first attempt."""
+    handler = Flaky(failures=1)
+    with make_client(handler) as client:
+        assert client.retrier is None
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_status()
+    assert handler.calls == 1
+
+
+def test_retrier_retries_gets_until_success():
+    """A GET is retried and the attempts are counted."""
+    handler = Flaky(failures=2)
+    retrier = fast_retrier()
+    with make_client(handler, retrier=retrier) as client:
+        assert client.get_status() == {'status': 'OK'}
+    assert handler.calls == 3
+    metrics = retrier.metrics()
+    assert (metrics['requests'], metrics['attempts']) == (1, 3)
+    assert (metrics['retries'], metrics['exhausted']) == (2, 0)
+
+
+def test_retrier_gives_up_after_max_attempts():
+    """The last error is raised once every attempt failed."""
+    handler = Flaky(failures=10, status=500)
+    retrier = fast_retrier(max_attempts=3)
+    client = make_client(handler, retrier=retrier)
+    with client, pytest.raises(httpx.HTTPStatusError):
+        client.get_status()
+    assert handler.calls == 3
+    assert retrier.stats.exhausted == 1
+
+
+def test_sends_are_retried_only_with_an_id():
+    """A send without `id` could be duplicated, so it is not retried."""
+    retrier = fast_retrier()
+    handler = Flaky(failures=1)
+    data = SendToContactData(msisdn='50231241024', message='Hola')
+    with make_client(handler, retrier=retrier) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.send_to_contact(data)
+        assert handler.calls == 1
+
+        handler.calls = 0
+        data = data.model_copy(update={'id': 'b4b2c1f0-0001'})
+        client.send_to_contact(data)
+        assert handler.calls == 2
+
+
+def test_open_circuit_rejects_without_sending():
+    """Once open, requests fail fast with CircuitOpenError."""
+    handler = Flaky(failures=10)
+    retrier = Retrier(
+        RetryPolicy(max_attempts=1),
+        CircuitBreaker(failure_threshold=2, recovery_time=60),
+    )
+    with make_client(handler, retrier=retrier) as client:
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                client.get_status()
+        with pytest.raises(CircuitOpenError):
+            client.get_status()
+    assert handler.calls == 2
+    assert retrier.metrics()['circuit_state'] == 'open'
+    assert retrier.stats.rejected == 1
+
+
+def test_async_client_retries_with_a_retrier():
+    """The async client has the same opt-in behaviour."""
+    handler = Flaky(failures=1)
+
+    async def main():
+        async with make_async_client(handler) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_status()
+        async with make_async_client(
+            handler, retrier=fast_retrier()
+        ) as client:
+            handler.calls = 0
+            handler.failures = 1
+            return await client.get_status()
+
+    assert asyncio.run(main()) == {'status': 'OK'}
+    assert handler.calls == 2
@@ -0,0 +1,143 @@
+import dataclasses
+import threading
+
+import httpx
+import pytest
+
+from im_csm_sdk_python import (
+    AccountRegistry,
+    Settings,
+    get_config,
+    get_settings,
+    reload_settings,
+)
+from im_csm_sdk_python.configs import config
+
+from .conftest import API_KEY
+
+
+@pytest.fixture
+def fresh_settings():
+    """Re-read the settings after the test changed the environment."""
+    yield
+    reload_settings()
+
+
+def test_settings_are_read_once(monkeypatch, fresh_settings):
+    """Changes to the environment need `reload_settings`."""
+    settings = get_settings()
+    monkeypatch.setenv('API_KEY', 'rotated_key')
+
+    assert get_settings() is settings
+    assert get_config()['apiKey'] == API_KEY
+    assert reload_settings().api_key == 'rotated_key'
+    assert get_settings().api_key == 'rotated_key'
+
+
+def test_settings_are_immutable_and_hide_the_secret():
+    """Settings cannot be changed and keep the secret out of reprs."""
+    settings = Settings('key', 'secret', 'https://csm.mock/')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.api_key = 'other'
+    assert 'secret' not in repr(settings)
+    assert settings.as_config() == {
+        'apiKey': 'key',
+        'apiSecret': 'secret',
+        'url': 'https://csm.mock/',
+    }
+
+
+def test_missing_variables_are_listed(monkeypatch):
+    """Every missing variable is named in the error."""
+    monkeypatch.setenv('ACME_API_KEY', 'acme_key')
+    with pytest.raises(ValueError, match='ACME_API_SECRET, ACME_URL'):
+        Settings.from_env('ACME_')
+
+
+def test_environment_overrides_the_dotenv_file(monkeypatch):
+    """`.env` values are used only for variables that are not set."""
+    monkeypatch.setattr(
+        config, '_dotenv', {'ONLY_IN_DOTENV': 'file', 'API_KEY': 'file'}
+    )
+    assert config.env('ONLY_IN_DOTENV') == 'file'
+    assert config.env('API_KEY') == API_KEY
+    assert config.env('NOWHERE', 'default') == 'default'
+    assert config.config['apiKey'] == API_KEY
+
+
+def signer_key(request: httpx.Request) -> str:
+    """The API key an `Authorization` header was signed for."""
+    return request.headers['Authorization'][3:].split(':')[0]
+
+
+def test_accounts_sign_with_their_own_keys(monkeypatch, server):
+    """Each registered account has its own client and credentials."""
+    for name in ('ACME', 'GLOBEX'):
+        monkeypatch.setenv(f'{name}_API_KEY', f'{name.lower()}_key')
+        monkeypatch.setenv(f'{name}_API_SECRET', f'{name.lower()}_secret')
+        monkeypatch.setenv(f'{name}_URL', 'https://csm.mock/')
+    keys = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        keys.append(signer_key(request))
+        return server.respond(request)
+
+    transport = httpx.MockTransport(handler)
+    with AccountRegistry.from_env(
+        ['acme', 'globex'], transport=transport
+    ) as registry:
+        registry['acme'].get_status()
+        registry.client('globex').get_status()
+
+        assert registry.client('acme') is registry['acme']
+        assert registry.names() == ['acme', 'globex']
+        assert 'acme' in registry and len(registry) == 2
+        assert registry.settings('globex').api_key == 'globex_key'
+
+    assert keys == ['acme_key', 'globex_key']
+
+
+def test_clients_are_created_once_per_account():
+    """Threads asking for an account share one client."""
+    registry = AccountRegistry()
+    registry.register('acme', Settings('key', 'secret', 'https://csm.mock/'))
+    clients = []
+    started = threading.Barrier(8)
+
+    def worker():
+        started.wait()
+        clients.append(registry.client('acme'))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(client) for client in clients}) == 1
+    registry.close()
+
+
+def test_replacing_an_account_closes_its_client(server):
+    """Re-registering or unregistering closes the previous client."""
+    registry = AccountRegistry(transport=server.transport())
+    registry.register('acme', Settings('old', 'secret', 'https://csm.mock/'))
+    previous = registry.client('acme')
+    registry.register(
+        'acme', Settings('new', 'secret', 'https://csm.mock/'), coalesce=False
+    )
+
+    client = registry.client('acme')
+    assert client is not previous
+    assert client.signer.api_key == 'new'
+    assert client.single_flight is None
+    with pytest.raises(RuntimeError):
+        previous.get_status()
+
+    registry.close('acme')
+    assert registry.client('acme') is not client
+    registry.unregister('acme')
+    with pytest.raises(KeyError):
+        registry.client('acme')
+    with pytest.raises(KeyError):
+        registry.unregister('acme')
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+
+from benchmarks.mock_server import EPOCH
+from im_csm_sdk_python.core.sharding import (
+    MAX_WINDOW,
+    MIN_WINDOW,
+    READ_AHEAD,
+    fetch_messages_sharded,
+    iter_messages_sharded,
+    next_window_size,
+)
+from im_csm_sdk_python.schemas.messages import ListMessagesParams
+
+from .conftest import TOTAL, DatedServer, make_client
+
+
+def params(hours: float = 1) -> ListMessagesParams:
+    """A listing of the first `hours` of the mock message log."""
+    return ListMessagesParams(
+        start_date=EPOCH, end_date=EPOCH + timedelta(hours=hours)
+    )
+
+
+def test_next_window_size_follows_density():
+    """Windows shrink when dense, grow when sparse and stay in bounds."""
+    hour = timedelta(hours=1)
+    assert next_window_size(hour, 200, 100) == timedelta(minutes=30)
+    assert next_window_size(hour, 0, 100) == 2 * hour
+    # A single step never changes the size by more than four times
+    assert next_window_size(hour, 10_000, 100) == hour / 4
+    assert next_window_size(hour, 1, 100) == 4 * hour
+    assert next_window_size(MIN_WINDOW, 10_000, 1) == MIN_WINDOW
+    assert next_window_size(MAX_WINDOW, 0, 100) == MAX_WINDOW
+
+
+def test_sharded_listing_is_ordered_and_deduplicated():
+    """Every message is yielded once, in created_on order."""
+    with make_client(DatedServer()) as client:
+        messages = fetch_messages_sharded(
+            params(),
+            concurrency=3,
+            window=timedelta(minutes=7),
+            page_size=10,
+            client=client,
+        )
+
+    ids = [message.message_id for message in messages]
+    assert len(ids) == len(set(ids)) == TOTAL
+    dates = [message.created_on for message in messages]
+    assert dates == sorted(dates)
+
+
+def test_slow_window_bounds_read_ahead():
+    """A slow first window stops new windows past the read-ahead."""
+    concurrency = 2
+    server = DatedServer(slow_start=EPOCH, delay=0.3)
+    with make_client(server) as client:
+        messages = list(
+            iter_messages_sharded(
+                params(),
+                concurrency=concurrency,
+                window=timedelta(seconds=30),
+                target_rows=1,
+                client=client,
+            )
+        )
+
+    assert len(messages) == TOTAL
+    assert server.seen_while_slow <= READ_AHEAD * concurrency
+    assert len(server.windows) > READ_AHEAD * concurrency
+
+
+@pytest.mark.parametrize(
+    'start, end, concurrency',
+    [
+        (EPOCH, EPOCH, 1),
+        (EPOCH + timedelta(hours=1), EPOCH, 1),
+        (EPOCH, EPOCH + timedelta(hours=1), 0),
+    ],
+)
+def test_invalid_ranges_are_rejected(start, end, concurrency):
+    """Empty ranges and a concurrency below one raise ValueError."""
+    listing = ListMessagesParams(start_date=start, end_date=end)
+    with pytest.raises(ValueError):
+        next(iter_messages_sharded(listing, concurrency=concurrency))
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from im_csm_sdk_python.helpers.authentication import (
+    Signer,
+    authorization,
+    canonical_params,
+)
+
+from .conftest import API_KEY, API_SECRET
+
+REQUESTS = [
+    pytest.param(None, None, id='bare'),
+    pytest.param(
+        {'start': 0, 'limit': 50, 'status': 'ACTIVE'}, None, id='params'
+    ),
+    pytest.param(
+        {'search': 'José Pérez', 'monitoring': True, 'b': False},
+        None,
+        id='quoted',
+    ),
+    pytest.param(
+        None,
+        {'msisdn': '50212345678', 'message': 'Hola ñandú', 'id': None},
+        id='data',
+    ),
+    pytest.param(
+        {'tags': 'vip'}, {'tags': ['vip', 'python']}, id='params-and-data'
+    ),
+]
+
+
+@pytest.mark.parametrize('params, data', REQUESTS)
+def test_signer_matches_authorization(params, data):
+    """The fast path signs exactly like the reference implementation."""
+    config = {'apiKey': API_KEY, 'apiSecret': API_SECRET}
+    if params:
+        config['params'] = params
+    if data:
+        config['data'] = data
+    expected = authorization(config)
+
+    signer = Signer(API_KEY, API_SECRET)
+    assert signer.sign(params, data, expected['Date']) == expected
+
+
+def test_params_are_sorted_and_quoted():
+    """Keys are sorted, booleans lowercased and spaces encoded as `+`."""
+    params = {'b': 'x y', 'a': True, 'c': 'á/b'}
+    assert canonical_params(params) == b'a=true&b=x+y&c=%C3%A1/b'
+
+
+def test_date_is_formatted_once_per_second(monkeypatch):
+    """The formatted date is reused within the same second."""
+    now = [1735718400.25]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    signer = Signer(API_KEY, API_SECRET)
+
+    first = signer.formatted_date()
+    now[0] += 0.5
+    assert signer.formatted_date()[0] is first[0]
+    now[0] += 0.5
+
+    assert first == ('Wed, 01 Jan 2025 08:00:00 GMT', first[0].encode())
+    assert signer.formatted_date()[0] == 'Wed, 01 Jan 2025 08:00:01 GMT'
+
+
+def test_signer_is_thread_safe():
+    """Threads sharing a signer get the same signatures as one thread."""
+    signer = Signer(API_KEY, API_SECRET)
+    date = 'Wed, 01 Jan 2025 08:00:00 GMT'
+    expected = [signer.sign({'start': i}, None, date) for i in range(200)]
+    results = {}
+
+    def worker(index: int) -> None:
+        results[index] = [
+            signer.sign({'start': i}, None, date) for i in range(200)
+        ]
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result == expected for result in results.values())
+
+
+def test_keys_are_required():
+    """A signer cannot be built without both keys."""
+    with pytest.raises(ValueError):
+        Signer(API_KEY, '')
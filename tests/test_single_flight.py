@@ -0,0 +1,146 @@
+import asyncio
+import threading
+
+import httpx
+
+from benchmarks.mock_server import contact_payload
+from im_csm_sdk_python.helpers.single_flight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    request_key,
+)
+from im_csm_sdk_python.schemas.request import ApiRequest, ApiRequestType
+
+from .conftest import make_client
+
+WAITERS = 4
+
+
+def status_error() -> httpx.HTTPStatusError:
+    """A 503 error as raised by `raise_for_status`."""
+    request = httpx.Request('GET', 'https://csm.mock/contacts')
+    response = httpx.Response(503, request=request)
+    return httpx.HTTPStatusError(
+        'unavailable', request=request, response=response
+    )
+
+
+def run_together(call) -> list:
+    """Run `call` from several threads at once."""
+    outcomes = [None] * WAITERS
+    started = threading.Barrier(WAITERS)
+
+    def worker(index: int) -> None:
+        started.wait()
+        try:
+            outcomes[index] = call()
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [
+        threading.Thread(target=worker, args=(i,)) for i in range(WAITERS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def slow(value, delay: float = 0.1):
+    """A call that takes `delay` seconds and returns or raises `value`."""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        threading.Event().wait(delay)
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+    return fn, calls
+
+
+def test_concurrent_calls_run_once():
+    """Callers arriving while a call is in flight share its result."""
+    flight = SingleFlight()
+    fn, calls = slow('result')
+
+    assert run_together(lambda: flight.do('key', fn)) == ['result'] * WAITERS
+    assert len(calls) == 1
+    assert (flight.stats.upstream, flight.stats.saved) == (1, WAITERS - 1)
+    assert flight.do('key', lambda: 'again') == 'again'
+
+
+def test_each_waiter_raises_its_own_error():
+    """Joined callers get copies of the error, raised from the original."""
+    flight = SingleFlight()
+    error = status_error()
+    fn, calls = slow(error)
+
+    outcomes = run_together(lambda: flight.do('key', fn))
+
+    assert len(calls) == 1
+    copies = [outcome for outcome in outcomes if outcome is not error]
+    assert len(copies) == WAITERS - 1
+    assert len({id(copy) for copy in copies}) == WAITERS - 1
+    for copy in copies:
+        assert type(copy) is httpx.HTTPStatusError
+        assert copy.args == error.args
+        assert copy.__cause__ is error
+        assert copy.response is error.response
+
+
+def test_async_waiters_share_the_task():
+    """One task serves every coroutine and errors are copied per waiter."""
+    flight = AsyncSingleFlight()
+    error = status_error()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise error
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do('key', fn) for _ in range(WAITERS)),
+            return_exceptions=True,
+        )
+
+    leader, *waiters = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert leader is error
+    assert all(e is not error and e.__cause__ is error for e in waiters)
+    assert flight.stats.saved == WAITERS - 1
+
+
+def test_only_get_requests_are_shared():
+    """Keys ignore parameter order, and writes are never coalesced."""
+    get = ApiRequest(
+        type=ApiRequestType.GET, endpoint='contacts', params={'a': 1, 'b': 2}
+    )
+    reordered = get.model_copy(update={'params': {'b': 2, 'a': 1}})
+    post = get.model_copy(update={'type': ApiRequestType.POST})
+
+    assert request_key(get) == request_key(reordered)
+    assert request_key(post) is None
+
+
+def test_client_coalesces_identical_lookups(server):
+    """Concurrent lookups of one contact make one upstream request."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        threading.Event().wait(0.1)
+        return server.respond(request)
+
+    msisdn = contact_payload(0)['msisdn']
+    with make_client(handler) as client:
+        results = run_together(lambda: client.get_contact(msisdn))
+
+    assert len(requests) == 1
+    assert all(result == results[0] for result in results)
+    assert client.single_flight.stats.saved == WAITERS - 1
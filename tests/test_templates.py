@@ -0,0 +1,126 @@
+import pytest
+
+from benchmarks.mock_server import contact_payload
+from im_csm_sdk_python import (
+    MessageTemplate,
+    MessageTemplateError,
+    SmsEncoding,
+    sms_info,
+)
+from im_csm_sdk_python.schemas.contacts import Contact
+from im_csm_sdk_python.schemas.records import ContactRecord
+
+
+@pytest.mark.parametrize(
+    'row',
+    [
+        pytest.param(contact_payload(1), id='dict'),
+        pytest.param(Contact.model_validate(contact_payload(1)), id='model'),
+        pytest.param(ContactRecord(contact_payload(1)), id='record'),
+    ],
+)
+def test_rows_of_any_shape_render_the_same(row):
+    """Dicts, models and records fill the placeholders alike."""
+    template = MessageTemplate('Hola {first_name}, {{código}} {city|GT}')
+    rendered = template.render(row)
+
+    assert rendered.message == 'Hola María, {código} GT'
+    assert rendered.msisdn == contact_payload(1)['msisdn']
+    assert template.fields == ('first_name', 'city')
+
+
+def test_missing_fields_without_default_are_errors():
+    """A placeholder without default needs a non-None value."""
+    template = MessageTemplate('Hola {first_name}')
+    with pytest.raises(MessageTemplateError):
+        template.render({'first_name': None})
+    assert template.render({'first_name': 7}).message == 'Hola 7'
+
+
+@pytest.mark.parametrize('text', ['Hola {name', 'Hola name}', '{a|{b}}'])
+def test_unmatched_braces_are_rejected_at_compile_time(text):
+    """Stray braces fail when the template is built."""
+    with pytest.raises(MessageTemplateError):
+        MessageTemplate(text)
+
+
+@pytest.mark.parametrize(
+    'text, encoding, length, segments',
+    [
+        ('a' * 160, SmsEncoding.GSM7, 160, 1),
+        ('a' * 161, SmsEncoding.GSM7, 161, 2),
+        ('€' * 80, SmsEncoding.GSM7, 160, 1),
+        ('€' * 81, SmsEncoding.GSM7, 162, 2),
+        # Escape pairs and surrogate pairs are never split across segments
+        ('a' * 152 + '€' + 'a' * 152, SmsEncoding.GSM7, 306, 3),
+        ('ñandú', SmsEncoding.UCS2, 5, 1),
+        ('á' * 70, SmsEncoding.UCS2, 70, 1),
+        ('á' * 71, SmsEncoding.UCS2, 71, 2),
+        ('😀' * 35, SmsEncoding.UCS2, 70, 1),
+        ('a' + '😀' * 33 + 'b' * 2, SmsEncoding.UCS2, 69, 1),
+        ('a' * 66 + '😀' * 2, SmsEncoding.UCS2, 70, 1),
+        ('a' * 66 + '😀' * 3, SmsEncoding.UCS2, 72, 2),
+        ('á' * 66 + '😀' + 'á' * 66, SmsEncoding.UCS2, 134, 3),
+    ],
+)
+def test_sms_size(text, encoding, length, segments):
+    """Encoding, length and segment count follow GSM 03.38 rules."""
+    info = sms_info(text)
+    assert (info.encoding, info.length, info.segments) == (
+        encoding,
+        length,
+        segments,
+    )
+
+
+def test_messages_over_the_segment_limit_are_rejected():
+    """`max_segments` stops long messages before they are sent."""
+    template = MessageTemplate('{text}', max_segments=1)
+    assert template.render({'text': 'a' * 160}).segments == 1
+    with pytest.raises(MessageTemplateError):
+        template.render({'text': 'á' * 71})
+
+
+def test_payloads_skip_rows_that_cannot_be_sent():
+    """Rows without a phone number or a field are reported, not sent."""
+    template = MessageTemplate('Hola {first_name}')
+    rows = [
+        contact_payload(0),
+        {'first_name': 'Sin número'},
+        {'msisdn': '50212345678'},
+        contact_payload(1),
+    ]
+    skipped = []
+
+    payloads = list(
+        template.payloads(
+            rows,
+            batch_size=3,
+            on_error=lambda row, error: skipped.append((row, str(error))),
+        )
+    )
+
+    assert [p.msisdn for p in payloads] == [
+        contact_payload(0)['msisdn'],
+        contact_payload(1)['msisdn'],
+    ]
+    assert payloads[1].message == 'Hola María'
+    assert [error for _, error in skipped] == [
+        "Missing field 'msisdn'",
+        "Missing field 'first_name'",
+    ]
+
+
+def test_render_many_is_lazy():
+    """Rows are pulled one batch at a time."""
+    pulled = []
+
+    def rows():
+        for i in range(10):
+            pulled.append(i)
+            yield {'n': i}
+
+    stream = MessageTemplate('{n}').render_many(rows(), batch_size=4)
+    row, rendered = next(stream)
+    assert (row, rendered.message) == ({'n': 0}, '0')
+    assert pulled == [0, 1, 2, 3]